@@ -0,0 +1,78 @@
+"""
+記事本文の取得用キャッシュとURLの解析
+
+本文はZenn APIの `/api/articles/{slug}` から取得する。
+記事URLと本文の更新日時をキーに、HTMLから変換済みのテキストを保持し、
+TTL内はネットワークに出ず、TTL後も更新日時が変わっていなければ変換をやり直さない。
+"""
+
+import re
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+from app.config import Config
+from app.lru import LRU
+from app.models import ArticleBody
+
+# https://zenn.dev/<ユーザー名>/articles/<スラッグ>
+_ARTICLE_URL_PATTERN = re.compile(r"^https?://[^/]+/[^/]+/articles/([A-Za-z0-9_-]+)/?(?:[?#].*)?$")
+
+
+def article_slug(url: str) -> Optional[str]:
+    """記事URLからスラッグを取り出す（本・スクラップなど記事以外はNone）"""
+    match = _ARTICLE_URL_PATTERN.match(url.strip())
+    return match.group(1) if match else None
+
+
+class BodyCache:
+    """記事URLをキーにしたスレッドセーフなLRUの本文キャッシュ"""
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        ttl: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries or Config.BODY_CACHE_MAX_ENTRIES
+        self.ttl = Config.BODY_CACHE_TTL if ttl is None else ttl
+        self._clock = clock
+        # URL -> (本文, 最後に取得・確認した時刻)
+        self._entries: "LRU[str, Tuple[ArticleBody, float]]" = LRU(self.max_entries)
+        self.reused = 0
+
+    def get(self, url: str) -> Optional[ArticleBody]:
+        """TTL内の本文を返す"""
+        entries = self._entries
+        with entries.lock:
+            entry = entries.peek(url)
+            if entry is None or self._clock() - entry[1] >= self.ttl:
+                entries.misses += 1
+                return None
+            entries.touch(url)
+            entries.hits += 1
+            return entry[0]
+
+    def get_version(self, url: str, updated_at: str) -> Optional[ArticleBody]:
+        """更新日時が一致する本文があれば確認済みとして返す"""
+        with self._entries.lock:
+            entry = self._entries.peek(url)
+            if entry is None or not updated_at or entry[0].updated_at != updated_at:
+                return None
+            self._entries.put(url, (entry[0], self._clock()))
+            self.reused += 1
+            return entry[0]
+
+    def put(self, body: ArticleBody) -> None:
+        self._entries.put(body.url, (body, self._clock()))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        with self._entries.lock:
+            stats = self._entries.stats()
+            stats["reused"] = self.reused
+            return stats
@@ -0,0 +1,104 @@
+"""
+フィードURLをキーにした記事リストのインメモリキャッシュ
+
+フィードごとのTTL、件数とおおよそのバイト数によるLRU追い出し、
+stale-while-revalidate（期限切れ直後は古い結果を返しつつ裏で再取得）に対応する。
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.config import Config
+from app.lru import LRU
+from app.models import Article
+
+FRESH = "fresh"
+STALE = "stale"
+MISS = "miss"
+
+
+@dataclass
+class _CacheEntry:
+    articles: List[Article]
+    limit: int
+    stored_at: float
+    ttl: float
+    size: int
+
+
+def _approximate_size(articles: List[Article]) -> int:
+    """記事リストのおおよそのバイト数（文字列長の合計）"""
+    return sum(article.approximate_size() for article in articles)
+
+
+class ArticleCache:
+    """TTL付きのスレッドセーフなLRUキャッシュ"""
+
+    def __init__(
+        self,
+        max_entries: int = None,
+        max_bytes: int = None,
+        stale_ttl: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max_entries or Config.ARTICLE_CACHE_MAX_ENTRIES
+        self.max_bytes = max_bytes or Config.ARTICLE_CACHE_MAX_BYTES
+        self.stale_ttl = Config.ARTICLE_CACHE_STALE_TTL if stale_ttl is None else stale_ttl
+        self._clock = clock
+        self._entries: "LRU[str, _CacheEntry]" = LRU(
+            self.max_entries, self.max_bytes, weigh=lambda entry: entry.size
+        )
+        self.stale_hits = 0
+
+    def lookup(self, key: str, max_articles: int) -> Tuple[Optional[List[Article]], str]:
+        """
+        キャッシュを引く
+
+        Returns:
+            (記事リスト, 状態) のタプル。状態は FRESH / STALE / MISS のいずれか
+        """
+        entries = self._entries
+        with entries.lock:
+            entry = entries.peek(key)
+            if entry is None or not self._covers(entry, max_articles):
+                entries.misses += 1
+                return None, MISS
+
+            age = self._clock() - entry.stored_at
+            if age >= entry.ttl + self.stale_ttl:
+                entries.pop(key)
+                entries.misses += 1
+                return None, MISS
+
+            entries.touch(key)
+            articles = entry.articles[:max_articles]
+            if age < entry.ttl:
+                entries.hits += 1
+                return articles, FRESH
+            self.stale_hits += 1
+            return articles, STALE
+
+    def put(self, key: str, articles: List[Article], limit: int, ttl: float) -> None:
+        """記事リストを保存し、上限を超えた分をLRU順に追い出す"""
+        self._entries.put(key, _CacheEntry(
+            articles=list(articles),
+            limit=limit,
+            stored_at=self._clock(),
+            ttl=ttl,
+            size=_approximate_size(articles),
+        ))
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット・ミス・追い出しのカウンタを返す"""
+        with self._entries.lock:
+            stats = self._entries.stats()
+            stats["stale_hits"] = self.stale_hits
+            stats["bytes"] = self._entries.weight
+            return stats
+
+    def _covers(self, entry: _CacheEntry, max_articles: int) -> bool:
+        return entry.limit >= max_articles or len(entry.articles) < entry.limit
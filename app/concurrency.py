@@ -0,0 +1,134 @@
+"""
+ツール呼び出しの同時実行数の制限
+
+HTTPモードでは1つのプロセスが多数のクライアントの呼び出しを受けるため、同時に
+実行する数を抑え、あふれた分は上限付きの待ち行列で順番を待たせる。待ち行列も
+いっぱいの場合や待ち時間が長すぎる場合は、実行せずに混雑として即座に返す
+（バックプレッシャー）。待ち合わせには `concurrent.futures.Future` を使い、
+別スレッドや別イベントループの呼び出し元とも同じ枠を共有する。
+"""
+
+import asyncio
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Deque, Dict
+
+from app.config import Config
+from app.metrics import metrics
+
+
+class ServerBusyError(Exception):
+    """同時実行数と待ち行列が上限に達している"""
+
+    def __init__(self):
+        super().__init__("サーバーが混み合っています。しばらくしてから再度お試しください。")
+
+
+class ConcurrencyLimiter:
+    """同時実行数 max_concurrency、待ち行列 max_waiting の受付制御"""
+
+    def __init__(
+        self,
+        max_concurrency: int = None,
+        max_waiting: int = None,
+        wait_timeout: float = None,
+    ):
+        """
+        Args:
+            max_concurrency: 同時に実行する数
+            max_waiting: 実行を待てる数（超えたら即座に断る）
+            wait_timeout: 実行を待つ上限（秒、0なら無制限）
+        """
+        self.max_concurrency = max_concurrency or Config.TOOL_MAX_CONCURRENCY
+        self.max_waiting = Config.TOOL_MAX_WAITING if max_waiting is None else max_waiting
+        self.wait_timeout = Config.TOOL_WAIT_TIMEOUT if wait_timeout is None else wait_timeout
+        self._running = 0
+        self._waiters: Deque[Future] = deque()
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.queued = 0
+        self.max_queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    async def acquire(self) -> None:
+        """実行枠を1つ得る（得られなければ ServerBusyError）"""
+        with self._lock:
+            if self._running < self.max_concurrency and not self._waiters:
+                self._running += 1
+                self.admitted += 1
+                return
+            if len(self._waiters) >= self.max_waiting:
+                self.rejected += 1
+                raise ServerBusyError()
+            waiter = Future()
+            self._waiters.append(waiter)
+            self.queued += 1
+            self.max_queued = max(self.max_queued, len(self._waiters))
+
+        began = time.perf_counter()
+        try:
+            await asyncio.wait_for(asyncio.wrap_future(waiter), self.wait_timeout or None)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if not self._abandon(waiter):
+                # 諦める直前に枠を譲り受けていた
+                if isinstance(e, asyncio.CancelledError):
+                    self.release()
+                    raise
+            elif isinstance(e, asyncio.TimeoutError):
+                with self._lock:
+                    self.timed_out += 1
+                raise ServerBusyError() from None
+            else:
+                raise
+        finally:
+            metrics.observe_stage("admission", time.perf_counter() - began)
+
+    def _abandon(self, waiter: Future) -> bool:
+        """待ち行列から抜ける（すでに枠を譲り受けていれば False）"""
+        with self._lock:
+            if not waiter.cancel():
+                return False
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+            return True
+
+    def release(self) -> None:
+        """実行枠を返し、待っている呼び出しがあれば先頭に譲る"""
+        with self._lock:
+            while self._waiters:
+                waiter = self._waiters.popleft()
+                # 待つのをやめた呼び出しには譲らない
+                if waiter.set_running_or_notify_cancel():
+                    waiter.set_result(None)
+                    self.admitted += 1
+                    return
+            self._running -= 1
+
+    async def __aenter__(self) -> "ConcurrencyLimiter":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.release()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "max_concurrency": self.max_concurrency,
+                "running": self._running,
+                "waiting": len(self._waiters),
+                "max_waiting": self.max_queued,
+                "admitted": self.admitted,
+                "queued": self.queued,
+                "rejected": self.rejected,
+                "timed_out": self.timed_out,
+            }
+
+
+tool_limiter = ConcurrencyLimiter()
+metrics.register_collector("admission", tool_limiter.stats)
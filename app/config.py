@@ -2,14 +2,137 @@
 Configuration module for Zenn MCP Server - Simplified version.
 """
 
+import os
+
 
 class Config:
     """Application configuration class."""
 
     # Zenn Feed settings
-    ZENN_FEED_BASE_URL = "https://zenn.dev/topics"
-    ZENN_API_BASE_URL = "https://zenn.dev/api"
-    ZENN_TRENDING_FEED_URL = "https://zenn.dev/feed"
+    ZENN_BASE_URL = os.getenv("ZENN_MCP_BASE_URL", "https://zenn.dev").rstrip("/")  # ベンチマーク等で差し替え可能
+    ZENN_FEED_BASE_URL = f"{ZENN_BASE_URL}/topics"
+    ZENN_API_BASE_URL = f"{ZENN_BASE_URL}/api"
+    ZENN_TRENDING_FEED_URL = f"{ZENN_BASE_URL}/feed"
 
     # Crawler settings
-    CRAWLER_TIMEOUT = 60
\ No newline at end of file
+    CRAWLER_TIMEOUT = 60
+
+    # HTTP connection pool settings
+    HTTP_POOL_MAXSIZE = 10  # キープアライブで保持する接続数
+    HTTP_MAX_CONNECTIONS_PER_HOST = 10  # 接続先はzenn.devのみのため全体上限と同じ
+    HTTP_KEEPALIVE_EXPIRY = 30  # アイドル接続を保持する秒数
+    HTTP_ACCEPT_ENCODING = "gzip, deflate"
+
+    # Feed cache settings
+    FEED_CACHE_MAX_ENTRIES = 512  # 条件付きGET用に保持するフィード数
+
+    # Article cache settings
+    ARTICLE_CACHE_TOPIC_TTL = 300  # トピックフィードの鮮度（秒）
+    ARTICLE_CACHE_TRENDING_TTL = 60  # トレンドフィードの鮮度（秒）
+    ARTICLE_CACHE_STALE_TTL = 600  # TTL切れ後も古い結果を返しつつ再取得する猶予（秒）
+    ARTICLE_CACHE_MAX_ENTRIES = 256
+    ARTICLE_CACHE_MAX_BYTES = 8 * 1024 * 1024  # 記事文字列のおおよその合計サイズ
+
+    # Batch search settings
+    BATCH_MAX_TOPICS = 30  # 一括検索で受け付けるトピック数の上限
+    BATCH_MAX_CONCURRENCY = 8  # 同時に取得するフィード数
+
+    # Feed parsing settings
+    FEED_FETCH_MIN_ARTICLES = 10  # フィードから取り出す最小件数。件数の違う同時取得を1回にまとめるため
+    DESCRIPTION_MAX_LENGTH = 500  # 記事概要の最大文字数
+
+    # Article store settings (空文字で無効化)
+    ARTICLE_STORE_PATH = os.getenv("ZENN_MCP_STORE_PATH", "./data/zenn_mcp/articles.db")
+    STORE_QUERY_DEFAULT_LIMIT = 50
+    STORE_QUERY_MAX_LIMIT = 200  # ストアから一度に返す最大記事数
+    STORE_WARM_MAX_AGE = 3600  # 起動後の初回にストアの記事を期限切れのキャッシュとして返す、最終取得からの上限（秒）
+
+    # Prefetch scheduler settings
+    PREFETCH_ENABLED = os.getenv("ZENN_MCP_PREFETCH", "0") == "1"
+    PREFETCH_INTERVAL = 50  # 再取得の間隔（秒）。トレンドのTTLより短くして常に鮮度内に保つ
+    PREFETCH_JITTER = 0.2  # 間隔に加える揺らぎの割合（±）
+    PREFETCH_MAX_TOPICS = 10  # 再取得する人気トピック数
+    PREFETCH_MAX_CONCURRENCY = 4  # 再取得の同時実行数
+    PREFETCH_DECAY = 0.5  # 1周期ごとにリクエスト数へ掛ける減衰率
+
+    # Server settings
+    MCP_TRANSPORT = os.getenv("ZENN_MCP_TRANSPORT", "stdio")  # stdio / streamable-http
+    MCP_HTTP_HOST = os.getenv("ZENN_MCP_HTTP_HOST", "127.0.0.1")
+    MCP_HTTP_PORT = int(os.getenv("ZENN_MCP_HTTP_PORT", "8000"))
+    TOOL_MAX_CONCURRENCY = int(os.getenv("ZENN_MCP_MAX_CONCURRENCY", "64"))  # 同時に実行するツール呼び出し数
+    TOOL_MAX_WAITING = int(os.getenv("ZENN_MCP_MAX_WAITING", "256"))  # 実行を待てる呼び出し数（超えたら混雑として即座に返す）
+    TOOL_WAIT_TIMEOUT = 10  # 実行を待つ上限（秒、0で無制限）
+
+    # Metrics settings
+    METRICS_ENABLED = os.getenv("ZENN_MCP_METRICS", "1") == "1"
+    METRICS_HOST = os.getenv("ZENN_MCP_METRICS_HOST", "127.0.0.1")
+    METRICS_PORT = int(os.getenv("ZENN_MCP_METRICS_PORT", "0"))  # 0でHTTPエンドポイント無効
+
+    # Logging settings
+    LOG_MODE = os.getenv("ZENN_MCP_LOG_MODE", "queued")  # queued: 別スレッドで書き込み / sync: 呼び出し元で書き込み
+    LOG_LEVEL = os.getenv("ZENN_MCP_LOG_LEVEL", "INFO").upper()
+    LOG_QUEUE_SIZE = 10000  # 書き込み待ちの上限（超えた分は捨てて数える）
+    LOG_SAMPLE_WINDOW = 60  # 警告を間引く集計期間（秒）
+    LOG_SAMPLE_BURST = 10  # 期間内に操作ごとにそのまま書く警告の件数
+    LOG_SAMPLE_EVERY = 100  # それ以降は何件に1件書くか
+
+    # Search index settings
+    SEARCH_INDEX_MAX_DOCUMENTS = 50000  # 超えたら古く登録された記事から外す
+    SEARCH_TITLE_WEIGHT = 2  # タイトル中の語の出現回数に掛ける重み
+    SEARCH_RESULT_DEFAULT_LIMIT = 10
+    SEARCH_RESULT_MAX_LIMIT = 50
+
+    # Article body settings
+    BODY_FETCH_MAX_CONCURRENCY = 4  # 本文を同時に取得する記事数
+    BODY_FETCH_MAX_URLS = 10  # 1回のツール呼び出しで指定できる記事数
+    BODY_CACHE_TTL = 3600  # 再確認せずに本文キャッシュを返す秒数
+    BODY_CACHE_MAX_ENTRIES = 256
+    BODY_DEFAULT_MAX_CHARS = 3000  # ツール応答で1記事あたりに返す文字数
+    BODY_MAX_CHARS = 20000
+
+    # API backfill settings
+    BACKFILL_DEFAULT_ARTICLES = 100
+    BACKFILL_MAX_ARTICLES = 1000  # 1回の取り込みで取得する記事数の上限
+
+    # Rendering settings
+    RENDER_CACHE_MAX_ENTRIES = 128  # 整形済み応答を保持する件数
+
+    # Resilience settings
+    HTTP_CONNECT_TIMEOUT = 10  # 実測値が揃うまでの接続タイムアウト（秒）。適応後の上限も兼ねる
+    HTTP_READ_TIMEOUT = 30  # 実測値が揃うまでの読み取りタイムアウト（秒）。適応後の上限も兼ねる
+    HTTP_TIMEOUT_MIN = 1.0  # 適応後のタイムアウトの下限（秒）
+    HTTP_TIMEOUT_MULTIPLIER = 4  # 実測p99に掛ける倍率
+    HTTP_LATENCY_WINDOW = 200  # タイムアウトの算出に使う直近の実測数
+    HTTP_LATENCY_MIN_SAMPLES = 20  # これより少ない間は既定のタイムアウトを使う
+    HTTP_RETRY_ATTEMPTS = 3  # 初回を含む試行回数
+    HTTP_RETRY_BASE_DELAY = 0.2  # 再試行の待ち時間の基準（秒、試行ごとに倍）
+    HTTP_RETRY_MAX_DELAY = 5.0
+    HTTP_TOTAL_DEADLINE = CRAWLER_TIMEOUT  # 再試行を含めた1回の取得にかける上限（秒）
+    CIRCUIT_FAILURE_THRESHOLD = 5  # 連続でこの回数失敗したら遮断する
+    CIRCUIT_RESET_TIMEOUT = 30  # 遮断してから試しに1回通すまでの秒数
+    HTTP_HEDGE_ENABLED = os.getenv("ZENN_MCP_HEDGE", "0") == "1"
+    HTTP_HEDGE_MIN_DELAY = 0.05  # 2本目を送るまでの最小待ち時間（秒）。実測p95の方が長ければそちら
+
+    # Rate limit settings
+    RATE_LIMIT_PER_SECOND = float(os.getenv("ZENN_MCP_RATE_LIMIT", "10"))  # 1秒あたりの送信数（0で無効）
+    RATE_LIMIT_BURST = int(os.getenv("ZENN_MCP_RATE_BURST", "20"))  # 連続で送れる数
+    RATE_LIMIT_MAX_RETRY_AFTER = 60  # Retry-After に従って待つ上限（秒）
+
+    # Delta mode settings
+    DELTA_MAX_SCOPES = 1000  # 配信済みの記事を覚えておくカーソル×トピックの組の数
+    DELTA_SEEN_MAX_ENTRIES = 500  # 組ごとにハッシュで正確に覚えておくURL数
+    DELTA_BLOOM_CAPACITY = 5000  # あふれたURLを移すBloomフィルタの容量（0で無効）
+    DELTA_BLOOM_ERROR_RATE = 0.01  # Bloomフィルタの誤判定率
+
+    # Trending history settings
+    TRENDING_HISTORY_MAX_SNAPSHOTS = 1440  # 保持するスナップショット数（1分ごとなら約1日分）
+    TRENDING_SNAPSHOT_MIN_INTERVAL = 30  # これより短い間隔の取得はスナップショットにしない（秒）
+    TRENDING_VELOCITY_ALPHA = 0.5  # 順位の変化速度の指数移動平均の係数
+
+    # Time index settings
+    TIME_INDEX_MAX_ARTICLES = 50000  # 投稿日時の索引に保持する記事数（超えたら古い記事から捨てる）
+
+    # Record/replay settings (空文字で無効化。両方指定した場合は再生を優先)
+    HTTP_RECORD_PATH = os.getenv("ZENN_MCP_RECORD", "")  # 上流の応答を追記するアーカイブ（.jsonl.gz）
+    HTTP_REPLAY_PATH = os.getenv("ZENN_MCP_REPLAY", "")  # ネットワークに出ずに応答を返すアーカイブ
+    HTTP_REPLAY_SPEED = float(os.getenv("ZENN_MCP_REPLAY_SPEED", "1"))  # 記録時の所要時間を何倍速で再現するか（0で待たない）
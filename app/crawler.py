@@ -3,28 +3,134 @@ Zenn記事取得機能
 TDD原則に従って実装
 """
 
-import requests
-from typing import List, Dict, Optional
-from bs4 import BeautifulSoup
+import asyncio
+import heapq
+import threading
+import time
+import weakref
+from concurrent.futures import Future
+from dataclasses import dataclass, replace
+from typing import (
+    AsyncIterator, Awaitable, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar,
+)
+from urllib.parse import quote
+
+import httpx
 from app.logging_config import get_logger
+from app.article_body import BodyCache, article_slug
+from app.article_cache import FRESH, STALE, ArticleCache
 from app.config import Config
+from app.feed_cache import FeedCache
+from app.feed_parser import html_to_text, iter_feed_items, parse_api_article, parse_item
+from app.metrics import metrics
+from app.models import TRENDING_TOPIC, Article, ArticleBody, normalize_topic
+from app.rate_limit import RateLimiter, parse_retry_after
+from app.replay import RecordingTransport, ReplayTransport, ResponseRecorder
+from app.resilience import RETRYABLE_STATUS, CircuitBreakers, LatencyTracker, backoff_delay
+from app.search_index import SearchIndex
+from app.singleflight import SingleFlight
+from app.time_index import TimeIndex
+from app.store import ArticleStore
+from app.trending_history import TrendingHistory
 
+T = TypeVar("T")
 
-class ZennCrawler:
-    """Zennから記事を取得するクローラー"""
+@dataclass(frozen=True)
+class _Feed:
+    """取得対象のフィード"""
 
-    def __init__(self):
+    url: str
+    topic: str  # ストアに記録するトピック名
+    ttl: float
+    parse_operation: str
+    trending: bool = False  # トレンドフィードなら取得のたびに順位を記録する
+
+
+class AsyncZennCrawler:
+    """Zennから記事を取得する非同期クローラー"""
+
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        store: Optional[ArticleStore] = None,
+    ):
         self.logger = get_logger(__name__)
         self.logger.info(operation="crawler_init", message="ZennCrawler initialized")
+        self.base_url = Config.ZENN_BASE_URL
         self.base_feed_url = Config.ZENN_FEED_BASE_URL
         self.api_base_url = Config.ZENN_API_BASE_URL
         self.trending_feed_url = Config.ZENN_TRENDING_FEED_URL
         self.timeout = Config.CRAWLER_TIMEOUT
+        self.feed_cache = FeedCache()
+        self.article_cache = ArticleCache()
+        self.body_cache = BodyCache()
+        self.store = store
+        self.search_index = SearchIndex()
+        self.time_index = TimeIndex()
+        self._index_warmed = store is None
+        self.flights = SingleFlight()
+        self.latency = LatencyTracker()
+        self.breakers = CircuitBreakers()
+        self.rate_limiter = RateLimiter()
+        self.trending_history = TrendingHistory()
+        self.recorder: Optional[ResponseRecorder] = None
+        if transport is None and Config.HTTP_REPLAY_PATH:
+            transport = ReplayTransport(Config.HTTP_REPLAY_PATH)
+            # 上流に送らないので送信ペースを抑える必要はない
+            self.rate_limiter = RateLimiter(rate=0)
+        elif Config.HTTP_RECORD_PATH:
+            self.recorder = ResponseRecorder(Config.HTTP_RECORD_PATH)
+        self._transport = transport
+        # httpxのクライアントはイベントループに紐づくため、ループごとに保持する
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        self._refreshing = set()
+        # ストアの記事でキャッシュを温めたフィード（1フィード1回まで）
+        self._seeded = set()
+        self._refresh_tasks = set()
+        self._lock = threading.Lock()
 
+    def _client(self) -> httpx.AsyncClient:
+        """実行中のイベントループ用のキープアライブ接続プールを返す"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._clients.get(loop)
+            if client is None:
+                limits = httpx.Limits(
+                    max_connections=Config.HTTP_MAX_CONNECTIONS_PER_HOST,
+                    max_keepalive_connections=Config.HTTP_POOL_MAXSIZE,
+                    keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY,
+                )
+                transport = self._transport
+                if self.recorder is not None:
+                    transport = RecordingTransport(
+                        self.recorder, transport or httpx.AsyncHTTPTransport(limits=limits)
+                    )
+                client = httpx.AsyncClient(
+                    transport=transport,
+                    timeout=self.timeout,
+                    limits=limits,
+                    headers={"Accept-Encoding": Config.HTTP_ACCEPT_ENCODING},
+                    follow_redirects=True,
+                )
+                self._clients[loop] = client
+            return client
 
-    def fetch_articles_from_feed(
+    async def aclose(self) -> None:
+        """実行中のループのバックグラウンド再取得と接続を解放する"""
+        loop = asyncio.get_running_loop()
+        for task in list(self._refresh_tasks):
+            if task.get_loop() is loop:
+                task.cancel()
+        with self._lock:
+            client = self._clients.pop(loop, None)
+        if client is not None:
+            await client.aclose()
+
+    async def fetch_articles_from_feed(
         self, topic: str, max_articles: int = None
-    ) -> List[Dict]:
+    ) -> List[Article]:
         """
         Zennトピックフィードから記事を取得する
 
@@ -43,29 +149,8 @@ class ZennCrawler:
             context={"topic": topic, "max_articles": max_articles},
         )
 
-        feed_url = f"{self.base_feed_url}/{topic}/feed"
-
         try:
-            response = requests.get(feed_url, timeout=self.timeout)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "xml")
-            items = soup.find_all("item")
-
-            articles = []
-
-            for item in items[:max_articles]:  # 指定数だけ取得
-                try:
-                    article = self._parse_feed_item(item)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.warning(
-                        operation="parse_feed_item",
-                        message="Failed to parse feed item",
-                        context={"error": str(e)},
-                    )
-                    continue
+            articles = await self._get_articles(self._topic_feed(topic), max_articles)
 
             self.logger.info(
                 operation="fetch_from_feed",
@@ -75,48 +160,414 @@ class ZennCrawler:
             return articles
 
         except Exception as e:
+            metrics.error("fetch")
             self.logger.error(
                 operation="fetch_from_feed",
                 message="Failed to fetch from feed",
                 context={"error": str(e)},
             )
+            # 取得に失敗した場合は手元の記事で応える
+            return await self._serve_cached(self._topic_feed(topic), max_articles)
+
+    def _topic_feed(self, topic: str) -> "_Feed":
+        # 大文字小文字の違う同じトピックを別のフィードとして取得・キャッシュしない
+        topic = normalize_topic(topic)
+        return _Feed(
+            url=f"{self.base_feed_url}/{topic}/feed",
+            topic=topic,
+            ttl=Config.ARTICLE_CACHE_TOPIC_TTL,
+            parse_operation="parse_feed_item",
+        )
+
+    def _trending_feed(self) -> "_Feed":
+        return _Feed(
+            url=self.trending_feed_url,
+            topic=TRENDING_TOPIC,
+            ttl=Config.ARTICLE_CACHE_TRENDING_TTL,
+            parse_operation="parse_trending_item",
+            trending=True,
+        )
+
+    async def refresh_topic(self, topic: str, max_articles: int = 10) -> List[Article]:
+        """キャッシュの鮮度に関わらずトピックフィードを取り直す（先読み用）"""
+        return await self._fetch_and_store(self._topic_feed(topic), max_articles)
+
+    async def refresh_trending(self, max_articles: int = 10) -> List[Article]:
+        """キャッシュの鮮度に関わらずトレンドフィードを取り直す（先読み用）"""
+        return await self._fetch_and_store(self._trending_feed(), max_articles)
+
+    async def _get_articles(self, feed: "_Feed", max_articles: int) -> List[Article]:
+        """記事キャッシュを優先し、期限切れならバックグラウンドで再取得する"""
+        articles, state = self.article_cache.lookup(feed.url, max_articles)
+        if state == FRESH:
+            return articles
+        if state == STALE:
+            self._refresh_in_background(feed, max_articles)
+            return articles
+
+        articles = await self._seed_from_store(feed, max_articles)
+        if articles is not None:
+            self._refresh_in_background(feed, max_articles)
+            return articles
+        return await self._fetch_and_store(feed, max_articles)
+
+    async def _seed_from_store(
+        self, feed: "_Feed", max_articles: int
+    ) -> Optional[List[Article]]:
+        """
+        起動後にフィードを初めて引くとき、ストアに蓄積済みの記事を期限切れのキャッシュとして載せる
+
+        最後の取得から STORE_WARM_MAX_AGE 秒以内で、要求件数を満たす場合だけ返す
+        （呼び出し元は stale-while-revalidate と同じく返してから裏で取り直す）。
+        ストアは投稿日時の新しい順に返すため、トレンドの順位は取り直すまで反映されない。
+        """
+        if self.store is None:
+            return None
+        with self._lock:
+            if feed.url in self._seeded:
+                return None
+            self._seeded.add(feed.url)
+
+        limit = max(max_articles, Config.FEED_FETCH_MIN_ARTICLES)
+        try:
+            fetched_at, articles = await asyncio.to_thread(self._load_seed, feed.topic, limit)
+        except Exception as e:
+            self.logger.warning(
+                operation="seed_from_store",
+                message="Failed to load stored articles into article cache",
+                context={"feed_url": feed.url, "error": str(e)},
+            )
+            return None
+        if (
+            fetched_at is None
+            or time.time() - fetched_at > Config.STORE_WARM_MAX_AGE
+            or len(articles) < max_articles
+        ):
+            return None
+        # TTL 0 で保存し、以降の呼び出しも取り直しが済むまで期限切れとして返す
+        self.article_cache.put(feed.url, articles, len(articles), ttl=0)
+        return articles[:max_articles]
+
+    def _load_seed(self, topic: str, limit: int) -> Tuple[Optional[int], List[Article]]:
+        return self.store.last_fetched(topic), self.store.recent(topic, limit)
+
+    async def _fetch_and_store(self, feed: "_Feed", max_articles: int) -> List[Article]:
+        """
+        同じフィードへの同時取得を1回にまとめて取得する
+
+        取得はフィードのURLごとにまとめ、件数は FEED_FETCH_MIN_ARTICLES 以上で取って
+        呼び出し元ごとに切り出す。先に走っていた取得の件数では足りない場合は取り直す。
+        """
+        limit = max(max_articles, Config.FEED_FETCH_MIN_ARTICLES)
+        while True:
+            fetched_limit, articles = await self.flights.do(
+                feed.url, lambda: self._fetch_and_store_once(feed, limit)
+            )
+            if fetched_limit >= max_articles or len(articles) < fetched_limit:
+                # 合流した呼び出し元同士でリストを共有しない
+                return articles[:max_articles]
+
+    async def _fetch_and_store_once(
+        self, feed: "_Feed", limit: int
+    ) -> Tuple[int, List[Article]]:
+        """フィードを取得してキャッシュとストアに反映する（取得した件数の上限と記事を返す）"""
+        articles = await self._fetch_feed(feed.url, limit, feed.parse_operation)
+        self.article_cache.put(feed.url, articles, limit, feed.ttl)
+        self.search_index.add(articles)
+        self.time_index.add(articles, feed.topic)
+        if feed.trending:
+            # 先読みと取得のたびにトレンドの順位を記録する
+            self.trending_history.record(articles)
+        if self.store is not None and articles:
+            await asyncio.to_thread(self.store.upsert, articles, feed.topic)
+        return limit, articles
+
+    def _refresh_in_background(self, feed: "_Feed", max_articles: int) -> None:
+        """同じフィードの再取得が重複しないようにしてタスクとして実行する"""
+        with self._lock:
+            if feed.url in self._refreshing:
+                return
+            self._refreshing.add(feed.url)
+
+        async def refresh():
+            try:
+                await self._fetch_and_store(feed, max_articles)
+            except Exception as e:
+                self.logger.warning(
+                    operation="refresh_feed",
+                    message="Background feed refresh failed",
+                    context={"feed_url": feed.url, "error": str(e)},
+                )
+            finally:
+                with self._lock:
+                    self._refreshing.discard(feed.url)
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def load_stored_articles(
+        self, topic: str, limit: int, since: int = None, until: int = None
+    ) -> List[Article]:
+        """ネットワークに出ずにストアから記事を新しい順に返す（since 以上 until 未満に絞れる）"""
+        if self.store is None:
+            return []
+        return await asyncio.to_thread(self.store.recent, topic, limit, since, until)
+
+    async def search_articles(
+        self, query: str, limit: int = 10, since: int = None, until: int = None
+    ) -> List[Article]:
+        """
+        これまでに取得した記事を全文検索し、関連度の高い順に返す
+
+        初回はストアに蓄積済みの記事でインデックスを温めてから検索する。
+        since / until（エポック秒）を指定すると、その期間に投稿された記事に絞る。
+        """
+        if not self._index_warmed:
+            await asyncio.to_thread(self._warm_indexes)
+        accept = None
+        if since is not None or until is not None:
+            def in_range(article: Article) -> bool:
+                return _in_range(article.published_ts, since, until)
+            accept = in_range
+        with metrics.stage("search"):
+            return [article for article, _ in self.search_index.search(query, limit, accept)]
+
+    async def articles_between(
+        self, topic: Optional[str], since: int = None, until: int = None, limit: int = 10
+    ) -> List[Article]:
+        """
+        これまでに取得した記事から、期間内に投稿された記事を新しい順に返す
+
+        Args:
+            topic: トピック名（None または空文字で全体）
+            since: この時刻（エポック秒）以降
+            until: この時刻（エポック秒）より前
+            limit: 最大件数
+        """
+        if not self._index_warmed:
+            await asyncio.to_thread(self._warm_indexes)
+        return self.time_index.between(topic, since, until, limit)
+
+    def _warm_indexes(self) -> None:
+        """ストアに蓄積済みの記事で全文検索と投稿日時の索引を温める"""
+        with self._lock:
+            if self._index_warmed:
+                return
+            self._index_warmed = True
+        try:
+            articles = self.store.recent(None, self.search_index.max_documents)
+            self.search_index.add(articles)
+            self.time_index.add(articles)
+        except Exception as e:
+            self.logger.error(
+                operation="warm_search_index",
+                message="Failed to load stored articles into search index",
+                context={"error": str(e)},
+            )
+
+    async def _serve_cached(self, feed: "_Feed", max_articles: int) -> List[Article]:
+        """
+        取得に失敗したとき（遮断中を含む）、期限切れでも手元にある記事で応える
+
+        条件付きGET用に保持しているフィードの記事を優先し、なければストアから返す。
+        """
+        entry = self.feed_cache.get(feed.url)
+        if entry is not None and entry.articles:
+            return entry.articles[:max_articles]
+        return await self._fallback_to_store(feed.topic, max_articles)
+
+    async def _fallback_to_store(self, topic: str, max_articles: int) -> List[Article]:
+        try:
+            return await self.load_stored_articles(topic, max_articles)
+        except Exception as e:
+            self.logger.error(
+                operation="load_stored_articles",
+                message="Failed to load articles from store",
+                context={"topic": topic, "error": str(e)},
+            )
             return []
 
-    def _parse_feed_item(self, item) -> Optional[Dict]:
+    async def _fetch_feed(
+        self, feed_url: str, max_articles: int, parse_operation: str
+    ) -> List[Article]:
+        """条件付きGETでフィードを取得し、未更新ならキャッシュ済みの記事を返す"""
+        headers = self.feed_cache.conditional_headers(feed_url)
+        client = self._client()
+        response = await self._get(client, feed_url, headers)
+
+        if response.status_code == 304:
+            entry = self.feed_cache.get(feed_url)
+            if entry is None:
+                # 再検証中にエントリが追い出された場合は無条件で取り直す
+                response = await self._get(client, feed_url)
+            else:
+                self.logger.info(
+                    operation="fetch_feed_not_modified",
+                    message="Feed not modified, serving cached articles",
+                    context={"feed_url": feed_url},
+                )
+                if not entry.covers(max_articles):
+                    articles = self._parse_feed(
+                        entry.body, max_articles, parse_operation
+                    )
+                    self.feed_cache.update_articles(feed_url, articles, max_articles)
+                    return list(articles)
+                return entry.articles[:max_articles]
+
+        response.raise_for_status()
+
+        articles = self._parse_feed(response.content, max_articles, parse_operation)
+        self.feed_cache.store(
+            feed_url,
+            body=response.content,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+            articles=articles,
+            parsed_limit=max_articles,
+        )
+        return list(articles)
+
+    async def _get(
+        self, client: httpx.AsyncClient, url: str, headers: Dict[str, str] = None
+    ) -> httpx.Response:
+        """
+        GETリクエストを送る。一時的な失敗はバックオフを挟んで再試行し、
+        ホストが連続して失敗していれば送らずに CircuitOpenError で失敗させる
+
+        429/503 に Retry-After があれば、その間は全リクエストの送信を止めて待つ。
+        再試行を含めた所要時間は HTTP_TOTAL_DEADLINE までに収め、各試行のタイムアウトは
+        残り時間で切り詰める。待った後に1回分（HTTP_TIMEOUT_MIN）の時間も残らなければ
+        再試行せず、最後の失敗をそのまま返す。
+        """
+        breaker = self.breakers.for_url(url)
+        attempts = Config.HTTP_RETRY_ATTEMPTS
+        deadline = time.monotonic() + Config.HTTP_TOTAL_DEADLINE
+        for attempt in range(attempts):
+            breaker.allow()
+            timeout = self.latency.timeout(deadline - time.monotonic())
+            delay = backoff_delay(attempt)
+            try:
+                response = await self._send(client, url, headers, timeout)
+            except httpx.TransportError:
+                breaker.record_failure()
+                if attempt + 1 >= attempts or not self._has_budget(deadline, delay):
+                    raise
+            else:
+                if response.status_code not in RETRYABLE_STATUS:
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                retry_after = parse_retry_after(response)
+                if retry_after is not None and response.status_code in (429, 503):
+                    metrics.error("throttled")
+                    self.rate_limiter.pause(retry_after)
+                    # 送信の再開を待つ時間も残り時間から差し引く
+                    delay = max(delay, retry_after)
+                if attempt + 1 >= attempts or not self._has_budget(deadline, delay):
+                    return response
+            metrics.error("retry")
+            await asyncio.sleep(delay)
+
+    @staticmethod
+    def _has_budget(deadline: float, delay: float) -> bool:
+        """delay 秒待った後に、もう1回試すだけの時間が残っているか"""
+        return deadline - time.monotonic() - delay >= Config.HTTP_TIMEOUT_MIN
+
+    async def _send(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        """実測に基づくタイムアウトで1回送り、所要時間と受信バイト数を記録する"""
+        with metrics.stage("fetch"):
+            if Config.HTTP_HEDGE_ENABLED:
+                response = await self._send_hedged(client, url, headers, timeout)
+            else:
+                response = await self._send_once(client, url, headers, timeout)
+        metrics.add_bytes(response.num_bytes_downloaded)
+        return response
+
+    async def _send_once(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        await self.rate_limiter.acquire()
+        return await client.get(
+            url,
+            headers=headers,
+            timeout=timeout,
+            extensions=metrics.request_extensions(self.latency.observe),
+        )
+
+    async def _send_hedged(
+        self,
+        client: httpx.AsyncClient,
+        url: str,
+        headers: Dict[str, str],
+        timeout: httpx.Timeout,
+    ) -> httpx.Response:
+        """
+        応答が遅ければ同じリクエストをもう1本送り、先に成功した方を使う
+
+        2本目を送るまでの待ち時間は応答待ち時間の実測p95（下限 HTTP_HEDGE_MIN_DELAY）。
+        """
+        first = asyncio.ensure_future(self._send_once(client, url, headers, timeout))
+        pending = {first}
+        try:
+            # 待っている間に呼び出し元が取り消されても、送ったリクエストを残さない
+            done, pending = await asyncio.wait(pending, timeout=self.latency.hedge_delay())
+            if done:
+                return first.result()
+
+            metrics.error("hedge")
+            second = asyncio.ensure_future(self._send_once(client, url, headers, timeout))
+            pending = {first, second}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # どちらも失敗した場合は最初のリクエストの例外を伝える
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def _parse_feed(
+        self, content: bytes, max_articles: int, parse_operation: str
+    ) -> List[Article]:
+        """RSSボディから先頭 max_articles 件の記事をストリーミングでパースする"""
+        articles = []
+
+        with metrics.stage("parse"):
+            for item in iter_feed_items(content, max_articles):  # 指定数だけ取得
+                try:
+                    article = self._parse_feed_item(item)
+                    if article:
+                        articles.append(article)
+                except Exception as e:
+                    self.logger.warning(
+                        operation=parse_operation,
+                        message="Failed to parse feed item",
+                        context={"error": str(e)},
+                    )
+                    continue
+
+        metrics.add_items(len(articles))
+        return articles
+
+    def _parse_feed_item(self, item) -> Optional[Article]:
         """フィードアイテムをパースして記事情報を抽出"""
         try:
-            title = item.find("title").text if item.find("title") else ""
-            link = item.find("link").text if item.find("link") else ""
-            pub_date = item.find("pubDate").text if item.find("pubDate") else ""
-            
-            # dc:creator要素から作成者情報を取得
-            creator = ""
-            creator_element = item.find("dc:creator")
-            if creator_element:
-                creator = creator_element.text or ""
-            
-            # description要素からdescriptionテキストを取得
-            description = ""
-            desc_element = item.find("description")
-            if desc_element:
-                description = desc_element.text or ""
-                # HTMLタグが含まれている場合は除去
-                if "<" in description:
-                    try:
-                        from bs4 import BeautifulSoup
-                        soup = BeautifulSoup(description, "html.parser")
-                        description = soup.get_text().strip()
-                    except:
-                        description = description.replace("<", "").replace(">", "")
-
-            return {
-                "title": title,
-                "url": link,
-                "published_at": pub_date,
-                "creator": creator,
-                "description": description,
-            }
+            return parse_item(item)
         except Exception as e:
+            metrics.error("parse_item")
             self.logger.warning(
                 operation="parse_feed_item",
                 message="Failed to parse feed item",
@@ -124,7 +575,7 @@ class ZennCrawler:
             )
             return None
 
-    def fetch_trending_articles(self, max_articles: int = None) -> List[Dict]:
+    async def fetch_trending_articles(self, max_articles: int = None) -> List[Article]:
         """
         Zennトレンドフィードから記事を取得する
 
@@ -143,26 +594,7 @@ class ZennCrawler:
         )
 
         try:
-            response = requests.get(self.trending_feed_url, timeout=self.timeout)
-            response.raise_for_status()
-
-            soup = BeautifulSoup(response.content, "xml")
-            items = soup.find_all("item")
-
-            articles = []
-
-            for item in items[:max_articles]:  # 指定数だけ取得
-                try:
-                    article = self._parse_feed_item(item)
-                    if article:
-                        articles.append(article)
-                except Exception as e:
-                    self.logger.warning(
-                        operation="parse_trending_item",
-                        message="Failed to parse trending feed item",
-                        context={"error": str(e)},
-                    )
-                    continue
+            articles = await self._get_articles(self._trending_feed(), max_articles)
 
             self.logger.info(
                 operation="fetch_trending_articles",
@@ -172,11 +604,438 @@ class ZennCrawler:
             return articles
 
         except Exception as e:
+            metrics.error("fetch")
             self.logger.error(
                 operation="fetch_trending_articles",
                 message="Failed to fetch trending articles",
                 context={"error": str(e)},
             )
-            return []
+            return await self._serve_cached(self._trending_feed(), max_articles)
+
+    async def fetch_article_bodies(
+        self, urls: List[str], max_concurrency: int = None
+    ) -> List[Optional[ArticleBody]]:
+        """
+        記事URLごとにZenn APIから本文を並行取得し、テキストに変換して返す
+
+        Args:
+            urls: 記事URLのリスト
+            max_concurrency: 同時に取得する記事数の上限
+
+        Returns:
+            urls と同じ順の本文リスト。記事以外のURLや取得に失敗した記事はNone
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or Config.BODY_FETCH_MAX_CONCURRENCY)
+
+        async def fetch(url: str) -> Optional[ArticleBody]:
+            cached = self.body_cache.get(url)
+            if cached is not None:
+                return cached
+            slug = article_slug(url)
+            if slug is None:
+                return None
+            try:
+                async with semaphore:
+                    return await self.flights.do(
+                        ("body", url), lambda: self._fetch_body(url, slug)
+                    )
+            except Exception as e:
+                metrics.error("body")
+                self.logger.warning(
+                    operation="fetch_article_body",
+                    message="Failed to fetch article body",
+                    context={"url": url, "error": str(e)},
+                )
+                return None
+
+        return list(await asyncio.gather(*(fetch(url) for url in urls)))
+
+    async def _fetch_body(self, url: str, slug: str) -> ArticleBody:
+        response = await self._get(self._client(), f"{self.api_base_url}/articles/{slug}")
+        response.raise_for_status()
+        data = response.json()["article"]
+        updated_at = data.get("body_updated_at") or data.get("published_at") or ""
+
+        # 本文が更新されていなければ変換済みのテキストを使い回す
+        body = self.body_cache.get_version(url, updated_at)
+        if body is not None:
+            return body
+        with metrics.stage("html_to_text"):
+            text = html_to_text(data.get("body_html") or "")
+        body = ArticleBody(url=url, title=data.get("title") or "", text=text, updated_at=updated_at)
+        self.body_cache.put(body)
+        return body
+
+    async def iter_topic_pages(
+        self,
+        topic: str,
+        max_articles: int = None,
+        since: float = None,
+    ) -> AsyncIterator[List[Article]]:
+        """
+        Zenn APIからトピックの記事を新しい順にページ単位で返す非同期ジェネレーター
+
+        現在のページを呼び出し元が処理している間に次のページを先に取得する。
+
+        Args:
+            topic: トピック名
+            max_articles: 返す記事数の上限（省略時は最後のページまで）
+            since: この時刻（エポック秒）より前に投稿された記事に達したら止める
+        """
+        remaining = max_articles
+        pending = asyncio.ensure_future(self._fetch_api_page(topic, 1))
+        try:
+            while pending is not None:
+                articles, next_page = await pending
+                pending = None
+
+                page = []
+                done = next_page is None
+                for article in articles:
+                    if since is not None and article.published_ts < since:
+                        done = True
+                        break
+                    page.append(article)
+                    if remaining is not None and len(page) >= remaining:
+                        done = True
+                        break
+                if remaining is not None:
+                    remaining -= len(page)
+
+                if not done:
+                    pending = asyncio.ensure_future(self._fetch_api_page(topic, next_page))
+                if page:
+                    yield page
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _fetch_api_page(self, topic: str, page: int) -> Tuple[List[Article], Optional[int]]:
+        """記事一覧APIの1ページを取得し、記事と次のページ番号を返す"""
+        response = await self._get(
+            self._client(),
+            f"{self.api_base_url}/articles?topicname={quote(topic)}&order=latest&page={page}",
+        )
+        response.raise_for_status()
+        data = response.json()
+        with metrics.stage("parse"):
+            articles = [
+                parse_api_article(item, self.base_url) for item in data.get("articles") or []
+            ]
+        metrics.add_items(len(articles))
+        return articles, data.get("next_page")
+
+    async def backfill_topic(
+        self, topic: str, max_articles: int = None, since: float = None
+    ) -> Dict:
+        """
+        APIのページ送りでトピックの過去記事を取得し、ページごとにストアと検索インデックスへ反映する
+
+        Returns:
+            取得した記事数・ページ数・最も古い投稿日
+        """
+        topic = normalize_topic(topic)
+        max_articles = max_articles or Config.BACKFILL_DEFAULT_ARTICLES
+        fetched = 0
+        pages = 0
+        oldest = None
+
+        self.logger.info(
+            operation="backfill_topic",
+            message="Backfilling topic from API",
+            context={"topic": topic, "max_articles": max_articles, "since": since},
+        )
+
+        async for page in self.iter_topic_pages(topic, max_articles, since):
+            pages += 1
+            fetched += len(page)
+            oldest = page[-1].published_at
+            self.search_index.add(page)
+            self.time_index.add(page, topic)
+            if self.store is not None:
+                await asyncio.to_thread(self.store.upsert, page, topic)
+
+        return {"topic": topic, "articles": fetched, "pages": pages, "oldest": oldest}
+
+    async def fetch_many(
+        self,
+        topics: List[str],
+        max_articles: int = None,
+        include_trending: bool = False,
+        max_concurrency: int = None,
+    ) -> List[Article]:
+        """
+        複数トピックのフィードを並行取得し、URLで重複を除いて新しい順に返す
+
+        Args:
+            topics: 検索対象のトピック名のリスト
+            max_articles: トピックごとの最大取得記事数
+            include_trending: トレンドフィードも含めるか
+            max_concurrency: 同時に取得するフィード数の上限
+
+        Returns:
+            記事リスト。各記事の topics に掲載されていたトピック名を持つ
+        """
+        topics = list(dict.fromkeys(normalize_topic(topic) for topic in topics if topic.strip()))
+        semaphore = asyncio.Semaphore(max_concurrency or Config.BATCH_MAX_CONCURRENCY)
+
+        self.logger.info(
+            operation="fetch_many",
+            message="Fetching multiple feeds",
+            context={"topics": topics, "include_trending": include_trending},
+        )
+
+        async def fetch(topic: str, trending: bool) -> List[Article]:
+            async with semaphore:
+                if trending:
+                    return await self.fetch_trending_articles(max_articles)
+                return await self.fetch_articles_from_feed(topic, max_articles)
+
+        sources = [(topic, False) for topic in topics]
+        if include_trending:
+            sources.append((TRENDING_TOPIC, True))
+        results = await asyncio.gather(*(fetch(*source) for source in sources))
+
+        # フィードはほぼ新しい順なので、各フィードを並べ直してから k-way マージする
+        return _merge_by_recency(
+            (topic, sorted(articles, key=_by_recency, reverse=True))
+            for (topic, _), articles in zip(sources, results)
+        )
+
+    async def articles_between_many(
+        self,
+        topics: List[str],
+        since: int = None,
+        until: int = None,
+        limit: int = 10,
+        include_trending: bool = False,
+    ) -> List[Article]:
+        """
+        複数トピックの取得済みの記事から期間内の記事を集め、URLで重複を除いて新しい順に返す
+
+        各トピックの索引は新しい順に取り出せるため、k-way マージで並べる。
+        """
+        topics = list(dict.fromkeys(normalize_topic(topic) for topic in topics if topic.strip()))
+        if include_trending:
+            topics.append(TRENDING_TOPIC)
+        sources = [
+            (topic, await self.articles_between(topic, since, until, limit)) for topic in topics
+        ]
+        return _merge_by_recency(sources)
+
+
+def _by_recency(article: Article) -> int:
+    return article.published_ts
+
+
+def _merge_by_recency(sources: Iterable[Tuple[str, List[Article]]]) -> List[Article]:
+    """
+    新しい順に並んだトピックごとの記事リストを k-way マージし、URLで重複を除く
+
+    重複した記事は最初の位置に残し、掲載されていたトピックを topics にまとめる。
+    投稿日が不明な記事は published_ts が0のため最古扱いになる。
+    """
+    tagged = [[(article, topic) for article in articles] for topic, articles in sources]
+    merged: List[Article] = []
+    positions: Dict[str, int] = {}
+    for article, topic in heapq.merge(
+        *tagged, key=lambda item: item[0].published_ts, reverse=True
+    ):
+        key = article.url or article.title
+        position = positions.get(key)
+        if position is None:
+            positions[key] = len(merged)
+            merged.append(replace(article, topics=article.topics + (topic,)))
+        else:
+            known = merged[position]
+            merged[position] = replace(known, topics=known.topics + (topic,))
+    return merged
+
+
+def _in_range(timestamp: int, since: Optional[int], until: Optional[int]) -> bool:
+    """since 以上 until 未満か（指定のない側は制限しない）"""
+    return (since is None or timestamp >= since) and (until is None or timestamp < until)
+
+
+class _BackgroundLoop:
+    """同期APIからコルーチンを実行するための専用イベントループスレッド"""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=loop.run_forever, name="zenn-crawler-loop", daemon=True
+                )
+                thread.start()
+                self._loop = loop
+            return self._loop
+
+    def run(self, coro: Awaitable[T]) -> T:
+        """コルーチンを専用ループで実行し、結果を待って返す"""
+        future: Future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        try:
+            return future.result()
+        except BaseException:
+            future.cancel()
+            raise
+
+
+_background_loop = _BackgroundLoop()
+
+
+class ZennCrawler:
+    """AsyncZennCrawlerを同期的に呼び出すための薄いラッパー"""
+
+    def __init__(
+        self,
+        async_crawler: Optional[AsyncZennCrawler] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.async_crawler = async_crawler or AsyncZennCrawler(transport=transport)
+
+    @property
+    def feed_cache(self) -> FeedCache:
+        return self.async_crawler.feed_cache
+
+    @property
+    def article_cache(self) -> ArticleCache:
+        return self.async_crawler.article_cache
+
+    def fetch_articles_from_feed(
+        self, topic: str, max_articles: int = None
+    ) -> List[Article]:
+        """Zennトピックフィードから記事を取得する（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.fetch_articles_from_feed(topic, max_articles)
+        )
+
+    def fetch_trending_articles(self, max_articles: int = None) -> List[Article]:
+        """Zennトレンドフィードから記事を取得する（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.fetch_trending_articles(max_articles)
+        )
+
+    def fetch_many(
+        self,
+        topics: List[str],
+        max_articles: int = None,
+        include_trending: bool = False,
+        max_concurrency: int = None,
+    ) -> List[Article]:
+        """複数トピックのフィードを並行取得する（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.fetch_many(
+                topics, max_articles, include_trending, max_concurrency
+            )
+        )
+
+    def load_stored_articles(
+        self, topic: str, limit: int, since: int = None, until: int = None
+    ) -> List[Article]:
+        """ストアから記事を新しい順に返す（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.load_stored_articles(topic, limit, since, until)
+        )
+
+    def search_articles(
+        self, query: str, limit: int = 10, since: int = None, until: int = None
+    ) -> List[Article]:
+        """取得済みの記事を全文検索する（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.search_articles(query, limit, since, until)
+        )
+
+    def articles_between(
+        self, topic: Optional[str], since: int = None, until: int = None, limit: int = 10
+    ) -> List[Article]:
+        """取得済みの記事から期間内の記事を新しい順に返す（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.articles_between(topic, since, until, limit)
+        )
+
+    def fetch_article_bodies(
+        self, urls: List[str], max_concurrency: int = None
+    ) -> List[Optional[ArticleBody]]:
+        """記事本文を並行取得する（同期版）"""
+        return _background_loop.run(
+            self.async_crawler.fetch_article_bodies(urls, max_concurrency)
+        )
+
+    def iter_topic_pages(
+        self, topic: str, max_articles: int = None, since: float = None
+    ) -> Iterator[List[Article]]:
+        """トピックの記事をページ単位で返すジェネレーター（同期版）"""
+        pages = self.async_crawler.iter_topic_pages(topic, max_articles, since)
+
+        async def next_page():
+            try:
+                return await pages.__anext__()
+            except StopAsyncIteration:
+                return None
+
+        try:
+            while True:
+                page = _background_loop.run(next_page())
+                if page is None:
+                    return
+                yield page
+        finally:
+            _background_loop.run(pages.aclose())
+
+    def backfill_topic(self, topic: str, max_articles: int = None, since: float = None) -> Dict:
+        """トピックの過去記事を取得して蓄積する（同期版）"""
+        return _background_loop.run(self.async_crawler.backfill_topic(topic, max_articles, since))
+
+    def close(self) -> None:
+        """プールしている接続とバックグラウンド再取得を解放する"""
+        _background_loop.run(self.async_crawler.aclose())
+
+
+# Process-wide crawler instances
+_async_crawler = None
+_crawler = None
+_crawler_lock = threading.Lock()
+
+
+def get_async_crawler() -> AsyncZennCrawler:
+    """プロセス全体で共有するAsyncZennCrawlerを取得"""
+    global _async_crawler
+
+    if _async_crawler is None:
+        with _crawler_lock:
+            if _async_crawler is None:
+                store = ArticleStore() if Config.ARTICLE_STORE_PATH else None
+                _async_crawler = AsyncZennCrawler(store=store)
+                metrics.register_collector("article_cache", _async_crawler.article_cache.stats)
+                metrics.register_collector("singleflight", _async_crawler.flights.stats)
+                metrics.register_collector("search_index", _async_crawler.search_index.stats)
+                metrics.register_collector("body_cache", _async_crawler.body_cache.stats)
+                metrics.register_collector("latency", _async_crawler.latency.stats)
+                metrics.register_collector("circuit", _async_crawler.breakers.stats)
+                metrics.register_collector("rate_limit", _async_crawler.rate_limiter.stats)
+                metrics.register_collector("time_index", _async_crawler.time_index.stats)
+                metrics.register_collector(
+                    "trending_history", _async_crawler.trending_history.stats
+                )
+                if _async_crawler.recorder is not None:
+                    metrics.register_collector("recorder", _async_crawler.recorder.stats)
+                if isinstance(_async_crawler._transport, ReplayTransport):
+                    metrics.register_collector("replay", _async_crawler._transport.stats)
+    return _async_crawler
+
 
+def get_crawler() -> ZennCrawler:
+    """共有のAsyncZennCrawlerを包む同期クローラーを取得"""
+    global _crawler
 
+    if _crawler is None:
+        async_crawler = get_async_crawler()
+        with _crawler_lock:
+            if _crawler is None:
+                _crawler = ZennCrawler(async_crawler)
+    return _crawler
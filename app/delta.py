@@ -0,0 +1,183 @@
+"""
+前回の呼び出しから増えた記事だけを返す差分モード
+
+呼び出し元ごと（カーソル）・トピックごとに配信済みの記事URLを覚えておき、
+まだ返していない記事だけを選ぶ。複数トピックの一括取得では記事が掲載されていた
+トピックごとに覚えるため、組み合わせを変えて呼んでも同じ記事を返し直さない。
+直近の URL は 128bit ハッシュの集合で持ち、上限からあふれた古い URL は
+Bloom フィルタに移して少ないメモリで覚えておく
+（Bloom フィルタ側はまれに未配信の記事を配信済みと誤判定する）。
+"""
+
+import hashlib
+import math
+import secrets
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from app.config import Config
+from app.metrics import metrics
+from app.models import Article
+
+_MASK64 = (1 << 64) - 1
+
+# 1つのトピック名か、記事ごとにその記事が属するトピック名を返す関数
+Scope = Union[str, Callable[[Article], Iterable[str]]]
+
+
+def _digest(url: str) -> int:
+    """URLの128bitハッシュ"""
+    return int.from_bytes(hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest(), "little")
+
+
+class BloomFilter:
+    """ダブルハッシングで k 個の位置を決めるBloomフィルタ"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        self.capacity = capacity
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, digest: int) -> Iterable[int]:
+        h1, h2 = digest & _MASK64, (digest >> 64) | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: int) -> None:
+        for position in self._positions(digest):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, digest: int) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(digest)
+        )
+
+    def clear(self) -> None:
+        self._bits = bytearray(len(self._bits))
+        self.count = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+class SeenSet:
+    """1つのカーソル・トピックで配信済みの記事URL"""
+
+    def __init__(self, max_entries: int = None, bloom_capacity: int = None):
+        self.max_entries = max_entries or Config.DELTA_SEEN_MAX_ENTRIES
+        self.bloom_capacity = (
+            Config.DELTA_BLOOM_CAPACITY if bloom_capacity is None else bloom_capacity
+        )
+        self._recent: "OrderedDict[int, None]" = OrderedDict()
+        self._bloom: Optional[BloomFilter] = None
+
+    def __contains__(self, url: str) -> bool:
+        digest = _digest(url)
+        return digest in self._recent or (self._bloom is not None and digest in self._bloom)
+
+    def __len__(self) -> int:
+        return len(self._recent) + (self._bloom.count if self._bloom is not None else 0)
+
+    def add(self, url: str) -> None:
+        digest = _digest(url)
+        self._recent[digest] = None
+        self._recent.move_to_end(digest)
+        while len(self._recent) > self.max_entries:
+            evicted, _ = self._recent.popitem(last=False)
+            self._spill(evicted)
+
+    def _spill(self, evicted: int) -> None:
+        """あふれたハッシュをBloomフィルタに移す（無効なら忘れる）"""
+        if not self.bloom_capacity:
+            return
+        if self._bloom is None:
+            self._bloom = BloomFilter(self.bloom_capacity, Config.DELTA_BLOOM_ERROR_RATE)
+        elif self._bloom.count >= self.bloom_capacity:
+            # 容量を超えると誤判定が増えるため、古い記憶をまとめて捨てる
+            self._bloom.clear()
+        self._bloom.add(evicted)
+
+    def bloom_bytes(self) -> int:
+        return self._bloom.nbytes if self._bloom is not None else 0
+
+
+class DeltaTracker:
+    """カーソルごと・トピックごとの配信済み記事の集合（組の数は上限付きのLRU）"""
+
+    def __init__(self, max_scopes: int = None):
+        self.max_scopes = max_scopes or Config.DELTA_MAX_SCOPES
+        self._sets: "OrderedDict[Tuple[str, str], SeenSet]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.suppressed = 0
+
+    @staticmethod
+    def new_cursor() -> str:
+        return secrets.token_urlsafe(12)
+
+    def _seen(self, cursor: str, scope: str) -> SeenSet:
+        key = (cursor, scope.lower())
+        seen = self._sets.get(key)
+        if seen is None:
+            seen = self._sets[key] = SeenSet()
+            while len(self._sets) > self.max_scopes:
+                self._sets.popitem(last=False)
+        self._sets.move_to_end(key)
+        return seen
+
+    @staticmethod
+    def _scopes_of(scope: Scope) -> Callable[[Article], Iterable[str]]:
+        if isinstance(scope, str):
+            return lambda article: (scope,)
+        return scope
+
+    def unseen(self, cursor: str, scope: Scope, articles: Sequence[Article]) -> List[Article]:
+        """まだ配信していない記事だけを元の順で返す（いずれかのトピックで配信済みなら除く）"""
+        with self._lock:
+            if isinstance(scope, str):
+                seen = self._seen(cursor, scope)
+                fresh = [article for article in articles if article.url not in seen]
+            else:
+                fresh = [
+                    article for article in articles
+                    if not any(article.url in self._seen(cursor, name) for name in scope(article))
+                ]
+            self.suppressed += len(articles) - len(fresh)
+            return fresh
+
+    def mark_delivered(self, cursor: str, scope: Scope, articles: Iterable[Article]) -> None:
+        """記事を属するすべてのトピックで配信済みにする"""
+        scopes_of = self._scopes_of(scope)
+        with self._lock:
+            for article in articles:
+                if not article.url:
+                    # URLのない記事は見分けられないため覚えない
+                    continue
+                for name in scopes_of(article):
+                    self._seen(cursor, name).add(article.url)
+                self.delivered += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._sets.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            sets = list(self._sets.values())
+            return {
+                "scopes": len(sets),
+                "urls": sum(len(seen) for seen in sets),
+                "bloom_bytes": sum(seen.bloom_bytes() for seen in sets),
+                "delivered": self.delivered,
+                "suppressed": self.suppressed,
+            }
+
+
+delta_tracker = DeltaTracker()
+metrics.register_collector("delta", delta_tracker.stats)
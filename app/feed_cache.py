@@ -0,0 +1,88 @@
+"""
+Zennフィードの条件付きGET用キャッシュ
+
+フィードURLごとに生のレスポンスボディと `ETag` / `Last-Modified` を保持し、
+`304 Not Modified` の場合はパース済みの記事リストをそのまま返せるようにする。
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.config import Config
+from app.lru import LRU
+from app.models import Article
+
+
+@dataclass
+class FeedCacheEntry:
+    """1フィード分のキャッシュエントリ"""
+
+    body: bytes
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    articles: List[Article] = field(default_factory=list)
+    parsed_limit: int = 0
+
+    def covers(self, max_articles: int) -> bool:
+        """パース済みの記事だけで指定件数に応えられるか"""
+        return (
+            self.parsed_limit >= max_articles
+            or len(self.articles) < self.parsed_limit
+        )
+
+
+class FeedCache:
+    """フィードURLをキーにしたスレッドセーフなLRUキャッシュ"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or Config.FEED_CACHE_MAX_ENTRIES
+        self._entries: "LRU[str, FeedCacheEntry]" = LRU(self.max_entries)
+
+    def get(self, url: str) -> Optional[FeedCacheEntry]:
+        return self._entries.get(url)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """再検証リクエストに付けるヘッダーを返す"""
+        entry = self.get(url)
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        url: str,
+        body: bytes,
+        etag: Optional[str],
+        last_modified: Optional[str],
+        articles: List[Article],
+        parsed_limit: int,
+    ) -> None:
+        """検証子を持つレスポンスだけを保存する"""
+        if not etag and not last_modified:
+            return
+        self._entries.put(url, FeedCacheEntry(
+            body=body,
+            etag=etag,
+            last_modified=last_modified,
+            articles=articles,
+            parsed_limit=parsed_limit,
+        ))
+
+    def update_articles(self, url: str, articles: List[Article], parsed_limit: int) -> None:
+        """保存済みボディを再パースした結果で記事リストを差し替える"""
+        with self._entries.lock:
+            entry = self._entries.peek(url)
+            if entry is not None:
+                entry.articles = articles
+                entry.parsed_limit = parsed_limit
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
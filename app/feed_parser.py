@@ -0,0 +1,182 @@
+"""
+RSSフィードのストリーミングパーサー
+
+フィード全体のツリーを作らずに `<item>` 要素を読み込み順に返し、
+必要な件数に達した時点で読み込みを打ち切る。
+"""
+
+import html
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Iterator, Union
+
+from lxml import etree
+
+from app.config import Config
+from app.metrics import metrics
+from app.models import Article
+
+DC_NAMESPACE = "http://purl.org/dc/elements/1.1/"
+DC_CREATOR = f"{{{DC_NAMESPACE}}}creator"
+
+# <item> の子要素名と Article のフィールド名の対応
+_ITEM_FIELDS = {
+    "title": "title",
+    "link": "url",
+    "pubDate": "published_at",
+    DC_CREATOR: "creator",
+    "description": "description",
+}
+
+# 段落や改行に当たるタグは空白に、それ以外のタグは空文字に置き換える
+_BLOCK_TAG_PATTERN = re.compile(r"<(?:br|/?p|/?div|/?li|/?h[1-6])\b[^>]*>", re.IGNORECASE)
+_TAG_PATTERN = re.compile(r"<[^>]*>")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+# 記事本文のテキスト化で改行に置き換えるタグ
+_LINE_BREAK_TAG_PATTERN = re.compile(
+    r"<(?:br|hr|/?(?:p|div|li|ul|ol|h[1-6]|pre|blockquote|table|tr|figure|details|summary))\b[^>]*>",
+    re.IGNORECASE,
+)
+_SCRIPT_STYLE_PATTERN = re.compile(r"<(script|style)\b.*?</\1\s*>", re.IGNORECASE | re.DOTALL)
+_BLANK_LINES_PATTERN = re.compile(r"\n{3,}")
+
+# パーサーに一度に渡すバイト数
+CHUNK_SIZE = 16 * 1024
+
+
+def iter_feed_items(
+    content: Union[bytes, str], max_items: int
+) -> Iterator[etree._Element]:
+    """
+    フィードの `<item>` 要素を順に返す
+
+    呼び出し側が次の要素を要求した時点で直前の要素とそれ以前の兄弟要素を
+    解放するため、メモリ上に残るのは処理中の1件だけになる。
+
+    Args:
+        content: RSSのレスポンスボディ
+        max_items: 返す最大件数
+
+    Yields:
+        `<item>` 要素
+    """
+    if max_items <= 0:
+        return
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    # XML宣言より前の空白はパースエラーになるため取り除く
+    content = content.lstrip()
+
+    parser = etree.XMLPullParser(
+        events=("end",),
+        tag="item",
+        recover=True,
+        resolve_entities=False,
+        no_network=True,
+    )
+    count = 0
+    for offset in range(0, len(content), CHUNK_SIZE):
+        parser.feed(content[offset:offset + CHUNK_SIZE])
+        for _, item in parser.read_events():
+            yield item
+            count += 1
+            _release(item)
+            if count >= max_items:
+                return
+
+    try:
+        parser.close()
+    except etree.XMLSyntaxError:
+        # 空や壊れた末尾は、そこまでに読めたアイテムだけを返して終える
+        return
+    for _, item in parser.read_events():
+        yield item
+        count += 1
+        _release(item)
+        if count >= max_items:
+            return
+
+
+def _release(item: etree._Element) -> None:
+    """処理済みの要素と、それより前の兄弟要素を解放する"""
+    item.clear(keep_tail=False)
+    parent = item.getparent()
+    if parent is not None:
+        while item.getprevious() is not None:
+            del parent[0]
+
+
+def parse_item(item: etree._Element, max_description_length: int = None) -> Article:
+    """`<item>` 要素の子要素を1回だけ走査して Article を作る"""
+    fields = {}
+    for child in item:
+        name = _ITEM_FIELDS.get(child.tag)
+        if name is not None and name not in fields:
+            fields[name] = child.text or ""
+
+    description = fields.get("description")
+    if description:
+        with metrics.stage("sanitize"):
+            fields["description"] = strip_html(
+                description,
+                max_description_length or Config.DESCRIPTION_MAX_LENGTH,
+            )
+    return Article(**fields)
+
+
+def strip_html(text: str, max_length: int = None) -> str:
+    """
+    HTMLタグと文字参照を取り除いたプレーンテキストを返す
+
+    Args:
+        text: HTMLを含みうる文字列
+        max_length: 最大文字数。超えた場合は末尾を「…」にして切り詰める
+
+    Returns:
+        プレーンテキスト
+    """
+    if "<" in text:
+        text = _TAG_PATTERN.sub("", _BLOCK_TAG_PATTERN.sub(" ", text))
+    if "&" in text:
+        text = html.unescape(text)
+    text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+    if max_length and len(text) > max_length:
+        text = text[:max_length - 1].rstrip() + "…"
+    return text
+
+
+def html_to_text(text: str) -> str:
+    """
+    記事本文のHTMLを段落と改行を残したプレーンテキストにする
+
+    コードブロックの字下げを保つため、行内の空白はまとめない。
+    """
+    text = _SCRIPT_STYLE_PATTERN.sub("", text)
+    text = _TAG_PATTERN.sub("", _LINE_BREAK_TAG_PATTERN.sub("\n", text))
+    if "&" in text:
+        text = html.unescape(text)
+    text = "\n".join(line.rstrip() for line in text.split("\n"))
+    return _BLANK_LINES_PATTERN.sub("\n\n", text).strip()
+
+
+def parse_api_article(data: Dict, base_url: str) -> Article:
+    """
+    Zenn APIの記事一覧の要素から Article を作る
+
+    投稿日はフィードと同じRFC 822形式（GMT）にそろえる。一覧には概要が含まれないため空にする。
+    """
+    published_at = data.get("published_at") or ""
+    try:
+        published = datetime.fromisoformat(published_at).astimezone(timezone.utc)
+        published_at = format_datetime(published, usegmt=True)
+    except ValueError:
+        pass
+    user = data.get("user") or {}
+    path = data.get("path") or ""
+    return Article(
+        title=data.get("title") or "",
+        url=f"{base_url}{path}" if path else "",
+        published_at=published_at,
+        creator=user.get("name") or user.get("username") or "",
+    )
@@ -2,18 +2,238 @@
 Logging configuration for Zenn MCP Server using vibelogger.
 """
 
-from vibelogger import create_file_logger
+import atexit
+import queue
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+from app.config import Config
+from app.metrics import metrics
+
+if TYPE_CHECKING:
+    from vibelogger.logger import VibeLogger
+
+_LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40, "CRITICAL": 50}
 
 # Global logger instance
 _logger = None
 
 
+class GatedLogger:
+    """
+    vibeloggerの前段で最低レベルの判定と繰り返し警告の間引きを行うロガー
+
+    vibeloggerとログファイルは最初の書き込み時まで作らない。
+    警告は操作名ごとに LOG_SAMPLE_WINDOW 秒の間、最初の LOG_SAMPLE_BURST 件を書き、
+    以降は LOG_SAMPLE_EVERY 件に1件だけ書く。ERROR以上は間引かない。
+    """
+
+    def __init__(
+        self,
+        logger_factory: Callable[[], "VibeLogger"],
+        min_level: str = None,
+        sample_window: float = None,
+        sample_burst: int = None,
+        sample_every: int = None,
+        clock=time.monotonic,
+    ):
+        self.logger_factory = logger_factory
+        self._logger = None
+        self.min_level = _LEVELS.get(min_level or Config.LOG_LEVEL, _LEVELS["INFO"])
+        self.sample_window = sample_window or Config.LOG_SAMPLE_WINDOW
+        self.sample_burst = sample_burst or Config.LOG_SAMPLE_BURST
+        self.sample_every = sample_every or Config.LOG_SAMPLE_EVERY
+        self._clock = clock
+        # 操作名 -> (集計期間の開始時刻, 期間内の件数)
+        self._windows: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+        self.written = 0
+        self.filtered = 0
+        self.sampled = 0
+        self.dropped = 0
+
+    def debug(self, operation: str, message: str, **kwargs) -> None:
+        self._log("DEBUG", operation, message, kwargs)
+
+    def info(self, operation: str, message: str, **kwargs) -> None:
+        self._log("INFO", operation, message, kwargs)
+
+    def warning(self, operation: str, message: str, **kwargs) -> None:
+        self._log("WARNING", operation, message, kwargs)
+
+    def error(self, operation: str, message: str, **kwargs) -> None:
+        self._log("ERROR", operation, message, kwargs)
+
+    def critical(self, operation: str, message: str, **kwargs) -> None:
+        self._log("CRITICAL", operation, message, kwargs)
+
+    def _log(self, level: str, operation: str, message: str, kwargs: Dict) -> None:
+        if _LEVELS[level] < self.min_level:
+            self.filtered += 1
+            return
+        if level == "WARNING" and not self._should_sample(operation):
+            self.sampled += 1
+            return
+
+        # 呼び出し元の情報と時刻はここで確定させる（書き込みスレッドでは取れない）
+        frame = sys._getframe(2)
+        source = (
+            f"{frame.f_code.co_filename.rsplit('/', 1)[-1]}:{frame.f_lineno} "
+            f"in {frame.f_code.co_name}()"
+        )
+        stack = None
+        if level in ("ERROR", "CRITICAL"):
+            stack = traceback.format_stack(frame)
+        record = (
+            datetime.now(timezone.utc).isoformat(), source, stack,
+            level, operation, message, kwargs,
+        )
+        self._emit(record)
+
+    def _should_sample(self, operation: str) -> bool:
+        now = self._clock()
+        with self._lock:
+            start, count = self._windows.get(operation, (now, 0))
+            if now - start >= self.sample_window:
+                start, count = now, 0
+            count += 1
+            self._windows[operation] = (start, count)
+        if count <= self.sample_burst:
+            return True
+        return (count - self.sample_burst) % self.sample_every == 0
+
+    def _emit(self, record: Tuple) -> None:
+        self._write(record)
+
+    @property
+    def logger(self) -> "VibeLogger":
+        """書き込み先のvibelogger（初回アクセス時に作成する）"""
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    self._logger = self.logger_factory()
+        return self._logger
+
+    def set_logger_factory(self, logger_factory: Callable[[], "VibeLogger"]) -> None:
+        """書き込み先を差し替える（次の書き込みで作り直す）"""
+        with self._lock:
+            self.logger_factory = logger_factory
+            self._logger = None
+
+    def _write(self, record: Tuple) -> None:
+        # 呼び出し元と時刻を書き込みスレッドで差し替えるため、vibeloggerの非公開APIを使う。
+        # pyproject.toml で版を固定し、tests/test_logging.py で存在を確かめている
+        from vibelogger.logger import LogLevel
+
+        timestamp, source, stack, level, operation, message, kwargs = record
+        logger = self.logger
+        entry = logger._create_log_entry(
+            level=LogLevel(level), operation=operation, message=message, **kwargs
+        )
+        entry.timestamp = timestamp
+        entry.source = source
+        entry.stack_trace = stack
+        logger._process_entry(entry)
+        self.written += 1
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        """書き込み待ちのレコードを書き終えるまで待つ"""
+
+    def close(self) -> None:
+        """書き込みを終了する"""
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "written": self.written,
+            "filtered": self.filtered,
+            "sampled": self.sampled,
+            "dropped": self.dropped,
+            "queued": 0,
+        }
+
+
+class QueuedLogger(GatedLogger):
+    """
+    レコードを有界キューに積み、ファイルへの書き込みをバックグラウンドスレッドで行うロガー
+
+    呼び出し元はディスクI/Oを待たない。キューが満杯のときはレコードを捨てて数える。
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self, logger_factory: Callable[[], "VibeLogger"], queue_size: int = None, **kwargs
+    ):
+        super().__init__(logger_factory, **kwargs)
+        self._queue: "queue.Queue" = queue.Queue(maxsize=queue_size or Config.LOG_QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="zenn-log-writer", daemon=True)
+        self._thread.start()
+
+    def _emit(self, record: Tuple) -> None:
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            try:
+                if record is self._STOP:
+                    return
+                self._write(record)
+            except Exception as e:
+                print(f"Failed to write log record: {e}", file=sys.stderr)
+            finally:
+                self._queue.task_done()
+
+    def flush(self, timeout: Optional[float] = None) -> None:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks and self._thread.is_alive():
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            time.sleep(0.001)
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        try:
+            self._queue.put(self._STOP, timeout=1)
+        except queue.Full:
+            return
+        self._thread.join(timeout=5)
+
+    def stats(self) -> Dict[str, int]:
+        stats = super().stats()
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+
+def _create_file_logger() -> "VibeLogger":
+    # Create vibelogger instance - it automatically creates ./logs/zenn_mcp/ directory
+    from vibelogger import create_file_logger
+
+    return create_file_logger("zenn_mcp")
+
+
 def setup_logging():
     """Setup vibelogger configuration."""
     global _logger
 
-    # Create vibelogger instance - it automatically creates ./logs/zenn_mcp/ directory
-    _logger = create_file_logger("zenn_mcp")
+    if _logger is not None:
+        # 各モジュールが保持しているロガーを生かしたまま書き込み先だけ作り直す
+        _logger.set_logger_factory(_create_file_logger)
+        return
+
+    if Config.LOG_MODE == "sync":
+        _logger = GatedLogger(_create_file_logger)
+    else:
+        _logger = QueuedLogger(_create_file_logger)
+    metrics.register_collector("logging", _logger.stats)
 
 
 def get_logger(name: str = "zenn_mcp"):
@@ -21,3 +241,11 @@ def get_logger(name: str = "zenn_mcp"):
     if _logger is None:
         setup_logging()
     return _logger
+
+
+def _close_logger():
+    if _logger is not None:
+        _logger.close()
+
+
+atexit.register(_close_logger)
@@ -0,0 +1,109 @@
+"""
+キャッシュ類が共通で使うスレッドセーフなLRUの辞書
+
+件数（と任意で重みの合計）の上限を超えたら使われていない順に追い出し、
+ヒット・ミス・追い出しを数える。TTLや件数の充足などの判定は各キャッシュが
+`lock` を取ったうえで `peek` / `touch` / `pop` を組み合わせて上乗せする。
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class LRU(Generic[K, V]):
+    """上限付きのLRUの辞書"""
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_weight: int = 0,
+        weigh: Optional[Callable[[V], int]] = None,
+    ):
+        """
+        Args:
+            max_entries: 保持する件数の上限
+            max_weight: weigh で測った重みの合計の上限（0なら無制限）。最新の1件は常に残す
+            weigh: 値の重み（おおよそのバイト数など）
+        """
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._weigh = weigh
+        self._entries: "OrderedDict[K, V]" = OrderedDict()
+        self._weight = 0
+        # 複数の操作をまとめて行うときは呼び出し側でも取る
+        self.lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: K) -> Optional[V]:
+        """値を返して最近使ったものにする（ヒット・ミスを数える）"""
+        with self.lock:
+            value = self._entries.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def peek(self, key: K) -> Optional[V]:
+        """順序もカウンタも変えずに値を返す"""
+        with self.lock:
+            return self._entries.get(key)
+
+    def touch(self, key: K) -> None:
+        """最近使ったものにする"""
+        with self.lock:
+            self._entries.move_to_end(key)
+
+    def put(self, key: K, value: V) -> None:
+        """値を保存し、上限を超えた分を使われていない順に追い出す"""
+        with self.lock:
+            if key in self._entries:
+                self.pop(key)
+            self._entries[key] = value
+            if self._weigh is not None:
+                self._weight += self._weigh(value)
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries
+                or (self.max_weight and self._weight > self.max_weight)
+            ):
+                self.pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def pop(self, key: K) -> Optional[V]:
+        """値を取り除いて返す（なければ None）"""
+        with self.lock:
+            value = self._entries.pop(key, None)
+            if value is not None and self._weigh is not None:
+                self._weight -= self._weigh(value)
+            return value
+
+    def clear(self) -> None:
+        with self.lock:
+            self._entries.clear()
+            self._weight = 0
+
+    @property
+    def weight(self) -> int:
+        return self._weight
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._entries
+
+    def stats(self) -> Dict[str, int]:
+        with self.lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
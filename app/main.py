@@ -2,12 +2,25 @@
 Zenn MCP Server using FastMCP for simplified implementation.
 """
 
-from typing import Annotated
+import asyncio
+import functools
+import logging
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Annotated, List, Optional
 
 from mcp.server.fastmcp import FastMCP
 
-from app.crawler import ZennCrawler
+from app.concurrency import ServerBusyError, tool_limiter
+from app.config import Config
+from app.delta import Scope, delta_tracker
 from app.logging_config import get_logger, setup_logging
+from app.metrics import metrics, start_metrics_server
+from app.models import TRENDING_TOPIC, Article
+from app.render import render_articles, render_articles_counted
+
+if TYPE_CHECKING:
+    from app.crawler import AsyncZennCrawler
+    from app.scheduler import PrefetchScheduler
 
 # Initialize logging
 setup_logging()
@@ -16,11 +29,96 @@ logger = get_logger(__name__)
 # Create FastMCP server
 mcp = FastMCP("zenn-mcp")
 
+# FastMCPが設定するINFOレベルのログでhttpxがリクエストごとに出力しないようにする
+logging.getLogger("httpx").setLevel(logging.WARNING)
+
+
+def get_async_crawler() -> "AsyncZennCrawler":
+    """共有クローラーを取得（httpx・lxml・sqlite3は最初のツール呼び出しまで読み込まない）"""
+    from app.crawler import get_async_crawler as get_shared_crawler
+
+    return get_shared_crawler()
+
+
+def get_scheduler() -> "PrefetchScheduler":
+    """共有の先読みスケジューラーを取得"""
+    from app.scheduler import get_scheduler as get_shared_scheduler
+
+    return get_shared_scheduler()
+
+
+def _timed_tool(func):
+    """ツール呼び出しの同時実行数を制限し、所要時間をメトリクスに記録する"""
+
+    @functools.wraps(func)
+    async def wrapper(*args, **kwargs):
+        try:
+            async with tool_limiter:
+                with metrics.tool(func.__name__):
+                    return await func(*args, **kwargs)
+        except ServerBusyError as e:
+            metrics.error("busy")
+            return str(e)
+
+    return wrapper
+
+
+def _render_delta(
+    heading: str,
+    scope: Scope,
+    articles: List[Article],
+    cursor: str,
+    output_format: str,
+    max_chars: int,
+    max_tokens: int,
+) -> str:
+    """
+    差分モードの応答を作る。このカーソルにまだ返していない記事だけを整形し、
+    応答に含められた記事を配信済みにする（上限で省いた記事は次回に回す）
+    """
+    cursor = cursor or delta_tracker.new_cursor()
+    fresh = delta_tracker.unseen(cursor, scope, articles)
+    text, kept = render_articles_counted(
+        heading, fresh, output_format, max_chars, max_tokens, cursor
+    )
+    delta_tracker.mark_delivered(cursor, scope, fresh[:kept])
+    return text
+
+
+def _parse_time(value: str) -> Optional[int]:
+    """ISO 8601 の日付・日時をエポック秒にする（空文字なら None、タイムゾーンなしはUTC）"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"日付 '{value}' を解釈できません。YYYY-MM-DD 形式で指定してください。")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+def _track_topics(crawler, topics: List[str]) -> None:
+    """要求されたトピックを先読みスケジューラーに記録し、有効なら開始する"""
+    scheduler = get_scheduler()
+    for topic in topics:
+        scheduler.record(topic)
+    if Config.PREFETCH_ENABLED:
+        scheduler.ensure_started(crawler)
+
 
 @mcp.tool()
-def search_zenn_articles(
+@_timed_tool
+async def search_zenn_articles(
     topic: Annotated[str, "検索トピック"], 
-    max_articles: Annotated[int, "最大取得記事数 (1-10)"] = 10
+    max_articles: Annotated[int, "最大取得記事数 (1-10)"] = 10,
+    output_format: Annotated[str, "出力形式 (markdown / compact / json)"] = "markdown",
+    max_chars: Annotated[int, "応答の最大文字数（0で無制限。超える場合は概要を短くする）"] = 0,
+    max_tokens: Annotated[int, "応答のおおよその最大トークン数（0で無制限）"] = 0,
+    since: Annotated[str, "この日時（YYYY-MM-DD などのISO 8601、タイムゾーンなしはUTC）以降に投稿された記事に絞る"] = "",
+    until: Annotated[str, "この日時より前に投稿された記事に絞る"] = "",
+    delta: Annotated[bool, "前回から増えた記事だけを返す（応答のカーソルを次回の cursor に渡す）"] = False,
+    cursor: Annotated[str, "差分モードのカーソル（指定すると delta を省略できる）"] = ""
 ) -> str:
     """Zennから指定トピックの記事フィードを取得"""
     
@@ -34,37 +132,47 @@ def search_zenn_articles(
         # Validate max_articles
         if max_articles < 1 or max_articles > 10:
             max_articles = 10
+        try:
+            since_ts, until_ts = _parse_time(since), _parse_time(until)
+        except ValueError as e:
+            return str(e)
         
-        # Initialize crawler
-        crawler = ZennCrawler()
+        # Reuse the process-wide crawler and its pooled connections
+        crawler = get_async_crawler()
+        _track_topics(crawler, [topic])
         
         # Fetch articles from feed
-        articles = crawler.fetch_articles_from_feed(
+        articles = await crawler.fetch_articles_from_feed(
             topic=topic,
             max_articles=max_articles
         )
+        if since_ts is not None or until_ts is not None:
+            # フィードの記事を索引に加えたうえで、過去に取得した記事も含めて期間で引く
+            articles = await crawler.articles_between(topic, since_ts, until_ts, max_articles)
         
+        if delta or cursor:
+            return _render_delta(
+                f"# トピック: {topic}", topic, articles, cursor,
+                output_format, max_chars, max_tokens
+            )
+
         if not articles:
             return f"トピック '{topic}' の記事が見つかりませんでした。"
         
-        # Format response with basic article information
-        response_parts = [
-            f"# トピック: {topic}",
-            f"取得記事数: {len(articles)}件\n"
-        ]
-        
-        for i, article in enumerate(articles, 1):
-            response_parts.append(
-                f"## {i}. {article.get('title', 'タイトルなし')}\n"
-                f"- **作成者**: {article.get('creator', '不明')}\n"
-                f"- **作成日**: {article.get('published_at', '不明')}\n"
-                f"- **概要**: {article.get('description', '概要なし')}\n"
-                f"- **URL**: {article.get('url', 'URLなし')}\n"
-            )
-        
-        return "\n".join(response_parts)
-            
+        return render_articles(
+            f"# トピック: {topic}", articles, output_format, max_chars, max_tokens
+        )
+
+    except asyncio.CancelledError:
+        # クライアントが呼び出しを中断した場合は取得も中断する
+        logger.info(
+            operation="search_zenn_articles",
+            message="Tool call cancelled by client",
+            context={"topic": topic}
+        )
+        raise
     except Exception as e:
+        metrics.error("tool")
         logger.error(
             operation="search_zenn_articles",
             message="Tool execution failed",
@@ -74,8 +182,14 @@ def search_zenn_articles(
 
 
 @mcp.tool()
-def get_trending_articles(
-    max_articles: Annotated[int, "最大取得記事数 (1-10)"] = 10
+@_timed_tool
+async def get_trending_articles(
+    max_articles: Annotated[int, "最大取得記事数 (1-10)"] = 10,
+    output_format: Annotated[str, "出力形式 (markdown / compact / json)"] = "markdown",
+    max_chars: Annotated[int, "応答の最大文字数（0で無制限。超える場合は概要を短くする）"] = 0,
+    max_tokens: Annotated[int, "応答のおおよその最大トークン数（0で無制限）"] = 0,
+    delta: Annotated[bool, "前回から増えた記事だけを返す（応答のカーソルを次回の cursor に渡す）"] = False,
+    cursor: Annotated[str, "差分モードのカーソル（指定すると delta を省略できる）"] = ""
 ) -> str:
     """Zennから現在のトレンド記事フィードを取得"""
     
@@ -90,44 +204,503 @@ def get_trending_articles(
         if max_articles < 1 or max_articles > 10:
             max_articles = 10
         
-        # Initialize crawler
-        crawler = ZennCrawler()
+        # Reuse the process-wide crawler and its pooled connections
+        crawler = get_async_crawler()
         
         # Fetch trending articles
-        articles = crawler.fetch_trending_articles(max_articles=max_articles)
+        articles = await crawler.fetch_trending_articles(max_articles=max_articles)
         
+        if delta or cursor:
+            return _render_delta(
+                "# Zennトレンド記事", TRENDING_TOPIC, articles, cursor,
+                output_format, max_chars, max_tokens
+            )
+
         if not articles:
             return "現在のトレンド記事が見つかりませんでした。"
         
-        # Format response with basic article information
-        response_parts = [
-            f"# Zennトレンド記事",
-            f"取得記事数: {len(articles)}件\n"
-        ]
-        
-        for i, article in enumerate(articles, 1):
+        return render_articles(
+            "# Zennトレンド記事", articles, output_format, max_chars, max_tokens
+        )
+
+    except asyncio.CancelledError:
+        logger.info(
+            operation="get_trending_articles",
+            message="Tool call cancelled by client"
+        )
+        raise
+    except Exception as e:
+        metrics.error("tool")
+        logger.error(
+            operation="get_trending_articles",
+            message="Tool execution failed",
+            context={"error": str(e)}
+        )
+        return f"エラーが発生しました: {str(e)}"
+
+
+@mcp.tool()
+@_timed_tool
+async def search_zenn_articles_batch(
+    topics: Annotated[List[str], "検索トピックのリスト"],
+    max_articles: Annotated[int, "トピックごとの最大取得記事数 (1-10)"] = 10,
+    include_trending: Annotated[bool, "トレンド記事も含めるか"] = False,
+    output_format: Annotated[str, "出力形式 (markdown / compact / json)"] = "markdown",
+    max_chars: Annotated[int, "応答の最大文字数（0で無制限。超える場合は概要を短くする）"] = 0,
+    max_tokens: Annotated[int, "応答のおおよその最大トークン数（0で無制限）"] = 0,
+    since: Annotated[str, "この日時（YYYY-MM-DD などのISO 8601、タイムゾーンなしはUTC）以降に投稿された記事に絞る"] = "",
+    until: Annotated[str, "この日時より前に投稿された記事に絞る"] = "",
+    delta: Annotated[bool, "前回から増えた記事だけを返す（応答のカーソルを次回の cursor に渡す）"] = False,
+    cursor: Annotated[str, "差分モードのカーソル（指定すると delta を省略できる）"] = ""
+) -> str:
+    """Zennから複数トピックの記事フィードを並行取得し、重複を除いて新しい順に返す"""
+
+    logger.info(
+        operation="search_zenn_articles_batch",
+        message=f"Searching articles for {len(topics)} topics",
+        context={"topics": topics, "max_articles": max_articles, "include_trending": include_trending}
+    )
+
+    try:
+        # Validate max_articles
+        if max_articles < 1 or max_articles > 10:
+            max_articles = 10
+
+        if not topics and not include_trending:
+            return "検索トピックを1つ以上指定してください。"
+        if len(topics) > Config.BATCH_MAX_TOPICS:
+            return f"一度に指定できるトピックは{Config.BATCH_MAX_TOPICS}件までです。"
+        try:
+            since_ts, until_ts = _parse_time(since), _parse_time(until)
+        except ValueError as e:
+            return str(e)
+
+        crawler = get_async_crawler()
+        _track_topics(crawler, topics)
+
+        articles = await crawler.fetch_many(
+            topics,
+            max_articles=max_articles,
+            include_trending=include_trending
+        )
+        if since_ts is not None or until_ts is not None:
+            articles = await crawler.articles_between_many(
+                topics, since_ts, until_ts, max_articles, include_trending
+            )
+
+        if delta or cursor:
+            requested = tuple(topics) + ((TRENDING_TOPIC,) if include_trending else ())
+            # 配信済みは記事が掲載されていたトピックごとに覚える
+            return _render_delta(
+                f"# トピック: {', '.join(topics)}",
+                lambda article: article.topics or requested, articles, cursor,
+                output_format, max_chars, max_tokens
+            )
+
+        if not articles:
+            return f"トピック {', '.join(topics)} の記事が見つかりませんでした。"
+
+        return render_articles(
+            f"# トピック: {', '.join(topics)}", articles, output_format, max_chars, max_tokens
+        )
+
+    except asyncio.CancelledError:
+        logger.info(
+            operation="search_zenn_articles_batch",
+            message="Tool call cancelled by client",
+            context={"topics": topics}
+        )
+        raise
+    except Exception as e:
+        metrics.error("tool")
+        logger.error(
+            operation="search_zenn_articles_batch",
+            message="Tool execution failed",
+            context={"error": str(e)}
+        )
+        return f"エラーが発生しました: {str(e)}"
+
+
+@mcp.tool()
+@_timed_tool
+async def get_stored_articles(
+    topic: Annotated[str, "検索トピック（trendingでトレンド記事、空文字で全体）"] = "",
+    limit: Annotated[int, "最大取得記事数 (1-200)"] = Config.STORE_QUERY_DEFAULT_LIMIT,
+    output_format: Annotated[str, "出力形式 (markdown / compact / json)"] = "markdown",
+    max_chars: Annotated[int, "応答の最大文字数（0で無制限。超える場合は概要を短くする）"] = 0,
+    max_tokens: Annotated[int, "応答のおおよその最大トークン数（0で無制限）"] = 0,
+    since: Annotated[str, "この日時（YYYY-MM-DD などのISO 8601、タイムゾーンなしはUTC）以降に投稿された記事に絞る"] = "",
+    until: Annotated[str, "この日時より前に投稿された記事に絞る"] = ""
+) -> str:
+    """これまでに取得して蓄積したZenn記事をネットワークに出ずに新しい順で返す"""
+
+    logger.info(
+        operation="get_stored_articles",
+        message=f"Loading stored articles for topic: {topic}",
+        context={"topic": topic, "limit": limit}
+    )
+
+    try:
+        # Validate limit
+        if limit < 1:
+            limit = Config.STORE_QUERY_DEFAULT_LIMIT
+        elif limit > Config.STORE_QUERY_MAX_LIMIT:
+            limit = Config.STORE_QUERY_MAX_LIMIT
+        try:
+            since_ts, until_ts = _parse_time(since), _parse_time(until)
+        except ValueError as e:
+            return str(e)
+
+        crawler = get_async_crawler()
+        if crawler.store is None:
+            return "記事ストアが無効になっています。"
+
+        articles = await crawler.load_stored_articles(topic, limit, since_ts, until_ts)
+
+        heading = f"# 蓄積記事: {topic}" if topic else "# 蓄積記事"
+        if not articles:
+            return f"トピック '{topic}' の蓄積記事はありません。" if topic else "蓄積記事はありません。"
+
+        return render_articles(
+            heading, articles, output_format, max_chars, max_tokens
+        )
+
+    except Exception as e:
+        metrics.error("tool")
+        logger.error(
+            operation="get_stored_articles",
+            message="Tool execution failed",
+            context={"error": str(e)}
+        )
+        return f"エラーが発生しました: {str(e)}"
+
+
+@mcp.tool()
+@_timed_tool
+async def search_indexed_articles(
+    query: Annotated[str, "検索キーワード（日本語・英語の自由文）"],
+    limit: Annotated[int, "最大取得記事数 (1-50)"] = Config.SEARCH_RESULT_DEFAULT_LIMIT,
+    output_format: Annotated[str, "出力形式 (markdown / compact / json)"] = "markdown",
+    max_chars: Annotated[int, "応答の最大文字数（0で無制限。超える場合は概要を短くする）"] = 0,
+    max_tokens: Annotated[int, "応答のおおよその最大トークン数（0で無制限）"] = 0,
+    since: Annotated[str, "この日時（YYYY-MM-DD などのISO 8601、タイムゾーンなしはUTC）以降に投稿された記事に絞る"] = "",
+    until: Annotated[str, "この日時より前に投稿された記事に絞る"] = ""
+) -> str:
+    """これまでに取得したZenn記事のタイトル・概要・作成者を全文検索し、関連度順に返す"""
+
+    logger.info(
+        operation="search_indexed_articles",
+        message=f"Searching indexed articles: {query}",
+        context={"query": query, "limit": limit}
+    )
+
+    try:
+        # Validate limit
+        if limit < 1:
+            limit = Config.SEARCH_RESULT_DEFAULT_LIMIT
+        elif limit > Config.SEARCH_RESULT_MAX_LIMIT:
+            limit = Config.SEARCH_RESULT_MAX_LIMIT
+
+        if not query.strip():
+            return "検索キーワードを指定してください。"
+        try:
+            since_ts, until_ts = _parse_time(since), _parse_time(until)
+        except ValueError as e:
+            return str(e)
+
+        crawler = get_async_crawler()
+        articles = await crawler.search_articles(query, limit, since_ts, until_ts)
+
+        if not articles:
+            return f"'{query}' に一致する記事は見つかりませんでした。"
+
+        return render_articles(
+            f"# 検索: {query}", articles, output_format, max_chars, max_tokens
+        )
+
+    except Exception as e:
+        metrics.error("tool")
+        logger.error(
+            operation="search_indexed_articles",
+            message="Tool execution failed",
+            context={"error": str(e)}
+        )
+        return f"エラーが発生しました: {str(e)}"
+
+
+@mcp.tool()
+@_timed_tool
+async def get_article_bodies(
+    urls: Annotated[List[str], "記事URLのリスト（https://zenn.dev/<ユーザー>/articles/<スラッグ>）"],
+    max_chars: Annotated[int, "1記事あたりに返す最大文字数 (1-20000)"] = 3000
+) -> str:
+    """Zenn記事の本文を並行取得し、プレーンテキストにして指定文字数で切り詰めて返す"""
+
+    logger.info(
+        operation="get_article_bodies",
+        message=f"Fetching bodies for {len(urls)} articles",
+        context={"urls": urls, "max_chars": max_chars}
+    )
+
+    try:
+        # Validate max_chars
+        if max_chars < 1 or max_chars > Config.BODY_MAX_CHARS:
+            max_chars = Config.BODY_DEFAULT_MAX_CHARS
+
+        if not urls:
+            return "記事URLを1つ以上指定してください。"
+        if len(urls) > Config.BODY_FETCH_MAX_URLS:
+            return f"一度に指定できる記事は{Config.BODY_FETCH_MAX_URLS}件までです。"
+
+        crawler = get_async_crawler()
+        bodies = await crawler.fetch_article_bodies(urls)
+
+        response_parts = ["# 記事本文\n"]
+        for i, (url, body) in enumerate(zip(urls, bodies), 1):
+            if body is None:
+                response_parts.append(f"## {i}. {url}\n本文を取得できませんでした。\n")
+                continue
             response_parts.append(
-                f"## {i}. {article.get('title', 'タイトルなし')}\n"
-                f"- **作成者**: {article.get('creator', '不明')}\n"
-                f"- **作成日**: {article.get('published_at', '不明')}\n"
-                f"- **概要**: {article.get('description', '概要なし')}\n"
-                f"- **URL**: {article.get('url', 'URLなし')}\n"
+                f"## {i}. {body.title or 'タイトルなし'}\n"
+                f"- **URL**: {url}\n"
+                f"- **更新日**: {body.updated_at or '不明'}\n"
+                f"- **文字数**: {len(body.text)}\n\n"
+                f"{body.truncated(max_chars)}\n"
             )
-        
         return "\n".join(response_parts)
-            
+
+    except asyncio.CancelledError:
+        logger.info(
+            operation="get_article_bodies",
+            message="Tool call cancelled by client",
+            context={"urls": urls}
+        )
+        raise
     except Exception as e:
+        metrics.error("tool")
         logger.error(
-            operation="get_trending_articles",
+            operation="get_article_bodies",
             message="Tool execution failed",
             context={"error": str(e)}
         )
         return f"エラーが発生しました: {str(e)}"
 
 
-if __name__ == "__main__":
+@mcp.tool()
+@_timed_tool
+async def backfill_topic(
+    topic: Annotated[str, "取り込むトピック"],
+    max_articles: Annotated[int, "最大取得記事数 (1-1000)"] = Config.BACKFILL_DEFAULT_ARTICLES,
+    since: Annotated[str, "この日付（YYYY-MM-DD、UTC）より前の記事に達したら止める。空文字で無制限"] = ""
+) -> str:
+    """Zenn APIのページ送りでトピックの過去記事を取り込み、蓄積と全文検索の対象にする"""
+
+    logger.info(
+        operation="backfill_topic",
+        message=f"Backfilling topic: {topic}",
+        context={"topic": topic, "max_articles": max_articles, "since": since}
+    )
+
+    try:
+        # Validate max_articles
+        if max_articles < 1:
+            max_articles = Config.BACKFILL_DEFAULT_ARTICLES
+        elif max_articles > Config.BACKFILL_MAX_ARTICLES:
+            max_articles = Config.BACKFILL_MAX_ARTICLES
+
+        try:
+            cutoff = _parse_time(since)
+        except ValueError as e:
+            return str(e)
+
+        crawler = get_async_crawler()
+        result = await crawler.backfill_topic(topic, max_articles, cutoff)
+
+        if not result["articles"]:
+            return f"トピック '{topic}' の記事は見つかりませんでした。"
+
+        return "\n".join([
+            f"# 取り込み: {topic}",
+            f"- **取得記事数**: {result['articles']}件",
+            f"- **ページ数**: {result['pages']}",
+            f"- **最も古い投稿日**: {result['oldest'] or '不明'}",
+            "",
+            "取り込んだ記事は get_stored_articles と search_indexed_articles で参照できます。",
+        ])
+
+    except asyncio.CancelledError:
+        logger.info(
+            operation="backfill_topic",
+            message="Tool call cancelled by client",
+            context={"topic": topic}
+        )
+        raise
+    except Exception as e:
+        metrics.error("tool")
+        logger.error(
+            operation="backfill_topic",
+            message="Tool execution failed",
+            context={"error": str(e)}
+        )
+        return f"エラーが発生しました: {str(e)}"
+
+
+@mcp.tool()
+@_timed_tool
+async def get_prefetch_status() -> str:
+    """先読みスケジューラーの人気トピックと最終再取得時刻を返す"""
+
+    def format_time(timestamp):
+        if timestamp is None:
+            return "未取得"
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec="seconds")
+
+    status = get_scheduler().status()
+    response_parts = [
+        "# 先読みスケジューラー",
+        f"- **状態**: {'実行中' if status['running'] else '停止中'}",
+        f"- **間隔**: {status['interval']}秒",
+        f"- **トレンド最終取得**: {format_time(status['trending_last_refresh'])}\n",
+        "## 人気トピック",
+    ]
+    if not status["hot_topics"]:
+        response_parts.append("まだトピックの要求はありません。")
+    for entry in status["hot_topics"]:
+        response_parts.append(
+            f"- {entry['topic']} (スコア: {entry['score']}, "
+            f"最終取得: {format_time(entry['last_refresh'])})"
+        )
+    return "\n".join(response_parts)
+
+
+@mcp.tool()
+@_timed_tool
+async def get_trending_history(
+    limit: Annotated[int, "各一覧の最大記事数 (1-20)"] = 10,
+    url: Annotated[str, "指定すると、その記事の順位の推移を返す"] = ""
+) -> str:
+    """記録済みのトレンド順位の履歴から、上昇中の記事と掲載時間の長い記事を返す"""
+
+    def format_time(timestamp):
+        return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat(timespec="seconds")
+
+    def format_hours(seconds):
+        return f"{seconds / 3600:.1f}時間"
+
+    if limit < 1 or limit > 20:
+        limit = 10
+
+    history = get_async_crawler().trending_history
+    first, last = history.span()
+    if first is None:
+        return (
+            "トレンドの履歴はまだありません。"
+            "get_trending_articles の呼び出しか先読み（ZENN_MCP_PREFETCH=1）で記録されます。"
+        )
+
+    if url:
+        stats = history.lookup(url)
+        if stats is None:
+            return f"記事 {url} はトレンドの履歴にありません。"
+        trail = ", ".join(
+            f"{format_time(at)} {rank if rank is not None else '圏外'}"
+            for at, rank in history.trajectory(url)
+        )
+        return "\n".join([
+            f"# トレンド履歴: {stats.article.title or url}",
+            f"- **現在の順位**: {stats.rank if stats.rank is not None else '圏外'}",
+            f"- **最高順位**: {stats.best_rank}",
+            f"- **順位の変化**: {stats.velocity:+.1f}位/時",
+            f"- **掲載時間**: {format_hours(stats.on_list_seconds)}",
+            f"- **初登場**: {format_time(stats.first_seen)}",
+            f"- **直近の順位**: {trail}",
+        ])
+
+    response_parts = [
+        "# トレンド履歴",
+        f"- **スナップショット数**: {len(history)}",
+        f"- **期間**: {format_time(first)} 〜 {format_time(last)}\n",
+        "## 上昇中の記事",
+    ]
+    rising = history.rising(limit)
+    if not rising:
+        response_parts.append("順位を上げている記事はありません。")
+    for stats in rising:
+        response_parts.append(
+            f"- {stats.rank}位 {stats.article.title} ({stats.velocity:+.1f}位/時, "
+            f"最高{stats.best_rank}位) {stats.article.url}"
+        )
+    response_parts.append("\n## 掲載時間の長い記事")
+    for stats in history.longest(limit):
+        response_parts.append(
+            f"- {stats.rank}位 {stats.article.title} ({format_hours(stats.on_list_seconds)}, "
+            f"最高{stats.best_rank}位) {stats.article.url}"
+        )
+    return "\n".join(response_parts)
+
+
+@mcp.tool()
+async def server_stats() -> str:
+    """段階ごとの処理時間、キャッシュ・同時取得の統計、先読みの状態を返す"""
+
+    snapshot = metrics.snapshot()
+    response_parts = ["# サーバー統計"]
+
+    if not snapshot["enabled"]:
+        response_parts.append("メトリクスの計測は無効になっています。")
+    else:
+        response_parts.append("## 段階ごとの処理時間 (ms)")
+        if not snapshot["stages"]:
+            response_parts.append("まだ計測値はありません。")
+        for stage, summary in sorted(snapshot["stages"].items()):
+            response_parts.append(
+                f"- {stage}: 回数 {summary['count']}, 平均 {summary['mean'] * 1000:.2f}, "
+                f"p50 ≤{summary['p50'] * 1000:g}, p95 ≤{summary['p95'] * 1000:g}"
+            )
+        response_parts.append("\n## ツール呼び出し (ms)")
+        for tool, summary in sorted(snapshot["tools"].items()):
+            response_parts.append(
+                f"- {tool}: 回数 {summary['count']}, 平均 {summary['mean'] * 1000:.2f}"
+            )
+        response_parts.append(
+            f"\n- **受信バイト数**: {int(snapshot['downloaded_bytes'])}\n"
+            f"- **パース済みアイテム数**: {int(snapshot['feed_items'])}\n"
+            f"- **エラー**: {snapshot['errors'] or 'なし'}"
+        )
+
+    for name, title in (("article_cache", "記事キャッシュ"), ("singleflight", "同時取得の集約")):
+        values = snapshot.get(name)
+        if values:
+            response_parts.append(f"\n## {title}")
+            response_parts.extend(f"- {key}: {value}" for key, value in values.items())
+
+    status = get_scheduler().status()
+    response_parts.append("\n## 先読みスケジューラー")
+    response_parts.append(f"- running: {status['running']}")
+    response_parts.append(f"- hot_topics: {len(status['hot_topics'])}")
+    return "\n".join(response_parts)
+
+
+def run_server() -> None:
+    """設定されたトランスポートでMCPサーバーを起動する"""
+    transport = Config.MCP_TRANSPORT
+    if transport == "streamable-http":
+        # 1つのプロセスで多数のクライアントを受け、クローラー・キャッシュ・接続プールを共有する。
+        # ツールはセッションの状態を使わないため、ステートレスにしてJSONで応答する
+        mcp.settings.host = Config.MCP_HTTP_HOST
+        mcp.settings.port = Config.MCP_HTTP_PORT
+        mcp.settings.stateless_http = True
+        mcp.settings.json_response = True
+        # リクエストごとのアクセスログを出さない
+        mcp.settings.log_level = "WARNING"
     logger.info(
         operation="mcp_server_start",
-        message="Starting Zenn MCP Server with FastMCP"
+        message="Starting Zenn MCP Server with FastMCP",
+        context={"transport": transport}
     )
-    mcp.run()
\ No newline at end of file
+    start_metrics_server()
+    mcp.run(transport=transport)
+
+
+if __name__ == "__main__":
+    run_server()
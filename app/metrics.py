@@ -0,0 +1,371 @@
+"""
+ホットパスの計測とPrometheus形式での公開
+
+取得（接続・TLS・最初のバイト・ダウンロード）、XMLパース、概要のタグ除去、
+Markdown整形といった段階ごとの所要時間をヒストグラムに、
+ダウンロードバイト数・アイテム数・エラー数をカウンタに記録する。
+"""
+
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from app.config import Config
+
+DEFAULT_BUCKETS = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Sequence[str], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    """ラベルごとに加算するカウンタ"""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, *labels: str) -> float:
+        with self._lock:
+            return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for labels, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {value}")
+        return lines
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {",".join(labels) or "total": value for labels, value in self._values.items()}
+
+
+class Histogram:
+    """固定バケットのヒストグラム"""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # ラベル値ごとに [バケット別件数..., +Inf件数, 合計, 件数]
+        self._series: Dict[LabelValues, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 3)
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        """with文のブロックの所要時間を記録する"""
+        return _Timer(self, labels)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_items = sorted((labels, list(series)) for labels, series in self._series.items())
+        for labels, series in series_items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                label_text = _format_labels(self.labelnames, labels, 'le="%s"' % le)
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {series[-2]}")
+            lines.append(f"{self.name}_count{label_text} {series[-1]}")
+        return lines
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """ラベル値ごとの件数・合計・平均と概算パーセンタイル"""
+        with self._lock:
+            series_items = [(labels, list(series)) for labels, series in self._series.items()]
+        result = {}
+        for labels, series in series_items:
+            count = series[-1]
+            result[",".join(labels) or "total"] = {
+                "count": count,
+                "sum": series[-2],
+                "mean": series[-2] / count if count else 0.0,
+                "p50": self._quantile(series, 0.50),
+                "p95": self._quantile(series, 0.95),
+                "p99": self._quantile(series, 0.99),
+            }
+        return result
+
+    def _quantile(self, series: List[float], fraction: float) -> float:
+        """バケットの上限値で近似したパーセンタイル"""
+        target = series[-1] * fraction
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series):
+            cumulative += count
+            if cumulative >= target and count:
+                return bound
+        return 0.0
+
+
+class _Timer:
+    __slots__ = ("_histogram", "_labels", "_start")
+
+    def __init__(self, histogram: Histogram, labels: LabelValues):
+        self._histogram = histogram
+        self._labels = labels
+
+    def __enter__(self) -> "_Timer":
+        self._start = perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self._histogram.observe(perf_counter() - self._start, *self._labels)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullTimer":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class RequestTrace:
+    """
+    httpxのtrace拡張で1リクエスト内の段階ごとの時間を記録する
+
+    connect は名前解決を含むTCP接続、tls はTLSハンドシェイク、
+    ttfb は応答ヘッダー受信まで、download は本文受信の時間。
+    接続を再利用した場合 connect と tls は記録されない。
+    """
+
+    _STAGES = {
+        "connection.connect_tcp": "connect",
+        "connection.start_tls": "tls",
+        "http11.receive_response_headers": "ttfb",
+        "http2.receive_response_headers": "ttfb",
+        "http11.receive_response_body": "download",
+        "http2.receive_response_body": "download",
+    }
+
+    __slots__ = ("_metrics", "_on_complete", "_started")
+
+    def __init__(
+        self,
+        metrics: Optional["Metrics"],
+        on_complete: Optional[Callable[[str, float], None]] = None,
+    ):
+        self._metrics = metrics
+        self._on_complete = on_complete
+        self._started: Dict[str, float] = {}
+
+    async def __call__(self, event_name: str, info: Dict) -> None:
+        prefix, _, phase = event_name.rpartition(".")
+        stage = self._STAGES.get(prefix)
+        if stage is None:
+            return
+        if phase == "started":
+            self._started[stage] = perf_counter()
+            return
+        start = self._started.pop(stage, None)
+        if start is None:
+            return
+        elapsed = perf_counter() - start
+        if self._metrics is not None:
+            self._metrics.observe_stage(stage, elapsed)
+        if self._on_complete is not None and phase == "complete":
+            self._on_complete(stage, elapsed)
+
+
+class Metrics:
+    """サーバー全体の計測値"""
+
+    def __init__(self, enabled: bool = None):
+        self.enabled = Config.METRICS_ENABLED if enabled is None else enabled
+        self.stage_seconds = Histogram(
+            "zenn_mcp_stage_duration_seconds",
+            "Time spent in each hot-path stage.",
+            ("stage",),
+        )
+        self.tool_seconds = Histogram(
+            "zenn_mcp_tool_duration_seconds",
+            "Duration of MCP tool calls.",
+            ("tool",),
+        )
+        self.downloaded_bytes = Counter(
+            "zenn_mcp_downloaded_bytes_total",
+            "Bytes received from upstream (before decompression).",
+        )
+        self.items = Counter(
+            "zenn_mcp_feed_items_total",
+            "Feed items parsed.",
+        )
+        self.errors = Counter(
+            "zenn_mcp_errors_total",
+            "Errors by stage.",
+            ("stage",),
+        )
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def stage(self, name: str):
+        """段階の所要時間を計測するコンテキストマネージャ"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return self.stage_seconds.time(name)
+
+    def tool(self, name: str):
+        if not self.enabled:
+            return _NULL_TIMER
+        return self.tool_seconds.time(name)
+
+    def request_extensions(
+        self, on_complete: Optional[Callable[[str, float], None]] = None
+    ) -> Dict:
+        """
+        httpxのリクエストに渡すtrace拡張（無効かつ on_complete もなければ空）
+
+        Args:
+            on_complete: 段階が正常に終わるたびに (段階名, 秒) で呼ぶコールバック
+        """
+        if not self.enabled and on_complete is None:
+            return {}
+        return {"trace": RequestTrace(self if self.enabled else None, on_complete)}
+
+    def observe_stage(self, name: str, seconds: float) -> None:
+        if self.enabled:
+            self.stage_seconds.observe(seconds, name)
+
+    def add_bytes(self, amount: int) -> None:
+        if self.enabled:
+            self.downloaded_bytes.inc(amount)
+
+    def add_items(self, amount: int) -> None:
+        if self.enabled:
+            self.items.inc(amount)
+
+    def error(self, stage: str) -> None:
+        if self.enabled:
+            self.errors.inc(1, stage)
+
+    def register_collector(self, name: str, collect: Callable[[], Dict[str, float]]) -> None:
+        """キャッシュ統計など、描画時に値を集めるゲージを登録する"""
+        self._collectors[name] = collect
+
+    def _collected(self) -> Dict[str, Dict[str, float]]:
+        collected = {}
+        for name, collect in list(self._collectors.items()):
+            try:
+                collected[name] = collect()
+            except Exception:
+                continue
+        return collected
+
+    def render_prometheus(self) -> str:
+        """Prometheusのテキスト形式で出力する"""
+        lines = []
+        for metric in (
+            self.stage_seconds,
+            self.tool_seconds,
+            self.downloaded_bytes,
+            self.items,
+            self.errors,
+        ):
+            lines.extend(metric.render())
+        for name, values in self._collected().items():
+            for key, value in sorted(values.items()):
+                metric_name = f"zenn_mcp_{name}_{key}"
+                lines.append(f"# TYPE {metric_name} gauge")
+                lines.append(f"{metric_name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict:
+        """server_statsツール向けの要約"""
+        return {
+            "enabled": self.enabled,
+            "stages": self.stage_seconds.snapshot(),
+            "tools": self.tool_seconds.snapshot(),
+            "downloaded_bytes": self.downloaded_bytes.value(),
+            "feed_items": self.items.value(),
+            "errors": self.errors.snapshot(),
+            **self._collected(),
+        }
+
+
+# Process-wide metrics instance
+metrics = Metrics()
+
+
+def create_metrics_app():
+    """/metrics と /health を提供するFastAPIアプリを作る"""
+    from fastapi import FastAPI
+    from fastapi.responses import PlainTextResponse
+
+    app = FastAPI(title="zenn-mcp metrics")
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def prometheus_metrics() -> PlainTextResponse:
+        return PlainTextResponse(
+            metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4; charset=utf-8",
+        )
+
+    @app.get("/health")
+    def health() -> Dict[str, str]:
+        return {"status": "ok"}
+
+    return app
+
+
+def start_metrics_server(host: str = None, port: int = None) -> Optional[threading.Thread]:
+    """メトリクス用HTTPサーバーをデーモンスレッドで起動する（ポート0なら起動しない）"""
+    port = Config.METRICS_PORT if port is None else port
+    if not port:
+        return None
+
+    import uvicorn
+
+    server = uvicorn.Server(
+        uvicorn.Config(
+            create_metrics_app(),
+            host=host or Config.METRICS_HOST,
+            port=port,
+            log_level="warning",
+        )
+    )
+    # stdioのMCPサーバーと同居するため、シグナルハンドラは登録させない
+    server.install_signal_handlers = lambda: None
+    thread = threading.Thread(target=server.run, name="zenn-metrics", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,121 @@
+"""
+Zenn記事のデータモデル
+"""
+
+import calendar
+from dataclasses import dataclass
+from datetime import timezone
+from typing import Dict, Tuple
+
+_MONTHS = {
+    month: number
+    for number, month in enumerate(
+        ("Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"), 1
+    )
+}
+
+
+# トレンドフィードを表すトピック名。ストア・索引のキーや記事の掲載元に使う。
+# Zennのトピック名（英小文字・数字・ハイフン）には "@" が現れないため、実在のトピックと衝突しない
+TRENDING_TOPIC = "@trending"
+
+
+def normalize_topic(topic: str) -> str:
+    """
+    トピック名を正規化する（前後の空白を除き小文字にする）
+
+    フィードのURL・記事キャッシュ・先読み・ストア・索引のキーはすべてこの形に揃える。
+    """
+    return topic.strip().lower()
+
+
+def parse_published(value: str) -> int:
+    """
+    投稿日時の文字列をエポック秒にする（解釈できなければ0）
+
+    Zennのフィードの `Mon, 14 Jul 2025 08:34:28 GMT` は位置を決め打ちで読み、
+    それ以外の形式は python-dateutil で解釈する（タイムゾーンがなければUTC）。
+    """
+    if not value:
+        return 0
+    if len(value) == 29 and value.endswith(" GMT"):
+        try:
+            return calendar.timegm((
+                int(value[12:16]), _MONTHS[value[8:11]], int(value[5:7]),
+                int(value[17:19]), int(value[20:22]), int(value[23:25]),
+            ))
+        except (KeyError, ValueError):
+            pass
+    from dateutil import parser
+
+    try:
+        parsed = parser.parse(value)
+    except (ValueError, OverflowError):
+        return 0
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp())
+
+
+@dataclass(frozen=True, slots=True)
+class Article:
+    """フィードから取得した記事1件"""
+
+    title: str = ""
+    url: str = ""
+    published_at: str = ""
+    creator: str = ""
+    description: str = ""
+    # 一括取得時に記事が掲載されていたトピック
+    topics: Tuple[str, ...] = ()
+    # 投稿日時のエポック秒。省略時は生成時に published_at から1度だけ求める（不明なら0）
+    published_ts: int = 0
+
+    def __post_init__(self):
+        if not self.published_ts and self.published_at:
+            object.__setattr__(self, "published_ts", parse_published(self.published_at))
+
+    def to_dict(self) -> Dict:
+        """従来の辞書形式に変換する"""
+        data = {
+            "title": self.title,
+            "url": self.url,
+            "published_at": self.published_at,
+            "creator": self.creator,
+            "description": self.description,
+        }
+        if self.topics:
+            data["topics"] = list(self.topics)
+        return data
+
+    def approximate_size(self) -> int:
+        """キャッシュ容量の見積もりに使うおおよそのサイズ（文字数）"""
+        return (
+            len(self.title)
+            + len(self.url)
+            + len(self.published_at)
+            + len(self.creator)
+            + len(self.description)
+            + sum(len(topic) for topic in self.topics)
+        )
+
+    def published_timestamp(self) -> float:
+        """投稿日のエポック秒（不明なら0）"""
+        return float(self.published_ts)
+
+
+@dataclass(frozen=True, slots=True)
+class ArticleBody:
+    """Zenn APIから取得した記事本文"""
+
+    url: str
+    title: str = ""
+    text: str = ""
+    # 本文の最終更新日時（ISO 8601）。キャッシュの鍵に使う
+    updated_at: str = ""
+
+    def truncated(self, max_chars: int) -> str:
+        """本文を最大文字数に切り詰めて返す"""
+        if len(self.text) <= max_chars:
+            return self.text
+        return self.text[:max_chars - 1].rstrip() + "…"
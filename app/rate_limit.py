@@ -0,0 +1,133 @@
+"""
+上流（zenn.dev）へのリクエストの送信ペースを抑えるトークンバケット
+
+スレッドやイベントループをまたいで1つのバケットを共有する。待ち時間は
+ロックの中でトークンを予約して決め、待つ処理はロックの外で行う。
+"""
+
+import asyncio
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+
+import httpx
+
+from app.config import Config
+from app.metrics import metrics
+
+
+def parse_retry_after(response: httpx.Response) -> Optional[float]:
+    """Retry-After ヘッダー（秒数またはHTTP日付）を待ち秒数にする"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        seconds = float(value)
+    else:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(0.0, seconds), Config.RATE_LIMIT_MAX_RETRY_AFTER)
+
+
+class RateLimiter:
+    """1秒あたり rate 件、最大 burst 件まで連続で送れるトークンバケット"""
+
+    def __init__(
+        self,
+        rate: float = None,
+        burst: int = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """
+        Args:
+            rate: 1秒あたりに補充するトークン数（0以下なら一時停止にだけ従う）
+            burst: バケットの容量
+            clock: 単調増加する時計（テスト用）
+        """
+        self.rate = Config.RATE_LIMIT_PER_SECOND if rate is None else rate
+        self.burst = burst or Config.RATE_LIMIT_BURST
+        self._clock = clock
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.max_waiting = 0
+        self.delayed = 0
+        self.pauses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float) -> None:
+        # _updated が未来（一時停止中）の間は補充しない
+        if now > self._updated:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """トークンを1つ予約し、送ってよくなるまでの秒数を返す"""
+        if not self.enabled:
+            # レート制限を切っていても Retry-After による一時停止には従う
+            return self._remaining_pause()
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self._tokens -= 1
+            return max(0.0, self._updated - now) + max(0.0, -self._tokens) / self.rate
+
+    def pause(self, seconds: float) -> None:
+        """Retry-After などで指示された間、新しい送信を止める"""
+        if seconds <= 0:
+            return
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            until = now + seconds
+            self.pauses += 1
+            self._paused_until = max(self._paused_until, until)
+            if until > self._updated:
+                self._updated = until
+                self._tokens = min(self._tokens, 0.0)
+
+    def _remaining_pause(self) -> float:
+        with self._lock:
+            return max(0.0, self._paused_until - self._clock())
+
+    async def acquire(self) -> None:
+        """送ってよくなるまで待つ"""
+        began = time.perf_counter()
+        wait = self.reserve()
+        if wait > 0:
+            with self._lock:
+                self.delayed += 1
+                self.waiting += 1
+                self.max_waiting = max(self.max_waiting, self.waiting)
+            try:
+                await asyncio.sleep(wait)
+                # 待っている間に一時停止が延びていれば、その分も待つ
+                while (remaining := self._remaining_pause()) > 0:
+                    await asyncio.sleep(remaining)
+            finally:
+                with self._lock:
+                    self.waiting -= 1
+        metrics.observe_stage("rate_limit", time.perf_counter() - began)
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            return {
+                "rate": self.rate,
+                "tokens": round(max(0.0, self._tokens), 2),
+                "waiting": self.waiting,
+                "max_waiting": self.max_waiting,
+                "delayed": self.delayed,
+                "pauses": self.pauses,
+                "paused_for": round(max(0.0, self._paused_until - now), 3),
+            }
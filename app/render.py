@@ -0,0 +1,271 @@
+"""
+記事リストのツール応答への整形
+
+Markdown（従来の形式）、1記事1行のcompact、JSONの3形式を持ち、
+文字数・トークン数の上限に収まるように概要を文の区切りで切り詰める。
+整形結果は記事の内容そのもの（記事のタプル）と形式・上限をキーにキャッシュし、
+フィードが変わっていなければ整形し直さない。
+"""
+
+import functools
+import json
+from datetime import datetime, timezone
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple
+
+from app.config import Config
+from app.lru import LRU
+from app.metrics import metrics
+from app.models import Article
+
+MARKDOWN = "markdown"
+COMPACT = "compact"
+JSON = "json"
+FORMATS = (MARKDOWN, COMPACT, JSON)
+
+# 文の区切りとみなす文字列（切り詰め位置の候補）
+_SENTENCE_ENDS = ("。", "．", "！", "？", ". ", "! ", "? ")
+
+
+def estimate_tokens(text: str) -> int:
+    """おおよそのトークン数（英数字は4文字で1、日本語などは1文字で1と数える）"""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def shorten(text: str, limit: int) -> str:
+    """limit 文字以内に切り詰める。後半に文の区切りがあればそこで切る"""
+    if len(text) <= limit:
+        return text
+    if limit <= 1:
+        return ""
+    cut = text[:limit - 1]
+    boundary = max(cut.rfind(end) + len(end.rstrip()) for end in _SENTENCE_ENDS)
+    if boundary >= limit // 2:
+        cut = cut[:boundary]
+    return cut.rstrip() + "…"
+
+
+def _published_date(article: Article) -> str:
+    timestamp = article.published_timestamp()
+    if not timestamp:
+        return article.published_at or "不明"
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def _render_markdown(
+    heading: str,
+    articles: Sequence[Article],
+    descriptions: Sequence[str],
+    omitted: int,
+    cursor: str = "",
+) -> str:
+    response_parts = [
+        heading,
+        f"取得記事数: {len(articles) + omitted}件\n"
+    ]
+
+    for i, (article, description) in enumerate(zip(articles, descriptions), 1):
+        lines = [
+            f"## {i}. {article.title or 'タイトルなし'}",
+            f"- **作成者**: {article.creator or '不明'}",
+            f"- **作成日**: {article.published_at or '不明'}",
+            f"- **概要**: {description or '概要なし'}",
+            f"- **URL**: {article.url or 'URLなし'}",
+        ]
+        if article.topics:
+            lines.append(f"- **トピック**: {', '.join(article.topics)}")
+        response_parts.append("\n".join(lines) + "\n")
+
+    if omitted:
+        response_parts.append(f"…ほか{omitted}件は上限のため省略しました。")
+    if cursor:
+        response_parts.append(f"差分取得用カーソル: `{cursor}`")
+    return "\n".join(response_parts)
+
+
+def _render_compact(
+    heading: str,
+    articles: Sequence[Article],
+    descriptions: Sequence[str],
+    omitted: int,
+    cursor: str = "",
+) -> str:
+    lines = [f"{heading} ({len(articles) + omitted}件)"]
+    for i, (article, description) in enumerate(zip(articles, descriptions), 1):
+        line = (
+            f"{i}. {article.title or 'タイトルなし'} | {article.creator or '不明'} | "
+            f"{_published_date(article)} | {article.url}"
+        )
+        if article.topics:
+            line += f" | [{', '.join(article.topics)}]"
+        if description:
+            line += f" | {description}"
+        lines.append(line)
+    if omitted:
+        lines.append(f"…ほか{omitted}件")
+    if cursor:
+        lines.append(f"cursor: {cursor}")
+    return "\n".join(lines)
+
+
+def _render_json(
+    heading: str,
+    articles: Sequence[Article],
+    descriptions: Sequence[str],
+    omitted: int,
+    cursor: str = "",
+) -> str:
+    items = []
+    for article, description in zip(articles, descriptions):
+        item = article.to_dict()
+        item["description"] = description
+        items.append(item)
+    data = {
+        "heading": heading.lstrip("# "),
+        "count": len(articles) + omitted,
+        "articles": items,
+    }
+    if omitted:
+        data["omitted"] = omitted
+    if cursor:
+        data["cursor"] = cursor
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"))
+
+
+_RENDERERS = {
+    MARKDOWN: _render_markdown,
+    COMPACT: _render_compact,
+    JSON: _render_json,
+}
+
+
+def _fit(
+    render: Callable, heading: str, articles: List[Article], fits: Callable[[str], bool]
+) -> Tuple[str, int]:
+    """
+    上限に収まるまで概要を短くし、それでも収まらなければ末尾の記事を省く
+
+    Returns:
+        整形した文字列と、省かずに含めた（先頭からの）記事数
+    """
+    descriptions = [article.description for article in articles]
+    text = render(heading, articles, descriptions, 0)
+    if fits(text):
+        return text, len(articles)
+
+    count = len(articles)
+    while count > 0 and not fits(render(heading, articles[:count], [""] * count, len(articles) - count)):
+        count -= 1
+    omitted = len(articles) - count
+    kept = articles[:count]
+    best = render(heading, kept, [""] * count, omitted)
+    if not count:
+        return best, 0
+
+    # 各概要に許す最大文字数を二分探索する（短い概要はそのまま残る）
+    low, high = 0, max(len(description) for description in descriptions[:count])
+    while low < high:
+        limit = (low + high + 1) // 2
+        candidate = render(
+            heading, kept, [shorten(d, limit) for d in descriptions[:count]], omitted
+        )
+        if fits(candidate):
+            low, best = limit, candidate
+        else:
+            high = limit - 1
+    return best, count
+
+
+class RenderCache:
+    """整形済みの応答を保持するスレッドセーフなLRUキャッシュ"""
+
+    def __init__(self, max_entries: int = None):
+        self.max_entries = max_entries or Config.RENDER_CACHE_MAX_ENTRIES
+        self._entries: "LRU[Hashable, Tuple[str, int]]" = LRU(self.max_entries)
+
+    def get(self, key: Hashable):
+        return self._entries.get(key)
+
+    def put(self, key: Hashable, rendered: Tuple[str, int]) -> None:
+        self._entries.put(key, rendered)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return self._entries.stats()
+
+
+# Process-wide render cache
+render_cache = RenderCache()
+metrics.register_collector("render_cache", render_cache.stats)
+
+
+def render_articles(
+    heading: str,
+    articles: Sequence[Article],
+    output_format: str = MARKDOWN,
+    max_chars: int = 0,
+    max_tokens: int = 0,
+    cursor: str = "",
+) -> str:
+    """
+    記事リストをツールの応答用に整形する
+
+    Args:
+        heading: 見出し（Markdownの `# ...`）
+        articles: 記事リスト
+        output_format: markdown / compact / json
+        max_chars: 応答の最大文字数（0で無制限）
+        max_tokens: 応答のおおよその最大トークン数（0で無制限）
+        cursor: 差分モードで次回に渡してもらうカーソル（空なら出力しない）
+
+    Returns:
+        整形済みの文字列
+    """
+    text, _ = render_articles_counted(
+        heading, articles, output_format, max_chars, max_tokens, cursor
+    )
+    return text
+
+
+def render_articles_counted(
+    heading: str,
+    articles: Sequence[Article],
+    output_format: str = MARKDOWN,
+    max_chars: int = 0,
+    max_tokens: int = 0,
+    cursor: str = "",
+) -> Tuple[str, int]:
+    """
+    render_articles と同じ整形をし、上限のため省かずに応答に含めた記事数も返す
+
+    含めた記事は常に articles の先頭からの記事になる。
+    """
+    render = _RENDERERS.get(output_format)
+    if render is None:
+        raise ValueError(f"出力形式は {' / '.join(FORMATS)} のいずれかを指定してください")
+
+    if cursor:
+        render = functools.partial(render, cursor=cursor)
+
+    articles = tuple(articles)
+    key = (output_format, heading, max_chars, max_tokens, cursor, articles)
+    rendered = render_cache.get(key)
+    if rendered is not None:
+        return rendered
+
+    with metrics.stage("format"):
+        if max_chars > 0 or max_tokens > 0:
+            def fits(candidate: str) -> bool:
+                return (max_chars <= 0 or len(candidate) <= max_chars) and (
+                    max_tokens <= 0 or estimate_tokens(candidate) <= max_tokens
+                )
+            rendered = _fit(render, heading, list(articles), fits)
+        else:
+            rendered = (
+                render(heading, articles, [a.description for a in articles], 0), len(articles)
+            )
+
+    render_cache.put(key, rendered)
+    return rendered
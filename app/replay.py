@@ -0,0 +1,195 @@
+"""
+上流の応答の記録と再生
+
+記録モードでは実際に送ったリクエストごとに応答（URL・ヘッダー・ステータス・本文・所要時間）を
+gzip圧縮したJSON Linesのアーカイブに追記する。再生モードではネットワークに出ずに
+アーカイブの応答を返し、元の所要時間（または speed 倍に速めた時間）だけ待たせる。
+オフラインの環境でもクローラーからMCPツールまでの経路全体を同じ入力で繰り返し動かせる。
+"""
+
+import asyncio
+import atexit
+import base64
+import gzip
+import json
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import httpx
+
+from app.config import Config
+
+# 再生時に意味を持たない（本文をまとめて返すため）ので記録しないヘッダー
+_HOP_BY_HOP = frozenset({"connection", "keep-alive", "transfer-encoding"})
+
+
+def _is_conditional(request: httpx.Request) -> bool:
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def read_archive(path: str) -> Iterator[Dict]:
+    """
+    アーカイブの記録を書き込んだ順に返す
+
+    記録中のプロセスが終了処理をせずに止まった場合、末尾は途中で切れている
+    ことがあるので、読めたところまでを返す。
+    """
+    with gzip.open(path, "rt", encoding="utf-8") as archive:
+        try:
+            for line in archive:
+                if line.endswith("\n"):
+                    yield json.loads(line)
+        except (EOFError, gzip.BadGzipFile, zlib.error):
+            return
+
+
+class ResponseRecorder:
+    """応答をアーカイブに追記する（スレッド・イベントループをまたいで共有する）"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file: Optional[gzip.GzipFile] = None
+        self._started = time.time()
+        self._lock = threading.Lock()
+        self.records = 0
+        self.body_bytes = 0
+
+    def record(
+        self,
+        request: httpx.Request,
+        response: httpx.Response,
+        body: bytes,
+        elapsed: float,
+    ) -> None:
+        entry = {
+            "method": request.method,
+            "url": str(request.url),
+            "conditional": _is_conditional(request),
+            "status": response.status_code,
+            "headers": [
+                [name, value] for name, value in response.headers.multi_items()
+                if name.lower() not in _HOP_BY_HOP
+            ],
+            "body": base64.b64encode(body).decode("ascii"),
+            "elapsed": round(elapsed, 6),
+            "offset": round(time.time() - self._started, 6),
+        }
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with self._lock:
+            if self._file is None:
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+                # 追記のたびにgzipのメンバーが増えるだけで、既存の記録はそのまま読める
+                self._file = gzip.open(self.path, "ab")
+                atexit.register(self.close)
+            self._file.write(line)
+            # 途中で止まっても書き込み済みの記録は読めるように圧縮器を吐き出しておく
+            self._file.flush()
+            self.records += 1
+            self.body_bytes += len(body)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"records": self.records, "body_bytes": self.body_bytes}
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """内側のトランスポートで送り、応答を記録してから返す"""
+
+    def __init__(self, recorder: ResponseRecorder, inner: httpx.AsyncBaseTransport):
+        self.recorder = recorder
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        began = time.perf_counter()
+        response = await self.inner.handle_async_request(request)
+        try:
+            # 展開せずに受け取った形のまま記録し、そのまま返す（展開はクライアントが行う）
+            body = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        self.recorder.record(request, response, body, time.perf_counter() - began)
+        return httpx.Response(
+            response.status_code,
+            headers=[
+                (name, value) for name, value in response.headers.multi_items()
+                if name.lower() not in _HOP_BY_HOP
+            ],
+            content=body,
+        )
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """アーカイブの応答を返すトランスポート（スレッド・イベントループをまたいで共有する）"""
+
+    def __init__(self, path: str, speed: float = None):
+        """
+        Args:
+            path: 記録モードで作ったアーカイブ
+            speed: 記録時の所要時間を何倍速で再現するか（0なら待たない）
+        """
+        self.path = path
+        self.speed = Config.HTTP_REPLAY_SPEED if speed is None else speed
+        self._responses: Dict[Tuple[str, str, bool], List[Dict]] = {}
+        for entry in read_archive(path):
+            key = (entry["method"], entry["url"], entry["conditional"])
+            self._responses.setdefault(key, []).append(entry)
+        self._next: Dict[Tuple[str, str, bool], int] = {}
+        self._lock = threading.Lock()
+        self.served = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._responses.values())
+
+    def _pick(self, request: httpx.Request) -> Optional[Dict]:
+        """同じリクエストの記録を記録順に（最後まで使ったら先頭に戻って）選ぶ"""
+        url = str(request.url)
+        # 条件付きリクエストには304の記録を優先し、なければ通常の応答で代える
+        # （逆に、条件なしのリクエストに304を返すことはしない）
+        keys = [(request.method, url, False)]
+        if _is_conditional(request):
+            keys.insert(0, (request.method, url, True))
+        with self._lock:
+            for key in keys:
+                entries = self._responses.get(key)
+                if entries:
+                    index = self._next.get(key, 0)
+                    self._next[key] = (index + 1) % len(entries)
+                    self.served += 1
+                    return entries[index]
+            self.misses += 1
+            return None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        entry = self._pick(request)
+        if entry is None:
+            return httpx.Response(404, headers={"X-Replay": "miss"})
+        if self.speed > 0 and entry["elapsed"] > 0:
+            await asyncio.sleep(entry["elapsed"] / self.speed)
+        return httpx.Response(
+            entry["status"],
+            headers=[tuple(header) for header in entry["headers"]],
+            content=base64.b64decode(entry["body"]),
+        )
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "records": len(self),
+                "urls": len(self._responses),
+                "speed": self.speed,
+                "served": self.served,
+                "misses": self.misses,
+            }
@@ -0,0 +1,197 @@
+"""
+上流（zenn.dev）への取得を障害に強くする部品
+
+- LatencyTracker: 直近の接続・応答待ち時間の分位点から接続/読み取りタイムアウトを決める
+- CircuitBreaker: ホストごとに連続失敗で遮断し、一定時間後に1回だけ試して復旧を確かめる
+- backoff_delay: ジッター付きの指数バックオフ
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional
+
+import httpx
+
+from app.config import Config
+
+# 再試行してよいHTTPステータス
+RETRYABLE_STATUS = frozenset({429, 500, 502, 503, 504})
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """遮断中のホストへのリクエストを送らずに失敗させたときの例外"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"circuit open for {host} (retry in {retry_in:.1f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def backoff_delay(
+    attempt: int,
+    base: float = None,
+    cap: float = None,
+    rng: Callable[[float, float], float] = random.uniform,
+) -> float:
+    """attempt 回目（0始まり）の失敗後に待つ秒数（full jitter）"""
+    base = Config.HTTP_RETRY_BASE_DELAY if base is None else base
+    cap = Config.HTTP_RETRY_MAX_DELAY if cap is None else cap
+    return rng(0, min(cap, base * (2 ** attempt)))
+
+
+class LatencyTracker:
+    """直近の実測時間から接続・読み取りタイムアウトを決める"""
+
+    def __init__(
+        self,
+        window: int = None,
+        min_samples: int = None,
+        multiplier: float = None,
+        minimum: float = None,
+    ):
+        self.window = window or Config.HTTP_LATENCY_WINDOW
+        self.min_samples = min_samples or Config.HTTP_LATENCY_MIN_SAMPLES
+        self.multiplier = multiplier or Config.HTTP_TIMEOUT_MULTIPLIER
+        self.minimum = Config.HTTP_TIMEOUT_MIN if minimum is None else minimum
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """段階（connect / ttfb など）の所要時間を記録する"""
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+            samples.append(seconds)
+
+    def percentile(self, stage: str, fraction: float) -> Optional[float]:
+        """実測が min_samples 件以上あれば分位点を返す"""
+        with self._lock:
+            samples = sorted(self._samples.get(stage, ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+    def _adaptive(self, stage: str, default: float) -> float:
+        p99 = self.percentile(stage, 0.99)
+        if p99 is None:
+            return default
+        return min(default, max(self.minimum, p99 * self.multiplier))
+
+    def timeout(self, budget: Optional[float] = None) -> httpx.Timeout:
+        """
+        接続は connect、読み取りは応答ヘッダー待ち（ttfb）の実測p99から決める
+
+        budget（秒）を渡すと、どのタイムアウトもその残り時間を超えないように切り詰める。
+        """
+        cap = Config.CRAWLER_TIMEOUT if budget is None else max(0.0, budget)
+        return httpx.Timeout(
+            min(Config.CRAWLER_TIMEOUT, cap),
+            connect=min(self._adaptive("connect", Config.HTTP_CONNECT_TIMEOUT), cap),
+            read=min(self._adaptive("ttfb", Config.HTTP_READ_TIMEOUT), cap),
+        )
+
+    def hedge_delay(self) -> float:
+        """2本目のリクエストを送るまでの待ち時間"""
+        p95 = self.percentile("ttfb", 0.95)
+        return max(Config.HTTP_HEDGE_MIN_DELAY, p95 or 0.0)
+
+    def stats(self) -> Dict[str, float]:
+        timeout = self.timeout()
+        return {
+            "connect_timeout": timeout.connect,
+            "read_timeout": timeout.read,
+            "ttfb_samples": len(self._samples.get("ttfb", ())),
+        }
+
+
+class CircuitBreaker:
+    """1ホスト分のサーキットブレーカー"""
+
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = None,
+        reset_timeout: float = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.host = host
+        self.failure_threshold = failure_threshold or Config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = Config.CIRCUIT_RESET_TIMEOUT if reset_timeout is None else reset_timeout
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return HALF_OPEN
+            return self._state
+
+    def allow(self) -> None:
+        """リクエストを送ってよいか判定し、遮断中なら CircuitOpenError を送出する"""
+        with self._lock:
+            if self._state == CLOSED:
+                return
+            now = self._clock()
+            elapsed = now - self._opened_at
+            probe_stuck = self._probing and now - self._probe_started >= self.reset_timeout
+            if elapsed >= self.reset_timeout and (not self._probing or probe_stuck):
+                # 復旧の確認のため1リクエストだけ通す（結果が返らないまま時間が経てば次を通す）
+                self._state = HALF_OPEN
+                self._probing = True
+                self._probe_started = now
+                return
+            self.rejected += 1
+            raise CircuitOpenError(self.host, max(0.0, self.reset_timeout - elapsed))
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = CLOSED
+            self._failures = 0
+            self._probing = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = OPEN
+                self._opened_at = self._clock()
+            self._probing = False
+
+
+class CircuitBreakers:
+    """ホストごとのサーキットブレーカーの集合"""
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = httpx.URL(url).host
+        with self._lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(host, **self._kwargs)
+            return breaker
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            breakers = list(self._breakers.values())
+        return {
+            "open": sum(1 for breaker in breakers if breaker.state != CLOSED),
+            "rejected": sum(breaker.rejected for breaker in breakers),
+        }
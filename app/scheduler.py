@@ -0,0 +1,161 @@
+"""
+人気トピックのバックグラウンド先読みスケジューラー
+
+`search_zenn_articles` で要求されたトピックを数え、人気の高いトピックと
+トレンドフィードを一定間隔で再取得して記事キャッシュを鮮度内に保つ。
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler
+from app.logging_config import get_logger
+from app.models import normalize_topic
+
+# 先読みで取得する記事数（ツールの上限に合わせる）
+PREFETCH_ARTICLES = 10
+
+
+class PrefetchScheduler:
+    """人気トピックを一定間隔で再取得するスケジューラー"""
+
+    def __init__(
+        self,
+        interval: float = None,
+        jitter: float = None,
+        max_topics: int = None,
+        max_concurrency: int = None,
+        decay: float = None,
+        rng: Callable[[float, float], float] = random.uniform,
+    ):
+        self.logger = get_logger(__name__)
+        self.interval = interval or Config.PREFETCH_INTERVAL
+        self.jitter = Config.PREFETCH_JITTER if jitter is None else jitter
+        self.max_topics = max_topics or Config.PREFETCH_MAX_TOPICS
+        self.decay = Config.PREFETCH_DECAY if decay is None else decay
+        self._semaphore_size = max_concurrency or Config.PREFETCH_MAX_CONCURRENCY
+        self._rng = rng
+        self._scores: Counter = Counter()
+        self._last_refresh: Dict[str, float] = {}
+        # トレンドフィードは要求の集計とは別に扱う（"trending" という名前のトピックと混同しない）
+        self._trending_last_refresh: Optional[float] = None
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, topic: str) -> None:
+        """ツールで要求されたトピックを記録する"""
+        if not topic.strip():
+            return
+        with self._lock:
+            self._scores[normalize_topic(topic)] += 1
+
+    def hot_topics(self) -> List[str]:
+        """要求の多い順に先読み対象のトピックを返す"""
+        with self._lock:
+            return [topic for topic, _ in self._scores.most_common(self.max_topics)]
+
+    def next_delay(self) -> float:
+        """揺らぎを加えた次回までの待ち時間"""
+        spread = self.interval * self.jitter
+        return max(0.0, self.interval + self._rng(-spread, spread))
+
+    async def refresh_once(self, crawler: AsyncZennCrawler) -> None:
+        """人気トピックとトレンドフィードを同時実行数の上限内で再取得する"""
+        semaphore = asyncio.Semaphore(self._semaphore_size)
+        # (トピック名, トレンドフィードか) の組。トレンドはトピック名を持たない
+        targets = [(topic, False) for topic in self.hot_topics()] + [(None, True)]
+
+        async def refresh(topic: Optional[str], trending: bool) -> None:
+            async with semaphore:
+                try:
+                    if trending:
+                        await crawler.refresh_trending(PREFETCH_ARTICLES)
+                    else:
+                        await crawler.refresh_topic(topic, PREFETCH_ARTICLES)
+                    with self._lock:
+                        if trending:
+                            self._trending_last_refresh = time.time()
+                        else:
+                            self._last_refresh[topic] = time.time()
+                except Exception as e:
+                    self.logger.warning(
+                        operation="prefetch_refresh",
+                        message="Prefetch refresh failed",
+                        context={"topic": topic, "trending": trending, "error": str(e)},
+                    )
+
+        await asyncio.gather(*(refresh(*target) for target in targets))
+
+        # 一時的に人気だったトピックが居座らないよう減衰させる
+        with self._lock:
+            for topic in list(self._scores):
+                self._scores[topic] *= self.decay
+                if self._scores[topic] < 0.1:
+                    del self._scores[topic]
+
+    async def _run(self, crawler: AsyncZennCrawler) -> None:
+        while True:
+            await asyncio.sleep(self.next_delay())
+            await self.refresh_once(crawler)
+
+    def ensure_started(self, crawler: AsyncZennCrawler) -> None:
+        """実行中のイベントループで先読みを開始する（開始済みなら何もしない）"""
+        if self._task is not None and not self._task.done():
+            return
+        self._task = asyncio.get_running_loop().create_task(self._run(crawler))
+        self.logger.info(
+            operation="prefetch_start",
+            message="Prefetch scheduler started",
+            context={"interval": self.interval, "max_topics": self.max_topics},
+        )
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def status(self) -> Dict:
+        """人気トピックと最終再取得時刻を返す"""
+        with self._lock:
+            scores = dict(self._scores)
+            last_refresh = dict(self._last_refresh)
+            trending_last_refresh = self._trending_last_refresh
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "hot_topics": [
+                {
+                    "topic": topic,
+                    "score": round(scores[topic], 2),
+                    "last_refresh": last_refresh.get(topic),
+                }
+                for topic in self.hot_topics()
+            ],
+            "trending_last_refresh": trending_last_refresh,
+        }
+
+
+# Process-wide scheduler instance
+_scheduler = None
+
+
+def get_scheduler() -> PrefetchScheduler:
+    """プロセス全体で共有するスケジューラーを取得"""
+    global _scheduler
+
+    if _scheduler is None:
+        _scheduler = PrefetchScheduler()
+    return _scheduler
@@ -0,0 +1,176 @@
+"""
+取得した記事に対するメモリ上の全文検索インデックス
+
+タイトル・概要・作成者を、英数字は単語、日本語などそれ以外の文字列は
+文字バイグラムに分割して転置インデックスに登録し、BM25でランク付けする。
+フィードの取得のたびに差分だけを追加するため、検索時にネットワークへ出ない。
+"""
+
+import heapq
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from app.config import Config
+from app.models import Article
+
+# 英数字の連続は単語として、それ以外の文字の連続はバイグラムに分割する
+_RUN_RE = re.compile(r"[0-9a-z]+|[^\W0-9a-z_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """検索用のトークン列に分割する（NFKC正規化・小文字化済み）"""
+    tokens = []
+    for run in _RUN_RE.findall(unicodedata.normalize("NFKC", text).lower()):
+        if run.isascii() or len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+@dataclass
+class _Document:
+    article: Article
+    terms: Dict[str, int]
+    length: int
+
+
+class SearchIndex:
+    """BM25でランク付けする文字バイグラムの転置インデックス"""
+
+    def __init__(
+        self,
+        max_documents: int = None,
+        title_weight: int = None,
+        k1: float = 1.2,
+        b: float = 0.75,
+    ):
+        self.max_documents = max_documents or Config.SEARCH_INDEX_MAX_DOCUMENTS
+        self.title_weight = title_weight or Config.SEARCH_TITLE_WEIGHT
+        self.k1 = k1
+        self.b = b
+        # URL -> 文書ID（登録順。上限を超えたら先頭から外す）
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._documents: Dict[int, _Document] = {}
+        self._lengths: Dict[int, int] = {}
+        # トークン -> {文書ID: 重み付きの出現回数}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._total_length = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def add(self, articles: Iterable[Article]) -> int:
+        """
+        記事を登録する。同じURLの記事は内容が変わっていれば置き換える
+
+        Returns:
+            新規登録または更新した記事数
+        """
+        changed = 0
+        with self._lock:
+            for article in articles:
+                key = article.url or article.title
+                if not key:
+                    continue
+                doc_id = self._ids.get(key)
+                if doc_id is not None:
+                    known = self._documents[doc_id].article
+                    if not article.description and known.description:
+                        # 概要を持たない取得元（APIの一覧）の記事で、登録済みの概要を消さない
+                        article = replace(article, description=known.description)
+                    if self._same_content(known, article):
+                        continue
+                    self._remove(key)
+                self._insert(key, article)
+                changed += 1
+            while len(self._ids) > self.max_documents:
+                self._remove(next(iter(self._ids)))
+        return changed
+
+    @staticmethod
+    def _same_content(old: Article, new: Article) -> bool:
+        return (old.title, old.description, old.creator, old.published_at) == (
+            new.title, new.description, new.creator, new.published_at
+        )
+
+    def _insert(self, key: str, article: Article) -> None:
+        terms = Counter(tokenize(article.description or ""))
+        terms.update(tokenize(article.creator or ""))
+        for token in tokenize(article.title or ""):
+            terms[token] += self.title_weight
+
+        doc_id = self._next_id
+        self._next_id += 1
+        length = sum(terms.values())
+        self._ids[key] = doc_id
+        self._documents[doc_id] = _Document(article, dict(terms), length)
+        self._lengths[doc_id] = length
+        self._total_length += length
+        for token, count in terms.items():
+            self._postings.setdefault(token, {})[doc_id] = count
+
+    def _remove(self, key: str) -> None:
+        doc_id = self._ids.pop(key)
+        document = self._documents.pop(doc_id)
+        del self._lengths[doc_id]
+        self._total_length -= document.length
+        for token in document.terms:
+            postings = self._postings[token]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[token]
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        accept: Optional[Callable[[Article], bool]] = None,
+    ) -> List[Tuple[Article, float]]:
+        """クエリに関連する記事をBM25スコアの高い順に返す（accept で対象の記事を絞れる）"""
+        query_terms = Counter(tokenize(query))
+        with self._lock:
+            document_count = len(self._documents)
+            if not query_terms or not document_count:
+                return []
+            # k1 * (1 - b + b * 文書長 / 平均文書長) を定数部分と文書長の係数に分ける
+            base_norm = self.k1 * (1 - self.b)
+            length_norm = self.k1 * self.b * document_count / self._total_length
+            lengths = self._lengths
+            scores: Dict[int, float] = {}
+            for token, query_count in query_terms.items():
+                postings = self._postings.get(token)
+                if not postings:
+                    continue
+                df = len(postings)
+                idf = math.log(1 + (document_count - df + 0.5) / (df + 0.5))
+                weight = idf * (self.k1 + 1) * query_count
+                for doc_id, tf in postings.items():
+                    score = weight * tf / (tf + base_norm + length_norm * lengths[doc_id])
+                    scores[doc_id] = scores.get(doc_id, 0.0) + score
+
+            candidates = scores.items()
+            if accept is not None:
+                documents = self._documents
+                candidates = [item for item in candidates if accept(documents[item[0]].article)]
+            best = heapq.nlargest(limit, candidates, key=lambda item: item[1])
+            return [(self._documents[doc_id].article, score) for doc_id, score in best]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._ids.clear()
+            self._documents.clear()
+            self._lengths.clear()
+            self._postings.clear()
+            self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"documents": len(self._documents), "terms": len(self._postings)}
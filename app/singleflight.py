@@ -0,0 +1,112 @@
+"""
+同一キーの同時実行を1回にまとめるリクエスト合流（single-flight）
+
+同じフィードへの取得が同時に複数届いた場合、最初の呼び出しだけが実際の
+取得を行い、残りは同じ結果を待つ。結果の受け渡しには
+`concurrent.futures.Future` を使うため、別スレッドや別イベントループの
+呼び出し元（同期ラッパー経由の呼び出しなど）とも合流できる。
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass
+class _Flight:
+    """実行中の1回分の処理"""
+
+    future: Future
+    task: "asyncio.Task" = None
+    waiters: int = 1  # 結果を待っている呼び出し元の数
+
+
+class SingleFlight:
+    """キーごとに実行中の処理を共有する"""
+
+    def __init__(self):
+        self._calls: Dict[Hashable, _Flight] = {}
+        self._tasks = set()
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+        self.abandoned = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        """
+        キーに対応する処理を実行し、実行中なら合流して結果を待つ
+
+        実際の処理は呼び出し元とは独立したタスクで動くため、先に呼んだ側が
+        キャンセルされても合流した他の呼び出し元には結果が届く。待っている
+        呼び出し元がすべてキャンセルされた場合は、処理そのものも中断する。
+        """
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            flight = self._calls.get(key)
+            if flight is None:
+                flight = _Flight(Future())
+                # 別スレッドから合流した呼び出し元がすぐにキャンセルしても中断できるよう、
+                # 他の呼び出し元から見える前にタスクを作っておく
+                flight.task = loop.create_task(self._run(key, fn, flight))
+                self._calls[key] = flight
+                self._tasks.add(flight.task)
+                flight.task.add_done_callback(self._tasks.discard)
+                self.executed += 1
+            else:
+                flight.waiters += 1
+                self.coalesced += 1
+
+        try:
+            # 呼び出し元のキャンセルを、他に待っている呼び出し元がいる間は共有の処理に波及させない
+            return await asyncio.shield(asyncio.wrap_future(flight.future))
+        except asyncio.CancelledError:
+            self._leave(key, flight)
+            raise
+
+    def _leave(self, key: Hashable, flight: _Flight) -> None:
+        """キャンセルされた呼び出し元を外し、最後の1人なら処理を中断する"""
+        with self._lock:
+            flight.waiters -= 1
+            if flight.waiters > 0 or flight.future.done():
+                return
+            # 以降の呼び出しは中断する処理に合流させず、新しく実行させる
+            if self._calls.get(key) is flight:
+                del self._calls[key]
+            self.abandoned += 1
+        # 処理は先に呼んだ側のイベントループで動いているため、そのループで中断させる
+        flight.task.get_loop().call_soon_threadsafe(flight.task.cancel)
+
+    async def _run(self, key: Hashable, fn: Callable[[], Awaitable[T]], flight: _Flight) -> None:
+        future = flight.future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            self._forget(key, flight)
+            future.cancel()
+            raise
+        except BaseException as e:
+            self._forget(key, flight)
+            future.set_exception(e)
+        else:
+            self._forget(key, flight)
+            future.set_result(result)
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        # 完了後に届いた呼び出しは新しく実行させる
+        with self._lock:
+            if self._calls.get(key) is flight:
+                del self._calls[key]
+
+    def stats(self) -> Dict[str, int]:
+        """実行回数と合流した呼び出し数を返す"""
+        with self._lock:
+            return {
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "abandoned": self.abandoned,
+                "in_flight": len(self._calls),
+            }
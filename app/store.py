@@ -0,0 +1,156 @@
+"""
+取得した記事を永続化するSQLiteストア
+
+フィードは最新の数件しか返さないため、取得した記事をすべてURLで一意に
+蓄積し、トピックや投稿日時で引けるようにする。WALモードで書き込み中も
+読み出しをブロックしない。
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable, List, Optional
+
+from app.config import Config
+from app.models import Article, normalize_topic
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL,
+    title TEXT NOT NULL,
+    creator TEXT NOT NULL,
+    description TEXT NOT NULL,
+    published_at TEXT NOT NULL,
+    published_ts INTEGER NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_url ON articles (url);
+CREATE INDEX IF NOT EXISTS idx_articles_published_ts ON articles (published_ts);
+CREATE TABLE IF NOT EXISTS article_topics (
+    topic TEXT NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles (id),
+    PRIMARY KEY (topic, article_id)
+) WITHOUT ROWID;
+"""
+
+_UPSERT_ARTICLE = """
+INSERT INTO articles
+    (url, title, creator, description, published_at, published_ts, fetched_at)
+VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (url) DO UPDATE SET
+    title = excluded.title,
+    creator = excluded.creator,
+    -- APIの一覧など概要を持たない取得元で、フィード由来の概要を消さない
+    description = CASE WHEN excluded.description = ''
+        THEN articles.description ELSE excluded.description END,
+    published_at = excluded.published_at,
+    published_ts = excluded.published_ts,
+    fetched_at = excluded.fetched_at
+"""
+
+_LINK_TOPIC = """
+INSERT OR IGNORE INTO article_topics (topic, article_id)
+SELECT ?, id FROM articles WHERE url = ?
+"""
+
+_COLUMNS = "a.title, a.url, a.published_at, a.creator, a.description, a.published_ts"
+
+
+class ArticleStore:
+    """記事をURL単位でupsertするスレッドセーフなSQLiteストア"""
+
+    def __init__(self, path: str = None):
+        self.path = path or Config.ARTICLE_STORE_PATH
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(_SCHEMA)
+
+    def upsert(self, articles: Iterable[Article], topic: str) -> int:
+        """
+        記事をまとめて1トランザクションでupsertし、トピックと関連付ける
+
+        Returns:
+            書き込んだ記事数
+        """
+        topic = normalize_topic(topic)
+        fetched_at = int(time.time())
+        rows = []
+        links = []
+        for article in articles:
+            if not article.url:
+                continue
+            rows.append((
+                article.url,
+                article.title,
+                article.creator,
+                article.description,
+                article.published_at,
+                article.published_ts,
+                fetched_at,
+            ))
+            links.append((topic, article.url))
+
+        if not rows:
+            return 0
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_ARTICLE, rows)
+            self._conn.executemany(_LINK_TOPIC, links)
+        return len(rows)
+
+    def recent(
+        self,
+        topic: Optional[str] = None,
+        limit: int = 50,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+    ) -> List[Article]:
+        """トピック（省略時は全体）の記事を新しい順に返す（since 以上 until 未満に絞れる）"""
+        conditions = []
+        params: list = []
+        if topic:
+            source = "article_topics t JOIN articles a ON a.id = t.article_id"
+            conditions.append("t.topic = ?")
+            params.append(normalize_topic(topic))
+        else:
+            source = "articles a"
+        if since is not None:
+            conditions.append("a.published_ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("a.published_ts < ?")
+            params.append(until)
+        where = f"WHERE {' AND '.join(conditions)} " if conditions else ""
+        query = f"SELECT {_COLUMNS} FROM {source} {where}ORDER BY a.published_ts DESC LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [
+            Article(title=title, url=url, published_at=published_at,
+                    creator=creator, description=description, published_ts=published_ts)
+            for title, url, published_at, creator, description, published_ts in rows
+        ]
+
+    def last_fetched(self, topic: str) -> Optional[int]:
+        """トピックの記事を最後に書き込んだ時刻（エポック秒、未取得なら None）"""
+        query = (
+            "SELECT MAX(a.fetched_at) FROM article_topics t "
+            "JOIN articles a ON a.id = t.article_id WHERE t.topic = ?"
+        )
+        with self._lock:
+            return self._conn.execute(query, (normalize_topic(topic),)).fetchone()[0]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
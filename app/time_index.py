@@ -0,0 +1,134 @@
+"""
+取得した記事の投稿日時の索引
+
+トピックごと（と全体）に投稿日時の昇順に並べた配列を持ち、期間の問い合わせを
+二分探索で答える。同じURLの記事は最新の内容で置き換え、記事数が上限を超えたら
+投稿日時の古い記事から捨てる。
+"""
+
+import threading
+from array import array
+from bisect import bisect_left
+from dataclasses import replace
+from typing import Dict, Iterable, List, Optional
+
+from app.config import Config
+from app.models import Article, normalize_topic
+
+# 全トピックを通した索引のキー
+ALL_TOPICS = ""
+
+
+class _SortedTimes:
+    """投稿日時の昇順に並べた (エポック秒, URL) の列"""
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.urls: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.urls)
+
+    def _position(self, timestamp: int, url: str) -> int:
+        index = bisect_left(self.timestamps, timestamp)
+        while index < len(self.urls) and self.timestamps[index] == timestamp:
+            if self.urls[index] == url:
+                return index
+            index += 1
+        return -1
+
+    def insert(self, timestamp: int, url: str) -> None:
+        index = bisect_left(self.timestamps, timestamp)
+        self.timestamps.insert(index, timestamp)
+        self.urls.insert(index, url)
+
+    def remove(self, timestamp: int, url: str) -> None:
+        index = self._position(timestamp, url)
+        if index >= 0:
+            del self.timestamps[index]
+            del self.urls[index]
+
+    def between(self, since: Optional[int], until: Optional[int], limit: int) -> List[str]:
+        """since 以上 until 未満のURLを新しい順に最大 limit 件返す"""
+        start = 0 if since is None else bisect_left(self.timestamps, since)
+        stop = len(self.urls) if until is None else bisect_left(self.timestamps, until)
+        return self.urls[max(start, stop - limit):stop][::-1]
+
+
+class TimeIndex:
+    """トピックごとの投稿日時の索引"""
+
+    def __init__(self, max_articles: int = None):
+        self.max_articles = max_articles or Config.TIME_INDEX_MAX_ARTICLES
+        self._articles: Dict[str, Article] = {}
+        self._topics: Dict[str, set] = {}
+        self._index: Dict[str, _SortedTimes] = {ALL_TOPICS: _SortedTimes()}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._articles)
+
+    def add(self, articles: Iterable[Article], topic: str = ALL_TOPICS) -> None:
+        """記事を索引に加える（投稿日時が不明な記事は対象外）"""
+        topic = normalize_topic(topic)
+        with self._lock:
+            for article in articles:
+                if not article.url or not article.published_ts:
+                    continue
+                self._add(article, topic)
+            self._evict()
+
+    def _add(self, article: Article, topic: str) -> None:
+        known = self._articles.get(article.url)
+        if known is not None and not article.description and known.description:
+            article = replace(article, description=known.description)
+        topics = self._topics.setdefault(article.url, set())
+        if known is not None and known.published_ts != article.published_ts:
+            for name in topics | {ALL_TOPICS}:
+                self._index[name].remove(known.published_ts, article.url)
+            topics_to_insert = topics | {ALL_TOPICS, topic}
+        elif known is None:
+            topics_to_insert = {ALL_TOPICS, topic}
+        else:
+            topics_to_insert = {topic} - topics - {ALL_TOPICS}
+        self._articles[article.url] = article
+        for name in topics_to_insert:
+            self._index.setdefault(name, _SortedTimes()).insert(article.published_ts, article.url)
+        if topic != ALL_TOPICS:
+            topics.add(topic)
+
+    def _evict(self) -> None:
+        overall = self._index[ALL_TOPICS]
+        while len(overall) > self.max_articles:
+            timestamp, url = overall.timestamps[0], overall.urls[0]
+            for name in self._topics.pop(url, set()) | {ALL_TOPICS}:
+                self._index[name].remove(timestamp, url)
+                if name != ALL_TOPICS and not self._index[name]:
+                    del self._index[name]
+            del self._articles[url]
+
+    def between(
+        self,
+        topic: Optional[str] = None,
+        since: Optional[int] = None,
+        until: Optional[int] = None,
+        limit: int = 10,
+    ) -> List[Article]:
+        """
+        期間内の記事を新しい順に返す
+
+        Args:
+            topic: トピック名（省略時は全体）
+            since: この時刻（エポック秒）以降
+            until: この時刻（エポック秒）より前
+            limit: 最大件数
+        """
+        with self._lock:
+            times = self._index.get(normalize_topic(topic or ALL_TOPICS))
+            if times is None:
+                return []
+            return [self._articles[url] for url in times.between(since, until, limit)]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"articles": len(self._articles), "topics": len(self._index) - 1}
@@ -0,0 +1,225 @@
+"""
+トレンドフィードの順位の履歴
+
+スナップショットは記事IDを順位順に並べた配列（array('I')）として持ち、記事の
+URLとメタデータはIDに一度だけ登録する。順位の変化速度・掲載時間・最高順位は
+スナップショットを追加するたびに差分で更新し、問い合わせでは過去のスナップショットを
+読み直さない。
+"""
+
+import threading
+import time
+from array import array
+from collections import deque
+from dataclasses import dataclass, replace
+from itertools import islice
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.config import Config
+from app.models import Article
+
+
+@dataclass
+class TrendStats:
+    """1記事分の集計値"""
+
+    article: Article
+    first_seen: float
+    last_seen: float
+    rank: Optional[int] = None  # 現在の順位（掲載外なら None）
+    best_rank: int = 0
+    velocity: float = 0.0  # 1時間あたりに上がった順位（平滑化済み、正なら上昇）
+    on_list_seconds: float = 0.0  # 掲載されていた時間の合計
+    appearances: int = 0  # 掲載されていたスナップショット数
+    entries: int = 0  # 圏外から掲載された回数
+    samples: int = 0  # 変化速度の計算に使った区間の数（圏外に落ちると0に戻る）
+
+
+class TrendingHistory:
+    """トレンドのスナップショットと記事ごとの集計"""
+
+    def __init__(
+        self,
+        max_snapshots: int = None,
+        min_interval: float = None,
+        alpha: float = None,
+    ):
+        """
+        Args:
+            max_snapshots: 保持するスナップショット数
+            min_interval: これより短い間隔のスナップショットは記録しない（秒）
+            alpha: 順位の変化速度の指数移動平均の係数
+        """
+        self.max_snapshots = max_snapshots or Config.TRENDING_HISTORY_MAX_SNAPSHOTS
+        self.min_interval = (
+            Config.TRENDING_SNAPSHOT_MIN_INTERVAL if min_interval is None else min_interval
+        )
+        self.alpha = alpha or Config.TRENDING_VELOCITY_ALPHA
+        self._ids: Dict[str, int] = {}
+        self._stats: Dict[int, TrendStats] = {}
+        self._next_id = 0
+        self._times: Deque[float] = deque()
+        self._snapshots: Deque[array] = deque()
+        self._on_list: Set[int] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._snapshots)
+
+    def _intern(self, article: Article, now: float) -> int:
+        article_id = self._ids.get(article.url)
+        if article_id is None:
+            article_id = self._ids[article.url] = self._next_id
+            self._next_id += 1
+            self._stats[article_id] = TrendStats(article, first_seen=now, last_seen=now)
+        else:
+            self._stats[article_id].article = article
+        return article_id
+
+    def record(self, articles: Sequence[Article], now: float = None) -> bool:
+        """
+        トレンドの記事リスト（順位順）をスナップショットとして追加する
+
+        前回より浅いリスト（取得件数が少ない）の場合、その深さより下にいた記事は
+        観測できなかったものとして順位を据え置く。
+
+        Returns:
+            記録した場合は True（間隔が短すぎる、または空のリストなら False）
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            if not articles or (self._times and now - self._times[-1] < self.min_interval):
+                return False
+
+            previous = self._times[-1] if self._times else None
+            hours = (now - previous) / 3600 if previous is not None else 0.0
+            ids = array("I")
+            seen: Set[int] = set()
+            for article in articles:
+                article_id = self._intern(article, now)
+                if article_id not in seen:
+                    seen.add(article_id)
+                    ids.append(article_id)
+
+            depth = len(ids)
+            for rank, article_id in enumerate(ids, 1):
+                self._update(self._stats[article_id], rank, depth, now, previous, hours)
+
+            for article_id in self._on_list - seen:
+                stats = self._stats[article_id]
+                if stats.rank <= depth:
+                    # 観測できた範囲から外れた（圏外に落ちた）
+                    stats.rank = None
+                    stats.velocity = 0.0
+                    stats.samples = 0
+                else:
+                    seen.add(article_id)
+            self._on_list = seen
+
+            self._times.append(now)
+            self._snapshots.append(ids)
+            while len(self._snapshots) > self.max_snapshots:
+                self._times.popleft()
+                self._snapshots.popleft()
+            self._prune()
+            return True
+
+    def _update(
+        self,
+        stats: TrendStats,
+        rank: int,
+        depth: int,
+        now: float,
+        previous: Optional[float],
+        hours: float,
+    ) -> None:
+        if stats.rank is not None and previous is not None:
+            stats.on_list_seconds += now - previous
+            moved = stats.rank - rank
+        else:
+            # 圏外からの掲載は、リストのすぐ下から上がってきたとみなす
+            stats.entries += 1
+            moved = depth + 1 - rank if previous is not None else 0
+        if hours > 0:
+            sample = moved / hours
+            if stats.samples:
+                stats.velocity = self.alpha * sample + (1 - self.alpha) * stats.velocity
+            else:
+                stats.velocity = sample
+            stats.samples += 1
+        stats.rank = rank
+        stats.best_rank = min(stats.best_rank or rank, rank)
+        stats.last_seen = now
+        stats.appearances += 1
+
+    def _prune(self) -> None:
+        """保持期間より前に圏外に落ちた記事の集計を捨てる"""
+        oldest = self._times[0]
+        stale = [
+            article_id for article_id, stats in self._stats.items()
+            if stats.rank is None and stats.last_seen < oldest
+        ]
+        for article_id in stale:
+            del self._ids[self._stats.pop(article_id).article.url]
+
+    def current(self) -> List[TrendStats]:
+        """現在掲載中の記事を順位順に返す"""
+        with self._lock:
+            candidates = [replace(self._stats[i]) for i in self._on_list]
+        return sorted(candidates, key=lambda s: s.rank)
+
+    def rising(self, limit: int = 10) -> List[TrendStats]:
+        """順位の上昇が速い掲載中の記事"""
+        with self._lock:
+            candidates = [
+                replace(self._stats[i]) for i in self._on_list if self._stats[i].velocity > 0
+            ]
+        candidates.sort(key=lambda s: (-s.velocity, s.rank))
+        return candidates[:limit]
+
+    def longest(self, limit: int = 10) -> List[TrendStats]:
+        """掲載時間の長い掲載中の記事"""
+        with self._lock:
+            candidates = [replace(self._stats[i]) for i in self._on_list]
+        candidates.sort(key=lambda s: (-s.on_list_seconds, s.rank))
+        return candidates[:limit]
+
+    def lookup(self, url: str) -> Optional[TrendStats]:
+        with self._lock:
+            article_id = self._ids.get(url)
+            stats = self._stats.get(article_id) if article_id is not None else None
+            return replace(stats) if stats is not None else None
+
+    def trajectory(self, url: str, points: int = 12) -> List[Tuple[float, Optional[int]]]:
+        """直近 points 件のスナップショットでの順位（圏外は None）"""
+        with self._lock:
+            article_id = self._ids.get(url)
+            start = max(0, len(self._snapshots) - points)
+            recent = list(islice(zip(self._times, self._snapshots), start, None))
+        if article_id is None:
+            return []
+        trail = []
+        for at, ids in recent:
+            try:
+                trail.append((at, ids.index(article_id) + 1))
+            except ValueError:
+                trail.append((at, None))
+        return trail
+
+    def span(self) -> Tuple[Optional[float], Optional[float]]:
+        """保持しているスナップショットの最初と最後の時刻"""
+        with self._lock:
+            if not self._times:
+                return None, None
+            return self._times[0], self._times[-1]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "snapshots": len(self._snapshots),
+                "articles": len(self._stats),
+                "on_list": len(self._on_list),
+                "snapshot_bytes": sum(
+                    snapshot.itemsize * len(snapshot) for snapshot in self._snapshots
+                ),
+            }
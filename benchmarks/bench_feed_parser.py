@@ -0,0 +1,85 @@
+"""
+フィードパーサーのベンチマーク
+
+合成フィード（10 / 100 / 1000 件）に対して、従来のBeautifulSoupによる
+全体ツリー構築と、`AsyncZennCrawler._parse_feed` のストリーミングパースの
+CPU時間とピークメモリを比較する。
+
+    python -m benchmarks.bench_feed_parser --max-articles 10
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from bs4 import BeautifulSoup
+
+from app.crawler import AsyncZennCrawler
+from benchmarks.fake_zenn_server import build_feed
+
+FEED_SIZES = (10, 100, 1000)
+
+
+def parse_with_beautifulsoup(content: bytes, max_articles: int) -> List[Dict]:
+    """従来の実装と同じく、フィード全体のツリーを作ってから先頭を切り出す"""
+    soup = BeautifulSoup(content, "xml")
+    articles = []
+    for item in soup.find_all("item")[:max_articles]:
+        description = item.find("description").text if item.find("description") else ""
+        if "<" in description:
+            description = BeautifulSoup(description, "html.parser").get_text().strip()
+        articles.append({
+            "title": item.find("title").text if item.find("title") else "",
+            "url": item.find("link").text if item.find("link") else "",
+            "published_at": item.find("pubDate").text if item.find("pubDate") else "",
+            "creator": item.find("dc:creator").text if item.find("dc:creator") else "",
+            "description": description,
+        })
+    return articles
+
+
+def measure(parse: Callable[[], List[Dict]], repeat: int) -> Dict[str, float]:
+    """CPU時間（1回あたりの平均）とピークメモリを測る"""
+    parse()  # ウォームアップ
+    start = time.process_time()
+    for _ in range(repeat):
+        parse()
+    cpu_ms = (time.process_time() - start) * 1000 / repeat
+
+    tracemalloc.start()
+    parse()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"cpu_ms": cpu_ms, "peak_kib": peak / 1024}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--max-articles", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    crawler = AsyncZennCrawler()
+    print(
+        f"{'items':>6} {'parser':<14} {'cpu ms':>10} {'peak KiB':>10}"
+        f"   (max_articles={args.max_articles})"
+    )
+    for size in FEED_SIZES:
+        content = build_feed(size)
+        paths = {
+            "beautifulsoup": lambda: parse_with_beautifulsoup(content, args.max_articles),
+            "streaming": lambda: crawler._parse_feed(
+                content, args.max_articles, "parse_feed_item"
+            ),
+        }
+        for name, parse in paths.items():
+            result = measure(parse, args.repeat)
+            print(
+                f"{size:>6} {name:<14} {result['cpu_ms']:>10.2f} "
+                f"{result['peak_kib']:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
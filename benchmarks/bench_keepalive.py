@@ -0,0 +1,85 @@
+"""
+キープアライブ接続プールのベンチマーク
+
+ローカルのHTTPSサーバーに対して、呼び出しごとに新規接続する場合
+（呼び出しごとにHTTPクライアントを作る従来の方式）と、`AsyncZennCrawler` の
+共有接続プールを使い回す場合の1リクエストあたりの転送時間を比較する。
+パースやログ出力は含めない。
+
+    python -m benchmarks.bench_keepalive --calls 200
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import httpx
+
+from app.crawler import AsyncZennCrawler
+from benchmarks.fake_zenn_server import FakeZennServer
+
+
+async def _measure(fn, calls: int) -> list:
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        await fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def _summary(name: str, timings: list, connections: int) -> str:
+    timings = sorted(timings)
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    return (
+        f"{name:<22} mean={statistics.mean(timings):7.2f}ms "
+        f"p50={statistics.median(timings):7.2f}ms p95={p95:7.2f}ms "
+        f"connections={connections}"
+    )
+
+
+async def _run(server: FakeZennServer, calls: int) -> None:
+    feed_url = f"{server.base_url}/topics/python/feed"
+
+    async def fresh_connection():
+        async with httpx.AsyncClient() as client:
+            await client.get(feed_url)
+
+    before = server.connections
+    fresh = await _measure(fresh_connection, calls)
+    fresh_connections = server.connections - before
+
+    crawler = AsyncZennCrawler()
+
+    async def pooled_connection():
+        await crawler._client().get(feed_url)
+
+    before = server.connections
+    pooled = await _measure(pooled_connection, calls)
+    pooled_connections = server.connections - before
+    await crawler.aclose()
+
+    print(_summary("new client per call", fresh, fresh_connections))
+    print(_summary("AsyncZennCrawler pool", pooled, pooled_connections))
+    print(
+        f"handshake cost removed: "
+        f"{statistics.mean(fresh) - statistics.mean(pooled):.2f}ms/call"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--items", type=int, default=10)
+    args = parser.parse_args()
+
+    with FakeZennServer(items=args.items, tls=True) as server:
+        # 自己署名証明書を信頼させる
+        os.environ["SSL_CERT_FILE"] = server.cert_path
+        asyncio.run(_run(server, args.calls))
+
+
+if __name__ == "__main__":
+    main()
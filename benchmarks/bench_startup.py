@@ -0,0 +1,135 @@
+"""
+MCPサーバーの起動時間ベンチマーク
+
+MCPクライアントと同じようにstdioでサーバープロセスを起動し、
+起動から initialize 応答・tools/list 応答・最初のツール結果までの時間を計測する。
+ツール呼び出しはローカルの偽Zennサーバーに向ける。
+
+    python -m benchmarks.bench_startup --runs 10
+    python -m benchmarks.bench_startup --compare benchmarks/results/startup_baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from benchmarks.fake_zenn_server import FakeZennServer
+from benchmarks.run_benchmarks import RESULTS_DIR, _git_commit, compare, print_table, summarize
+
+ROOT = Path(__file__).resolve().parent.parent
+STAGES = ("import", "initialize", "tools_list", "first_result")
+
+
+def server_env(base_url: str) -> Dict[str, str]:
+    """偽サーバーに向け、ストアと先読みを切った環境変数"""
+    env = dict(os.environ)
+    env.update(
+        ZENN_MCP_BASE_URL=base_url,
+        ZENN_MCP_STORE_PATH="",
+        ZENN_MCP_PREFETCH="0",
+        PYTHONPATH=str(ROOT),
+    )
+    return env
+
+
+def measure_import(env: Dict[str, str], cwd: str) -> float:
+    """`import app.main` だけにかかる時間（ミリ秒、インタプリタ起動を含む）"""
+    began = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "import app.main"], env=env, cwd=cwd, check=True)
+    return (time.perf_counter() - began) * 1000
+
+
+async def measure_session(env: Dict[str, str], cwd: str, topic: str) -> Dict[str, float]:
+    """サーバーを1回起動し、各応答までの経過時間（ミリ秒）を返す"""
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable, args=["-m", "app.main"], env=env, cwd=cwd
+    )
+    timings = {}
+    began = time.perf_counter()
+    with open(os.devnull, "w") as errlog:
+        async with stdio_client(params, errlog=errlog) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                timings["initialize"] = (time.perf_counter() - began) * 1000
+                await session.list_tools()
+                timings["tools_list"] = (time.perf_counter() - began) * 1000
+                result = await session.call_tool(
+                    "search_zenn_articles", {"topic": topic, "max_articles": 5}
+                )
+                timings["first_result"] = (time.perf_counter() - began) * 1000
+    if result.isError or not result.content[0].text.startswith("# トピック"):
+        raise RuntimeError(f"unexpected tool result: {result.content}")
+    return timings
+
+
+async def run_startup(args: argparse.Namespace) -> Dict[str, Dict]:
+    samples: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    # ログファイルは一時ディレクトリに書かせる
+    with FakeZennServer(items=10) as server, tempfile.TemporaryDirectory() as workdir:
+        env = server_env(server.base_url)
+        for run in range(args.runs):
+            samples["import"].append(measure_import(env, workdir))
+            timings = await measure_session(env, workdir, f"startup{run}")
+            for stage, value in timings.items():
+                samples[stage].append(value)
+    # 各段階は独立した起動の計測なので、スループットは意味を持たない
+    return {
+        stage: summarize(values, elapsed=0) for stage, values in samples.items()
+    }
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="サーバーを起動する回数")
+    parser.add_argument("--output", type=Path, help="結果JSONの保存先")
+    parser.add_argument("--compare", type=Path, help="比較する基準のJSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="p95の悪化を回帰とみなす割合")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    stages = asyncio.run(run_startup(args))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {"runs": args.runs},
+        },
+        "stages": stages,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        "startup_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+
+    print_table(stages)
+    print(f"results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
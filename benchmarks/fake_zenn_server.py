@@ -0,0 +1,296 @@
+"""
+ベンチマーク用のローカルZennフィードサーバー
+
+zenn.dev の `/topics/<topic>/feed` と `/feed` を模した合成RSSと、
+`/api/articles`（ページ送りの一覧）と `/api/articles/<slug>`（本文）を模した合成JSONを返す。
+フィードの件数、応答遅延、エラー率、接続断や応答の停止を変えて負荷や障害を再現できる。
+"""
+
+import json
+import os
+import random
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+from urllib.parse import parse_qs, urlsplit
+
+# APIの1ページあたりの記事数（zenn.devと同じ）
+API_PAGE_SIZE = 48
+
+
+def build_feed(items: int, topic: str = "trend") -> bytes:
+    """指定件数のアイテムを含む合成RSSフィードを生成"""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>',
+        '<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">',
+        "<channel>",
+        f"<title>Zennの「{topic}」のフィード</title>",
+    ]
+    for i in range(items):
+        pub_date = formatdate(1752482068 - i * 3600, usegmt=True)
+        parts.append(
+            "<item>"
+            f"<title><![CDATA[{topic} の記事 {i}]]></title>"
+            f"<link>https://zenn.dev/author{i % 50}/articles/{topic}-{i:05d}</link>"
+            f"<pubDate>{pub_date}</pubDate>"
+            f"<dc:creator>author{i % 50}</dc:creator>"
+            "<description><![CDATA[<p>これは<strong>合成</strong>された記事の概要です。"
+            f"{topic} に関する説明 {i}</p>]]></description>"
+            "</item>"
+        )
+    parts.append("</channel></rss>")
+    return "\n".join(parts).encode("utf-8")
+
+
+def build_api_page(topic: str, page: int, total: int, page_size: int = API_PAGE_SIZE) -> bytes:
+    """`/api/articles?topicname=...&order=latest&page=N` を模した合成JSONを生成"""
+    start = (page - 1) * page_size
+    articles = []
+    for i in range(start, min(start + page_size, total)):
+        published = time.strftime(
+            "%Y-%m-%dT%H:%M:%S.000+09:00", time.gmtime(1752482068 + 9 * 3600 - i * 3600)
+        )
+        articles.append({
+            "id": i,
+            "title": f"{topic} のAPI記事 {i}",
+            "slug": f"{topic}-api-{i:05d}",
+            "path": f"/author{i % 50}/articles/{topic}-api-{i:05d}",
+            "published_at": published,
+            "body_updated_at": published,
+            "user": {"username": f"author{i % 50}", "name": f"Author {i % 50}"},
+        })
+    next_page = page + 1 if start + page_size < total else None
+    return json.dumps({"articles": articles, "next_page": next_page}).encode("utf-8")
+
+
+def build_api_article(slug: str) -> bytes:
+    """`/api/articles/<slug>` を模した合成JSONを生成"""
+    paragraphs = "".join(f"<p>{slug} の本文 {i} 段落目です。</p>" for i in range(20))
+    article = {
+        "slug": slug,
+        "title": f"記事 {slug}",
+        "body_html": f"<h2>はじめに</h2>{paragraphs}<pre><code>print('{slug}')\n</code></pre>",
+        "body_updated_at": "2025-07-14T17:34:28.000+09:00",
+        "published_at": "2025-07-14T17:34:28.000+09:00",
+    }
+    return json.dumps({"article": article}).encode("utf-8")
+
+
+class FakeZennHandler(BaseHTTPRequestHandler):
+    """合成フィードを返すリクエストハンドラ"""
+
+    protocol_version = "HTTP/1.1"  # キープアライブを有効にする
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+        server.requests += 1
+        url = urlsplit(self.path)
+        path = url.path
+        content_type = "application/xml; charset=utf-8"
+        if path == "/feed":
+            topic = "trend"
+        elif path.startswith("/topics/") and path.endswith("/feed"):
+            topic = path.split("/")[2]
+        elif path == "/api/articles":
+            query = parse_qs(url.query)
+            topic = query.get("topicname", ["trend"])[0]
+            page = int(query.get("page", ["1"])[0])
+            content_type = "application/json"
+        elif path.startswith("/api/articles/"):
+            topic = None
+            content_type = "application/json"
+        else:
+            self.send_error(404)
+            return
+
+        delay = server.next_latency()
+        if delay:
+            time.sleep(delay)
+
+        if server.should_fail():
+            server.errors += 1
+            self.send_response(503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        fault = server.next_fault()
+        if fault == "drop":
+            # 応答を返さずに接続を切る
+            server.errors += 1
+            self.close_connection = True
+            return
+        if fault == "stall":
+            server.errors += 1
+            time.sleep(server.stall_seconds)
+
+        if path == "/api/articles":
+            server.api_requests += 1
+            body = build_api_page(topic, page, server.api_articles)
+            etag = f'"{topic}-api-{page}"'
+        elif path.startswith("/api/articles/"):
+            server.api_requests += 1
+            slug = path.rsplit("/", 1)[-1]
+            body = build_api_article(slug)
+            etag = f'"{slug}"'
+        else:
+            body = server.feed_for(topic)
+            etag = f'"{topic}-{server.items}"'
+        if server.etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        if server.etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FakeZennServer(ThreadingHTTPServer):
+    """バックグラウンドスレッドで動くローカルZennサーバー"""
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        items: int = 20,
+        tls: bool = False,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        error_rate: float = 0.0,
+        etag: bool = False,
+        seed: Optional[int] = None,
+        api_articles: int = 200,
+        drop_rate: float = 0.0,
+        stall_rate: float = 0.0,
+        stall_seconds: float = 5.0,
+    ):
+        """
+        Args:
+            items: フィードあたりのアイテム数
+            tls: 自己署名証明書でHTTPSにするか
+            latency: 応答前に待つ秒数
+            latency_jitter: 遅延に加える一様乱数の幅（秒）
+            error_rate: 503を返す割合（0〜1）
+            etag: ETagを付けて条件付きGETに304で応えるか
+            seed: 遅延とエラーの乱数シード
+            api_articles: `/api/articles` でトピックごとに返す記事の総数
+            drop_rate: 応答せずに接続を切る割合（0〜1）
+            stall_rate: stall_seconds だけ止まってから応答する割合（0〜1）
+            stall_seconds: 止まる秒数（読み取りタイムアウトの再現用）
+        """
+        super().__init__(("127.0.0.1", 0), FakeZennHandler)
+        self.items = items
+        self.tls = tls
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.error_rate = error_rate
+        self.etag = etag
+        self.api_articles = api_articles
+        self.drop_rate = drop_rate
+        self.stall_rate = stall_rate
+        self.stall_seconds = stall_seconds
+        self.api_requests = 0
+        self.connections = 0
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._feeds = {}
+        self._thread: Optional[threading.Thread] = None
+        self._cert_dir: Optional[tempfile.TemporaryDirectory] = None
+        if tls:
+            self._wrap_tls()
+
+    def _wrap_tls(self) -> None:
+        """自己署名証明書でソケットをTLS化する"""
+        self._cert_dir = tempfile.TemporaryDirectory()
+        cert = os.path.join(self._cert_dir.name, "cert.pem")
+        key = os.path.join(self._cert_dir.name, "key.pem")
+        subprocess.run(
+            [
+                "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes",
+                "-keyout", key, "-out", cert, "-days", "1",
+                "-subj", "/CN=127.0.0.1",
+                "-addext", "subjectAltName=IP:127.0.0.1",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(cert, key)
+        self.cert_path = cert
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+
+    def get_request(self):
+        request = super().get_request()
+        self.connections += 1
+        return request
+
+    def next_latency(self) -> float:
+        if not self.latency_jitter:
+            return self.latency
+        with self._random_lock:
+            return self.latency + self._random.uniform(0, self.latency_jitter)
+
+    def next_fault(self) -> Optional[str]:
+        """このリクエストに注入する障害（"drop" / "stall" / None）"""
+        if not self.drop_rate and not self.stall_rate:
+            return None
+        with self._random_lock:
+            roll = self._random.random()
+        if roll < self.drop_rate:
+            return "drop"
+        if roll < self.drop_rate + self.stall_rate:
+            return "stall"
+        return None
+
+    def should_fail(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._random_lock:
+            return self._random.random() < self.error_rate
+
+    def feed_for(self, topic: str) -> bytes:
+        """トピックごとの合成フィードを返す（生成結果はキャッシュ）"""
+        if topic not in self._feeds:
+            self._feeds[topic] = build_feed(self.items, topic)
+        return self._feeds[topic]
+
+    @property
+    def base_url(self) -> str:
+        scheme = "https" if self.tls else "http"
+        host, port = self.server_address[:2]
+        return f"{scheme}://{host}:{port}"
+
+    def start(self) -> "FakeZennServer":
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._cert_dir is not None:
+            self._cert_dir.cleanup()
+
+    def __enter__(self) -> "FakeZennServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
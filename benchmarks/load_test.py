@@ -0,0 +1,249 @@
+"""
+HTTPモードのMCPサーバーの負荷試験
+
+streamable-HTTP でサーバープロセスを1つ起動し、多数の模擬クライアントから
+同時にツールを呼び出して、ツール呼び出しのp50/p95/p99とスループット、
+混雑で断られた呼び出し数、上流（偽Zennサーバー）に届いたリクエスト数を計測する。
+上流には偽Zennサーバー、または `--replay` で記録済みのアーカイブを使う。
+
+    python -m benchmarks.load_test --clients 200 --calls 10 --latency 0.02
+    python -m benchmarks.load_test --clients 500 --max-concurrency 32 --max-waiting 64
+    python -m benchmarks.load_test --replay data/zenn_mcp/upstream.jsonl.gz --replay-speed 0
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+
+from benchmarks.bench_startup import server_env
+from benchmarks.fake_zenn_server import FakeZennServer
+from benchmarks.run_benchmarks import RESULTS_DIR, _git_commit, compare, print_table, summarize
+
+BUSY_PREFIX = "サーバーが混み合っています"
+HEADERS = {"Accept": "application/json, text/event-stream"}
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def rpc(request_id: int, method: str, params: Dict) -> Dict:
+    return {"jsonrpc": "2.0", "id": request_id, "method": method, "params": params}
+
+
+async def wait_until_ready(url: str, process: subprocess.Popen, timeout: float = 30.0) -> None:
+    """サーバーが initialize に応答するまで待つ"""
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(timeout=5) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError(f"server exited with code {process.returncode}")
+            with contextlib.suppress(httpx.TransportError):
+                response = await client.post(url, json=initialize(0), headers=HEADERS)
+                if response.status_code == 200:
+                    return
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"server did not become ready within {timeout}s")
+
+
+def initialize(request_id: int) -> Dict:
+    return rpc(request_id, "initialize", {
+        "protocolVersion": "2025-06-18",
+        "capabilities": {},
+        "clientInfo": {"name": "zenn-mcp-load-test", "version": "0"},
+    })
+
+
+class Tally:
+    """模擬クライアント全体の計測値"""
+
+    def __init__(self):
+        self.timings: List[float] = []
+        self.errors = 0
+        self.busy = 0
+
+
+async def simulate_client(
+    index: int, url: str, args: argparse.Namespace, tally: Tally, start: asyncio.Event
+) -> None:
+    """1クライアント分: 接続を張って initialize し、ツールを calls 回呼ぶ"""
+    rng = random.Random(args.seed + index)
+    async with httpx.AsyncClient(timeout=args.timeout, headers=HEADERS) as client:
+        await start.wait()
+        try:
+            await client.post(url, json=initialize(0))
+        except httpx.HTTPError:
+            tally.errors += args.calls
+            return
+        for call in range(1, args.calls + 1):
+            if rng.random() < args.trending_ratio:
+                tool = ("get_trending_articles", {"max_articles": args.max_articles})
+            else:
+                topic = f"topic{rng.randrange(args.topics)}"
+                tool = ("search_zenn_articles", {"topic": topic, "max_articles": args.max_articles})
+            request = rpc(call, "tools/call", {"name": tool[0], "arguments": tool[1]})
+            began = time.perf_counter()
+            try:
+                response = await client.post(url, json=request)
+                response.raise_for_status()
+                result = response.json()["result"]
+                text = result["content"][0]["text"]
+                if text.startswith(BUSY_PREFIX):
+                    tally.busy += 1
+                elif result.get("isError") or text.startswith("エラー"):
+                    tally.errors += 1
+            except (httpx.HTTPError, KeyError, IndexError, ValueError):
+                tally.errors += 1
+            tally.timings.append((time.perf_counter() - began) * 1000)
+            if args.think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * args.think_time))
+
+
+async def drive(url: str, args: argparse.Namespace) -> Dict:
+    """全クライアントを同時に走らせて集計する"""
+    tally = Tally()
+    start = asyncio.Event()
+    clients = [
+        asyncio.create_task(simulate_client(i, url, args, tally, start))
+        for i in range(args.clients)
+    ]
+    await asyncio.sleep(0)
+    began = time.perf_counter()
+    start.set()
+    await asyncio.gather(*clients)
+    stats = summarize(tally.timings, time.perf_counter() - began, tally.errors)
+    stats["busy"] = tally.busy
+    return stats
+
+
+def launch_server(env: Dict[str, str], cwd: str) -> subprocess.Popen:
+    return subprocess.Popen(
+        [sys.executable, "-m", "app.main"],
+        env=env, cwd=cwd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+
+
+async def run_load_test(args: argparse.Namespace) -> Dict[str, Dict]:
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/mcp/"
+    with contextlib.ExitStack() as stack:
+        workdir = stack.enter_context(tempfile.TemporaryDirectory())
+        if args.replay:
+            server = None
+            env = server_env("https://zenn.dev")
+            env.update(ZENN_MCP_REPLAY=str(args.replay.resolve()),
+                       ZENN_MCP_REPLAY_SPEED=str(args.replay_speed))
+        else:
+            server = stack.enter_context(
+                FakeZennServer(items=args.items, latency=args.latency, seed=args.seed)
+            )
+            env = server_env(server.base_url)
+        env.update(
+            ZENN_MCP_TRANSPORT="streamable-http",
+            ZENN_MCP_HTTP_PORT=str(port),
+            ZENN_MCP_MAX_CONCURRENCY=str(args.max_concurrency),
+            ZENN_MCP_MAX_WAITING=str(args.max_waiting),
+            ZENN_MCP_RATE_LIMIT=str(args.rate_limit),
+        )
+        process = launch_server(env, workdir)
+        try:
+            await wait_until_ready(url, process)
+            results = {"tool_call": await drive(url, args)}
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+        if server is not None:
+            results["upstream"] = {"requests": server.requests, "errors": server.errors}
+    return results
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=200, help="同時に接続する模擬クライアント数")
+    parser.add_argument("--calls", type=int, default=10, help="クライアントごとのツール呼び出し数")
+    parser.add_argument("--topics", type=int, default=20, help="クライアントが選ぶトピックの種類")
+    parser.add_argument("--trending-ratio", type=float, default=0.2,
+                        help="トレンド取得を呼ぶ割合（残りはトピック指定の取得）")
+    parser.add_argument("--max-articles", type=int, default=5)
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="呼び出しの間に挟む平均待ち時間（秒）")
+    parser.add_argument("--timeout", type=float, default=60.0, help="クライアント側のタイムアウト（秒）")
+    parser.add_argument("--items", type=int, default=20, help="偽サーバーのフィードあたりのアイテム数")
+    parser.add_argument("--latency", type=float, default=0.0, help="偽サーバーの応答遅延（秒）")
+    parser.add_argument("--replay", type=Path, help="偽サーバーの代わりに再生するアーカイブ")
+    parser.add_argument("--replay-speed", type=float, default=0.0,
+                        help="再生時に記録時の所要時間を何倍速で再現するか（0で待たない）")
+    parser.add_argument("--max-concurrency", type=int, default=64, help="サーバーの同時実行数")
+    parser.add_argument("--max-waiting", type=int, default=256, help="サーバーの実行待ちの上限")
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="上流への1秒あたりの送信数（既定の0は制限なし）")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="結果JSONの保存先")
+    parser.add_argument("--compare", type=Path, help="比較する基準のJSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="p95の悪化を回帰とみなす割合")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    stages = asyncio.run(run_load_test(args))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "params": {
+                key: str(value) if isinstance(value, Path) else value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare", "threshold")
+            },
+        },
+        "stages": stages,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        "load_" + datetime.now().strftime("%Y%m%d_%H%M%S") + ".json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+
+    print_table(stages)
+    call = stages["tool_call"]
+    print(f"busy (rejected by backpressure): {call['busy']}")
+    if "upstream" in stages:
+        print(f"upstream requests: {stages['upstream']['requests']} "
+              f"for {call['count']} tool calls")
+    print(f"results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+"""
+Zenn MCPサーバーのベンチマークスイート
+
+ローカルの偽Zennサーバー（件数・遅延・エラー率を指定可能）に対して、
+取得・パース・Markdown整形の各段階と、MCPツール呼び出し全体の
+p50/p95/p99レイテンシとスループットを計測し、結果をJSONで保存する。
+
+    python -m benchmarks.run_benchmarks --items 50 --latency 0.02 --requests 200
+    python -m benchmarks.run_benchmarks --compare benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional
+from unittest.mock import patch
+
+from app.config import Config
+from benchmarks.fake_zenn_server import FakeZennServer, build_feed
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """線形補間なしの最近傍法によるパーセンタイル"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings_ms: List[float], elapsed: float, errors: int = 0) -> Dict:
+    """レイテンシ分布とスループットをまとめる"""
+    ordered = sorted(timings_ms)
+    return {
+        "count": len(ordered),
+        "errors": errors,
+        "mean_ms": round(statistics.mean(ordered), 4) if ordered else 0.0,
+        "p50_ms": round(percentile(ordered, 0.50), 4),
+        "p95_ms": round(percentile(ordered, 0.95), 4),
+        "p99_ms": round(percentile(ordered, 0.99), 4),
+        "throughput_rps": round(len(ordered) / elapsed, 2) if elapsed else 0.0,
+    }
+
+
+def bench_sync(fn: Callable[[], object], iterations: int) -> Dict:
+    """同期関数を繰り返し実行して計測する"""
+    timings = []
+    start = time.perf_counter()
+    for _ in range(iterations):
+        began = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - began) * 1000)
+    return summarize(timings, time.perf_counter() - start)
+
+
+async def bench_async(
+    fn: Callable[[int], Awaitable[object]],
+    iterations: int,
+    concurrency: int,
+    is_error: Callable[[object], bool] = lambda result: False,
+) -> Dict:
+    """コルーチンを指定の並行数で実行して計測する"""
+    timings = []
+    errors = 0
+    counter = iter(range(iterations))
+
+    async def worker():
+        nonlocal errors
+        for i in counter:
+            began = time.perf_counter()
+            try:
+                result = await fn(i)
+                if is_error(result):
+                    errors += 1
+            except Exception:
+                errors += 1
+            timings.append((time.perf_counter() - began) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(timings, time.perf_counter() - start, errors)
+
+
+async def run_suite(args: argparse.Namespace) -> Dict:
+    """各段階と全体のベンチマークを実行する"""
+    from app.crawler import AsyncZennCrawler
+    from app.render import render_articles, render_cache
+
+    results: Dict[str, Dict] = {}
+    content = build_feed(args.items, "bench")
+    parser_crawler = AsyncZennCrawler()
+    articles = parser_crawler._parse_feed(content, args.max_articles, "parse_feed_item")
+
+    results["parse"] = bench_sync(
+        lambda: parser_crawler._parse_feed(content, args.max_articles, "parse_feed_item"),
+        args.requests,
+    )
+    results["format"] = bench_sync(
+        lambda: (render_cache.clear(), render_articles("# トピック: bench", articles)),
+        args.requests,
+    )
+    results["format_cached"] = bench_sync(
+        lambda: render_articles("# トピック: bench", articles), args.requests
+    )
+
+    with FakeZennServer(
+        items=args.items,
+        latency=args.latency,
+        latency_jitter=args.latency_jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as server:
+        with patch.multiple(
+            Config,
+            ZENN_FEED_BASE_URL=f"{server.base_url}/topics",
+            ZENN_TRENDING_FEED_URL=f"{server.base_url}/feed",
+            ARTICLE_STORE_PATH="",
+            RATE_LIMIT_PER_SECOND=args.rate_limit,
+        ):
+            crawler = AsyncZennCrawler()
+
+            async def fetch(i: int):
+                response = await crawler._client().get(f"{server.base_url}/topics/t{i}/feed")
+                return response
+
+            results["fetch"] = await bench_async(
+                fetch,
+                args.requests,
+                args.concurrency,
+                is_error=lambda response: response.status_code >= 400,
+            )
+
+            # キャッシュの効かない別トピックを毎回取得するクロール全体
+            async def crawl(i: int):
+                return await crawler.fetch_articles_from_feed(f"crawl{i}", args.max_articles)
+
+            results["crawl"] = await bench_async(
+                crawl, args.requests, args.concurrency, is_error=lambda result: not result
+            )
+            await crawler.aclose()
+
+            results.update(await _bench_tools(args))
+
+        results["server"] = {"requests": server.requests, "errors": server.errors}
+
+    return results
+
+
+async def _bench_tools(args: argparse.Namespace) -> Dict[str, Dict]:
+    """MCPツール関数を通した全体の計測（キャッシュなし／ありの両方）"""
+    import app.crawler
+    from app.main import search_zenn_articles
+
+    app.crawler._async_crawler = None  # 偽サーバー向けの設定で作り直させる
+
+    async def cold(i: int):
+        return await search_zenn_articles(f"tool{i}", args.max_articles)
+
+    async def warm(i: int):
+        return await search_zenn_articles("warm", args.max_articles)
+
+    def failed(result: str) -> bool:
+        return not result.startswith("# トピック")
+
+    results = {
+        "end_to_end": await bench_async(cold, args.requests, args.concurrency, failed),
+        "end_to_end_cached": await bench_async(warm, args.requests, args.concurrency, failed),
+    }
+    await app.crawler.get_async_crawler().aclose()
+    app.crawler._async_crawler = None
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """p95が基準値より threshold 以上悪化した段階を返す"""
+    regressions = []
+    for stage, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(stage)
+        if not before or "p95_ms" not in stats or not before.get("p95_ms"):
+            continue
+        ratio = stats["p95_ms"] / before["p95_ms"]
+        marker = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(
+            f"{stage:<18} p95 {before['p95_ms']:9.3f}ms -> {stats['p95_ms']:9.3f}ms "
+            f"({ratio:5.2f}x) {marker}"
+        )
+        if ratio > 1 + threshold:
+            regressions.append(stage)
+    return regressions
+
+
+def print_table(stages: Dict[str, Dict]) -> None:
+    print(f"{'stage':<18} {'count':>6} {'err':>4} {'p50 ms':>9} {'p95 ms':>9} "
+          f"{'p99 ms':>9} {'rps':>9}")
+    for stage, stats in stages.items():
+        if "p50_ms" not in stats:
+            continue
+        print(
+            f"{stage:<18} {stats['count']:>6} {stats['errors']:>4} "
+            f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} "
+            f"{stats['p99_ms']:>9.3f} {stats['throughput_rps']:>9.1f}"
+        )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20, help="フィードあたりのアイテム数")
+    parser.add_argument("--max-articles", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200, help="段階ごとの実行回数")
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--latency", type=float, default=0.0, help="偽サーバーの応答遅延（秒）")
+    parser.add_argument("--latency-jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--rate-limit", type=float, default=0.0,
+                        help="上流への1秒あたりの送信数（既定の0は制限なしで自前の処理だけを計測）")
+    parser.add_argument("--disable-metrics", action="store_true",
+                        help="段階ごとの計測を無効にする（計測のオーバーヘッド確認用）")
+    parser.add_argument("--output", type=Path, help="結果JSONの保存先")
+    parser.add_argument("--compare", type=Path, help="比較する基準のJSON")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="p95の悪化を回帰とみなす割合")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    from app.metrics import metrics
+
+    metrics.enabled = not args.disable_metrics
+    stages = asyncio.run(run_suite(args))
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": _git_commit(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "params": {
+                key: value for key, value in vars(args).items()
+                if key not in ("output", "compare", "threshold")
+            },
+        },
+        "stages": stages,
+    }
+
+    output = args.output or RESULTS_DIR / (
+        datetime.now().strftime("%Y%m%d_%H%M%S") + ".json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, ensure_ascii=False, indent=2))
+
+    print_table(stages)
+    print(f"results saved to {output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
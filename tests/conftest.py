@@ -0,0 +1,86 @@
+"""
+テスト共通の部品
+
+時刻を進められる時計と、上流（zenn.dev）を模したモックトランスポートをまとめる。
+共有クローラーの記事ストアはメモリ上に作り、作業ツリーに data/ を作らない。
+各テストからは `from tests.conftest import FakeClock, feed_transport` のように使う。
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.config import Config
+from benchmarks.fake_zenn_server import build_api_page
+
+
+@pytest.fixture(autouse=True)
+def in_memory_store(monkeypatch):
+    """既定の記事ストアの保存先をメモリにする"""
+    monkeypatch.setattr(Config, "ARTICLE_STORE_PATH", ":memory:")
+
+
+class FakeClock:
+    """now を書き換えて時刻を進める時計（clock 引数に渡す）"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def feed_transport(content, status_code=200, headers=None, calls=None):
+    """固定のフィードを返すモックトランスポート"""
+    def handler(request):
+        if calls is not None:
+            calls.append(request)
+        return httpx.Response(status_code, content=content, headers=headers)
+    return httpx.MockTransport(handler)
+
+
+def failing_transport():
+    """ネットワークエラーを発生させるモックトランスポート"""
+    def handler(request):
+        raise httpx.ConnectError("Network error", request=request)
+    return httpx.MockTransport(handler)
+
+
+def sequence_transport(responses, calls):
+    """順番にレスポンスを返すモックトランスポート"""
+    responses = iter(responses)
+
+    def handler(request):
+        calls.append(request)
+        return next(responses)
+    return httpx.MockTransport(handler)
+
+
+def api_transport(calls, updated_at="2025-07-14T08:00:00.000+09:00", delay=0.0):
+    """Zenn APIの記事詳細を模したモックトランスポート"""
+    async def handler(request):
+        calls.append(request.url.path)
+        if delay:
+            await asyncio.sleep(delay)
+        slug = request.url.path.rsplit("/", 1)[-1]
+        if slug == "missing":
+            return httpx.Response(404)
+        article = {
+            "slug": slug,
+            "title": f"記事 {slug}",
+            "body_html": f"<h2>見出し</h2><p>{slug} の本文です。</p>",
+            "body_updated_at": updated_at,
+        }
+        return httpx.Response(200, content=json.dumps({"article": article}))
+    return httpx.MockTransport(handler)
+
+
+def page_transport(calls, total=120):
+    """記事一覧APIを模したモックトランスポート"""
+    def handler(request):
+        page = int(request.url.params["page"])
+        calls.append(page)
+        return httpx.Response(200, content=build_api_page(request.url.params["topicname"], page, total))
+    return httpx.MockTransport(handler)
@@ -0,0 +1,161 @@
+"""
+Zenn APIのページ送り取得のテスト
+"""
+
+import asyncio
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler, ZennCrawler
+from app.feed_parser import parse_api_article
+from app.store import ArticleStore
+from benchmarks.fake_zenn_server import FakeZennServer, build_api_page
+from tests.conftest import page_transport
+
+
+class TestParseApiArticle:
+
+    def test_should_convert_api_item_to_article(self):
+        """APIの記事をフィードと同じ形式の Article にすること"""
+        article = parse_api_article(
+            {
+                "title": "API記事",
+                "path": "/user/articles/slug",
+                "published_at": "2025-07-14T17:34:28.000+09:00",
+                "user": {"username": "user", "name": "ユーザー"},
+            },
+            "https://zenn.dev",
+        )
+
+        assert article.url == "https://zenn.dev/user/articles/slug"
+        assert article.published_at == "Mon, 14 Jul 2025 08:34:28 GMT"
+        assert article.creator == "ユーザー"
+
+
+class TestIterTopicPages:
+
+    @pytest.mark.asyncio
+    async def test_should_stop_at_requested_count(self):
+        """指定件数に達したら以降のページを取得しないこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=page_transport(calls))
+
+        pages = [page async for page in crawler.iter_topic_pages("react", max_articles=50)]
+
+        assert [len(page) for page in pages] == [48, 2]
+        assert calls == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_should_read_until_last_page(self):
+        """件数の指定がなければ最後のページまで読むこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=page_transport(calls, total=100))
+
+        pages = [page async for page in crawler.iter_topic_pages("react")]
+
+        assert sum(len(page) for page in pages) == 100
+        assert calls == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_should_stop_at_date_cutoff(self):
+        """指定日時より古い記事に達したら止めること"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=page_transport(calls))
+        # 合成データは1時間ごとに古くなる。60件目の投稿時刻を境にする
+        cutoff = parse_api_article(
+            json.loads(build_api_page("react", 2, 120))["articles"][11], ""
+        ).published_timestamp()
+
+        pages = [page async for page in crawler.iter_topic_pages("react", since=cutoff)]
+
+        articles = [article for page in pages for article in page]
+        assert len(articles) == 60
+        assert all(article.published_timestamp() >= cutoff for article in articles)
+        assert calls == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_should_prefetch_next_page_while_consumer_works(self):
+        """呼び出し元が処理している間に次のページを取得していること"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=page_transport(calls))
+        pages = crawler.iter_topic_pages("react")
+
+        await pages.__anext__()
+        await asyncio.sleep(0.01)
+
+        assert calls == [1, 2]
+        await pages.aclose()
+
+    def test_sync_generator_should_yield_pages(self):
+        """同期版のジェネレーターでもページを順に受け取れること"""
+        calls = []
+        crawler = ZennCrawler(transport=page_transport(calls))
+
+        pages = crawler.iter_topic_pages("react", max_articles=60)
+        first = next(pages)
+        pages.close()
+
+        assert len(first) == 48
+        assert calls[0] == 1
+
+
+class TestBackfillTopic:
+
+    @pytest.mark.asyncio
+    async def test_should_store_and_index_backfilled_articles(self, tmp_path):
+        """取り込んだ記事をストアと検索インデックスに反映すること"""
+        store = ArticleStore(str(tmp_path / "articles.db"))
+        with FakeZennServer(api_articles=70) as server:
+            with patch.multiple(
+                Config,
+                ZENN_BASE_URL=server.base_url,
+                ZENN_API_BASE_URL=f"{server.base_url}/api",
+            ):
+                crawler = AsyncZennCrawler(store=store)
+                result = await crawler.backfill_topic("rust", max_articles=500)
+                await crawler.aclose()
+
+        assert result["articles"] == 70
+        assert result["pages"] == 2
+        assert store.count() == 70
+        assert len(await crawler.search_articles("API記事", limit=100)) == 70
+        assert server.api_requests == 2
+        store.close()
+
+    @pytest.mark.asyncio
+    async def test_should_keep_feed_description_after_backfill(self, tmp_path):
+        """概要のないAPIの記事で、フィードから取得済みの概要を上書きしないこと"""
+        feed = """<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/"><channel>
+<item>
+<title>rust のAPI記事 0</title>
+<link>https://zenn.dev/author0/articles/rust-api-00000</link>
+<pubDate>Mon, 14 Jul 2025 08:34:28 GMT</pubDate>
+<dc:creator>Author 0</dc:creator>
+<description>Rich description</description>
+</item>
+</channel></rss>""".encode("utf-8")
+
+        def handler(request):
+            if request.url.path.startswith("/api/"):
+                return httpx.Response(200, content=build_api_page("rust", 1, 1))
+            return httpx.Response(200, content=feed)
+
+        store = ArticleStore(str(tmp_path / "articles.db"))
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler), store=store)
+        await crawler.fetch_articles_from_feed("rust", 5)
+        result = await crawler.backfill_topic("rust", max_articles=10)
+        await crawler.aclose()
+
+        assert result["articles"] == 1
+        assert [article.description for article in store.recent("rust")] == ["Rich description"]
+        assert [article.url for article in await crawler.search_articles("Rich")] == [
+            "https://zenn.dev/author0/articles/rust-api-00000"
+        ]
+        between = await crawler.articles_between("rust")
+        assert between[0].description == "Rich description"
+        store.close()
@@ -0,0 +1,126 @@
+"""
+記事本文の取得とキャッシュのテスト
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from app.article_body import BodyCache, article_slug
+from app.crawler import AsyncZennCrawler
+from app.feed_parser import html_to_text
+from app.models import ArticleBody
+from tests.conftest import FakeClock, api_transport
+
+
+class TestArticleSlug:
+
+    def test_should_extract_slug_from_article_url(self):
+        """記事URLからスラッグを取り出すこと"""
+        assert article_slug("https://zenn.dev/user/articles/abc123") == "abc123"
+        assert article_slug("https://zenn.dev/user/articles/abc123?utm=x") == "abc123"
+
+    def test_should_reject_non_article_urls(self):
+        """本やスクラップのURLはNoneを返すこと"""
+        assert article_slug("https://zenn.dev/user/books/abc") is None
+        assert article_slug("https://zenn.dev/topics/react") is None
+
+
+class TestHtmlToText:
+
+    def test_should_keep_paragraphs_and_code_indentation(self):
+        """段落の区切りとコードの字下げを残すこと"""
+        text = html_to_text(
+            "<h2>見出し</h2><p>本文&amp;です<br>次行</p>"
+            "<pre><code>def f():\n    return 1\n</code></pre><script>x()</script>"
+        )
+
+        assert text == "見出し\n\n本文&です\n次行\n\ndef f():\n    return 1"
+
+
+class TestBodyCache:
+
+    def test_should_expire_after_ttl_but_keep_version(self):
+        """TTL後は再確認が必要だが、同じ更新日時なら変換済みの本文を返すこと"""
+        clock = FakeClock()
+        cache = BodyCache(ttl=60, clock=clock)
+        body = ArticleBody(url="u", text="本文", updated_at="v1")
+        cache.put(body)
+
+        assert cache.get("u") is body
+        clock.now = 61
+        assert cache.get("u") is None
+        assert cache.get_version("u", "v2") is None
+        assert cache.get_version("u", "v1") is body
+        assert cache.get("u") is body
+
+    def test_should_evict_least_recently_used(self):
+        """上限を超えたら最も使われていない本文を外すこと"""
+        cache = BodyCache(max_entries=2, clock=FakeClock())
+        for url in ("a", "b", "c"):
+            cache.put(ArticleBody(url=url))
+
+        assert cache.get("a") is None
+        assert len(cache) == 2
+
+
+class TestFetchArticleBodies:
+
+    @pytest.mark.asyncio
+    async def test_should_fetch_bodies_in_order(self):
+        """指定した順に本文を返し、取得できない記事はNoneにすること"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=api_transport(calls))
+        urls = [
+            "https://zenn.dev/u/articles/one",
+            "https://zenn.dev/u/books/book",
+            "https://zenn.dev/u/articles/missing",
+            "https://zenn.dev/u/articles/two",
+        ]
+
+        bodies = await crawler.fetch_article_bodies(urls)
+
+        assert bodies[0].title == "記事 one"
+        assert bodies[0].text == "見出し\n\none の本文です。"
+        assert bodies[1] is None
+        assert bodies[2] is None
+        assert bodies[3].url == urls[3]
+        assert sorted(calls) == ["/api/articles/missing", "/api/articles/one", "/api/articles/two"]
+
+    @pytest.mark.asyncio
+    async def test_should_serve_repeated_requests_from_cache(self):
+        """同じ記事の2回目以降はネットワークに出ないこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=api_transport(calls))
+        url = "https://zenn.dev/u/articles/one"
+
+        first = await crawler.fetch_article_bodies([url])
+        second = await crawler.fetch_article_bodies([url, url])
+
+        assert second == [first[0], first[0]]
+        assert calls == ["/api/articles/one"]
+
+    @pytest.mark.asyncio
+    async def test_should_bound_concurrency(self):
+        """同時取得数を上限までに抑えること"""
+        active = 0
+        peak = 0
+
+        async def handler(request):
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+            article = {"title": "t", "body_html": "<p>b</p>", "body_updated_at": "v"}
+            return httpx.Response(200, content=json.dumps({"article": article}))
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+        urls = [f"https://zenn.dev/u/articles/a{i}" for i in range(8)]
+
+        bodies = await crawler.fetch_article_bodies(urls, max_concurrency=3)
+
+        assert all(body is not None for body in bodies)
+        assert peak == 3
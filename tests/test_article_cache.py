@@ -0,0 +1,122 @@
+"""
+記事キャッシュ（TTL + LRU + stale-while-revalidate）のテスト
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.article_cache import FRESH, MISS, STALE, ArticleCache
+from app.config import Config
+from app.crawler import AsyncZennCrawler, ZennCrawler
+from app.models import Article
+from tests.conftest import FakeClock
+
+
+def make_articles(count, prefix="a"):
+    return [
+        Article(title=f"{prefix}{i}", url=f"https://zenn.dev/{prefix}/{i}")
+        for i in range(count)
+    ]
+
+
+class TestArticleCache:
+
+    def test_should_miss_then_hit(self):
+        """保存前はミス、保存後はヒットになること"""
+        cache = ArticleCache(clock=FakeClock())
+        assert cache.lookup("feed", 10) == (None, MISS)
+
+        cache.put("feed", make_articles(3), limit=10, ttl=60)
+        articles, state = cache.lookup("feed", 10)
+
+        assert state == FRESH
+        assert len(articles) == 3
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_should_serve_stale_within_grace_period(self):
+        """TTL切れ後も猶予期間内は古い結果を返すこと"""
+        clock = FakeClock()
+        cache = ArticleCache(stale_ttl=30, clock=clock)
+        cache.put("feed", make_articles(2), limit=10, ttl=60)
+
+        clock.now = 70
+        articles, state = cache.lookup("feed", 10)
+        assert state == STALE
+        assert len(articles) == 2
+
+        clock.now = 100
+        assert cache.lookup("feed", 10) == (None, MISS)
+        assert cache.stats()["entries"] == 0
+
+    def test_should_miss_when_more_articles_requested_than_cached(self):
+        """保存時より多い件数を求められたらミスになること"""
+        cache = ArticleCache(clock=FakeClock())
+        cache.put("feed", make_articles(5), limit=5, ttl=60)
+
+        assert cache.lookup("feed", 3)[1] == FRESH
+        assert cache.lookup("feed", 10) == (None, MISS)
+
+    def test_should_evict_by_entry_count(self):
+        """件数上限を超えたらLRU順に追い出すこと"""
+        cache = ArticleCache(max_entries=2, clock=FakeClock())
+        cache.put("a", make_articles(1), limit=10, ttl=60)
+        cache.put("b", make_articles(1), limit=10, ttl=60)
+        cache.lookup("a", 10)
+        cache.put("c", make_articles(1), limit=10, ttl=60)
+
+        assert cache.lookup("b", 10)[1] == MISS
+        assert cache.lookup("a", 10)[1] == FRESH
+        assert cache.stats()["evictions"] == 1
+
+    def test_should_evict_by_byte_size(self):
+        """おおよそのバイト数上限を超えたら追い出すこと"""
+        cache = ArticleCache(max_bytes=300, clock=FakeClock())
+        cache.put("a", make_articles(2, "x" * 40), limit=10, ttl=60)
+        cache.put("b", make_articles(2, "y" * 40), limit=10, ttl=60)
+
+        assert cache.lookup("a", 10)[1] == MISS
+        assert cache.lookup("b", 10)[1] == FRESH
+        assert cache.stats()["bytes"] <= 300
+
+
+class TestCrawlerArticleCache:
+
+    def test_should_not_hit_network_for_fresh_entry(self):
+        """鮮度内のフィードはネットワークに出ないこと"""
+        crawler = ZennCrawler()
+        with patch.object(
+            crawler.async_crawler, "_fetch_feed", new=AsyncMock(return_value=make_articles(2))
+        ) as mock_fetch:
+            crawler.fetch_articles_from_feed("react", max_articles=5)
+            articles = crawler.fetch_articles_from_feed("react", max_articles=5)
+
+            assert len(articles) == 2
+            assert mock_fetch.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_should_return_stale_and_refresh_in_background(self):
+        """期限切れ直後は古い結果を即返し、裏で再取得すること"""
+        clock = FakeClock()
+        crawler = AsyncZennCrawler()
+        crawler.article_cache = ArticleCache(clock=clock)
+        fetched = []
+
+        async def fetch(feed_url, max_articles, parse_operation):
+            fetched.append(feed_url)
+            return make_articles(2, "new" if len(fetched) > 1 else "old")
+
+        with patch.object(crawler, "_fetch_feed", side_effect=fetch):
+            await crawler.fetch_trending_articles(max_articles=5)
+            clock.now = Config.ARTICLE_CACHE_TRENDING_TTL + 1
+
+            articles = await crawler.fetch_trending_articles(max_articles=5)
+            assert articles[0].title == "old0"
+
+            await asyncio.gather(*crawler._refresh_tasks)
+
+        articles = await crawler.fetch_trending_articles(max_articles=5)
+        assert articles[0].title == "new0"
+        assert len(fetched) == 2
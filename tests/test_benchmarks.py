@@ -0,0 +1,108 @@
+"""
+ベンチマーク用の偽Zennサーバーとベンチマークスイートのテスト
+"""
+
+import json
+
+import httpx
+
+from benchmarks.fake_zenn_server import FakeZennServer
+from benchmarks.run_benchmarks import compare, main, percentile
+
+
+class TestFakeZennServer:
+
+    def test_should_serve_topic_and_trending_feeds(self):
+        """トピックとトレンドのフィードを返すこと"""
+        with FakeZennServer(items=3) as server:
+            topic = httpx.get(f"{server.base_url}/topics/react/feed")
+            trending = httpx.get(f"{server.base_url}/feed")
+            missing = httpx.get(f"{server.base_url}/unknown")
+
+        assert topic.status_code == 200
+        assert topic.content.count(b"<item>") == 3
+        assert b"react" in topic.content
+        assert trending.status_code == 200
+        assert missing.status_code == 404
+
+    def test_should_inject_errors_at_configured_rate(self):
+        """指定した割合で503を返すこと"""
+        with FakeZennServer(items=1, error_rate=1.0) as server:
+            response = httpx.get(f"{server.base_url}/feed")
+            assert response.status_code == 503
+            assert server.errors == 1
+
+    def test_should_answer_conditional_get_with_not_modified(self):
+        """ETag有効時は条件付きGETに304で応えること"""
+        with FakeZennServer(items=1, etag=True) as server:
+            first = httpx.get(f"{server.base_url}/feed")
+            second = httpx.get(
+                f"{server.base_url}/feed", headers={"If-None-Match": first.headers["ETag"]}
+            )
+
+        assert second.status_code == 304
+
+
+class TestRunBenchmarks:
+
+    def test_percentile_should_pick_nearest_rank(self):
+        """最近傍法でパーセンタイルを求めること"""
+        values = list(range(1, 101))
+        assert percentile(values, 0.5) == 50
+        assert percentile(values, 0.99) == 99
+        assert percentile([], 0.5) == 0.0
+
+    def test_should_save_results_as_json(self, tmp_path):
+        """全段階の結果をJSONに保存すること"""
+        output = tmp_path / "result.json"
+
+        assert main(["--requests", "5", "--items", "3", "--output", str(output)]) == 0
+
+        report = json.loads(output.read_text())
+        for stage in ("parse", "format", "fetch", "crawl", "end_to_end", "end_to_end_cached"):
+            stats = report["stages"][stage]
+            assert stats["count"] == 5
+            assert stats["errors"] == 0
+            assert {"p50_ms", "p95_ms", "p99_ms", "throughput_rps"} <= stats.keys()
+        assert report["meta"]["params"]["items"] == 3
+
+    def test_compare_should_flag_p95_regressions(self):
+        """p95が閾値を超えて悪化した段階を回帰として返すこと"""
+        baseline = {"stages": {"parse": {"p95_ms": 1.0}, "fetch": {"p95_ms": 10.0}}}
+        current = {"stages": {"parse": {"p95_ms": 1.5}, "fetch": {"p95_ms": 10.5}}}
+
+        assert compare(current, baseline, threshold=0.2) == ["parse"]
+
+
+class TestBenchStartup:
+
+    def test_should_measure_startup_over_stdio(self, tmp_path):
+        """stdioで起動したサーバーの各応答までの時間を保存すること"""
+        from benchmarks.bench_startup import main as startup_main
+
+        output = tmp_path / "startup.json"
+
+        assert startup_main(["--runs", "1", "--output", str(output)]) == 0
+
+        stages = json.loads(output.read_text())["stages"]
+        assert stages["initialize"]["p50_ms"] <= stages["tools_list"]["p50_ms"]
+        assert stages["tools_list"]["p50_ms"] <= stages["first_result"]["p50_ms"]
+        assert stages["import"]["count"] == 1
+
+
+class TestLoadTest:
+
+    def test_should_drive_many_clients_over_http(self, tmp_path):
+        """HTTPモードのサーバーに複数のクライアントから呼び出し、上流への取得を共有すること"""
+        from benchmarks.load_test import main as load_main
+
+        output = tmp_path / "load.json"
+
+        assert load_main([
+            "--clients", "20", "--calls", "3", "--topics", "2", "--output", str(output),
+        ]) == 0
+
+        stages = json.loads(output.read_text())["stages"]
+        assert stages["tool_call"]["count"] == 60
+        assert stages["tool_call"]["errors"] == 0
+        assert stages["upstream"]["requests"] < 60
@@ -0,0 +1,116 @@
+"""
+ツール呼び出しの同時実行数の制限のテスト
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from app.concurrency import ConcurrencyLimiter, ServerBusyError
+
+
+class TestConcurrencyLimiter:
+
+    @pytest.mark.asyncio
+    async def test_should_cap_concurrent_executions(self):
+        """同時に実行される数が上限を超えず、待った呼び出しも順に実行されること"""
+        limiter = ConcurrencyLimiter(max_concurrency=3, max_waiting=100, wait_timeout=0)
+        running = peak = 0
+
+        async def call():
+            nonlocal running, peak
+            async with limiter:
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        await asyncio.gather(*(call() for _ in range(20)))
+
+        stats = limiter.stats()
+        assert peak == 3
+        assert stats["admitted"] == 20
+        assert stats["queued"] == 17
+        assert stats["running"] == 0 and stats["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_should_reject_when_queue_is_full(self):
+        """待ち行列がいっぱいなら実行せずに即座に断ること"""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_waiting=1, wait_timeout=0)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter:
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        waiter = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+
+        with pytest.raises(ServerBusyError):
+            await limiter.acquire()
+
+        release.set()
+        await asyncio.gather(holder, waiter)
+        assert limiter.stats()["rejected"] == 1
+        assert limiter.stats()["admitted"] == 2
+
+    @pytest.mark.asyncio
+    async def test_should_give_up_waiting_after_timeout(self):
+        """待ち時間が上限を超えたら混雑として断り、枠を失わないこと"""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_waiting=10, wait_timeout=0.05)
+        await limiter.acquire()
+
+        with pytest.raises(ServerBusyError):
+            await limiter.acquire()
+
+        limiter.release()
+        await asyncio.wait_for(limiter.acquire(), 1)
+        limiter.release()
+        assert limiter.stats()["timed_out"] == 1
+        assert limiter.stats()["running"] == 0
+
+    @pytest.mark.asyncio
+    async def test_should_not_leak_slots_when_waiter_is_cancelled(self):
+        """待っている呼び出しがキャンセルされても枠が減らないこと"""
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_waiting=10, wait_timeout=0)
+        await limiter.acquire()
+        waiter = asyncio.create_task(limiter.acquire())
+        await asyncio.sleep(0.01)
+
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        limiter.release()
+
+        assert limiter.stats()["running"] == 0
+        assert limiter.stats()["waiting"] == 0
+
+    def test_should_share_slots_across_event_loops(self):
+        """別スレッドのイベントループからの呼び出しも同じ枠を使うこと"""
+        limiter = ConcurrencyLimiter(max_concurrency=2, max_waiting=100, wait_timeout=0)
+        running = peak = 0
+        lock = threading.Lock()
+
+        async def call():
+            nonlocal running, peak
+            async with limiter:
+                with lock:
+                    running += 1
+                    peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                with lock:
+                    running -= 1
+
+        async def worker():
+            await asyncio.gather(*(call() for _ in range(5)))
+
+        threads = [threading.Thread(target=asyncio.run, args=(worker(),)) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+        assert limiter.stats()["admitted"] == 15
@@ -30,4 +30,13 @@ def test_config_default_values():
     
     assert Config.ZENN_FEED_BASE_URL == "https://zenn.dev/topics"
     assert Config.ZENN_API_BASE_URL == "https://zenn.dev/api"
-    assert Config.CRAWLER_TIMEOUT == 60
\ No newline at end of file
+    assert Config.CRAWLER_TIMEOUT == 60
+
+def test_config_http_pool_settings():
+    """Test that Config has connection pool settings."""
+    from app.config import Config
+
+    assert Config.HTTP_POOL_MAXSIZE >= 1
+    assert Config.HTTP_MAX_CONNECTIONS_PER_HOST >= Config.HTTP_POOL_MAXSIZE
+    assert Config.HTTP_KEEPALIVE_EXPIRY > 0
+    assert "gzip" in Config.HTTP_ACCEPT_ENCODING
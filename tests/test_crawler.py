@@ -2,9 +2,18 @@
 Zenn記事取得機能のテスト - Simplified version
 """
 
+import asyncio
+
+import httpx
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from app.crawler import ZennCrawler
+from unittest.mock import AsyncMock, patch
+from app.crawler import AsyncZennCrawler, ZennCrawler
+from app.models import TRENDING_TOPIC, Article
+from benchmarks.fake_zenn_server import build_feed
+from tests.conftest import failing_transport, feed_transport
+
+
+EMPTY_FEED = b"<rss><channel></channel></rss>"
 
 
 class TestZennCrawler:
@@ -16,10 +25,8 @@ class TestZennCrawler:
 
     def test_should_fetch_articles_from_zenn_feed(self):
         """フィードから記事を取得できること（モックテスト）"""
-        with patch('requests.get') as mock_get:
-            # モックレスポンスを設定
-            mock_response = MagicMock()
-            mock_response.content = """
+        # モックレスポンスを設定
+        content = """
             <?xml version="1.0" encoding="UTF-8"?>
             <rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
                 <channel>
@@ -33,41 +40,35 @@ class TestZennCrawler:
                 </channel>
             </rss>
             """
-            mock_get.return_value = mock_response
-            
-            crawler = ZennCrawler()
-            articles = crawler.fetch_articles_from_feed(
-                "react", max_articles=5
-            )
-            
-            assert isinstance(articles, list)
-            if articles:
-                article = articles[0]
-                assert "title" in article
-                assert "url" in article
-                assert "published_at" in article
-                assert "creator" in article
-                assert "description" in article
-                assert article["creator"] == "hoge"
+
+        crawler = ZennCrawler(transport=feed_transport(content))
+        articles = crawler.fetch_articles_from_feed(
+            "react", max_articles=5
+        )
+
+        assert isinstance(articles, list)
+        assert len(articles) == 1
+        article = articles[0].to_dict()
+        assert "title" in article
+        assert "url" in article
+        assert "published_at" in article
+        assert "creator" in article
+        assert "description" in article
+        assert article["creator"] == "hoge"
 
     def test_should_handle_feed_fetch_error(self):
         """フィード取得エラーを適切に処理すること"""
-        with patch('requests.get') as mock_get:
-            # ネットワークエラーをシミュレート
-            mock_get.side_effect = Exception("Network error")
-            
-            crawler = ZennCrawler()
-            articles = crawler.fetch_articles_from_feed("react")
-            
-            assert isinstance(articles, list)
-            assert len(articles) == 0
+        # ネットワークエラーをシミュレート
+        crawler = ZennCrawler(transport=failing_transport())
+        articles = crawler.fetch_articles_from_feed("react")
+
+        assert isinstance(articles, list)
+        assert len(articles) == 0
 
     def test_should_fetch_trending_articles(self):
         """トレンドフィードから記事を取得できること（モックテスト）"""
-        with patch('requests.get') as mock_get:
-            # モックレスポンスを設定
-            mock_response = MagicMock()
-            mock_response.content = """
+        # モックレスポンスを設定
+        content = """
             <?xml version="1.0" encoding="UTF-8"?>
             <rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
                 <channel>
@@ -81,29 +82,246 @@ class TestZennCrawler:
                 </channel>
             </rss>
             """
-            mock_get.return_value = mock_response
-            
-            crawler = ZennCrawler()
-            articles = crawler.fetch_trending_articles(max_articles=5)
-            
-            assert isinstance(articles, list)
-            if articles:
-                article = articles[0]
-                assert "title" in article
-                assert "url" in article
-                assert "published_at" in article
-                assert "creator" in article
-                assert "description" in article
-                assert article["creator"] == "trending_author"
+
+        crawler = ZennCrawler(transport=feed_transport(content))
+        articles = crawler.fetch_trending_articles(max_articles=5)
+
+        assert isinstance(articles, list)
+        assert len(articles) == 1
+        article = articles[0].to_dict()
+        assert "title" in article
+        assert "url" in article
+        assert "published_at" in article
+        assert "creator" in article
+        assert "description" in article
+        assert article["creator"] == "trending_author"
 
     def test_should_handle_trending_fetch_error(self):
         """トレンドフィード取得エラーを適切に処理すること"""
-        with patch('requests.get') as mock_get:
-            # ネットワークエラーをシミュレート
-            mock_get.side_effect = Exception("Network error")
-            
-            crawler = ZennCrawler()
-            articles = crawler.fetch_trending_articles()
-            
-            assert isinstance(articles, list)
-            assert len(articles) == 0
\ No newline at end of file
+        # ネットワークエラーをシミュレート
+        crawler = ZennCrawler(transport=failing_transport())
+        articles = crawler.fetch_trending_articles()
+
+        assert isinstance(articles, list)
+        assert len(articles) == 0
+
+    def test_should_treat_http_error_status_as_fetch_error(self):
+        """HTTPエラーステータスは空リストとして扱うこと"""
+        crawler = ZennCrawler(transport=feed_transport(b"", status_code=500))
+        assert crawler.fetch_articles_from_feed("react") == []
+
+
+class TestConnectionPooling:
+
+    def test_should_reuse_single_client_across_fetches(self):
+        """複数回の取得で同じ接続プールを使い回すこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=feed_transport(EMPTY_FEED, calls=calls))
+
+        async def fetch_twice():
+            await crawler.fetch_articles_from_feed("react")
+            first = crawler._client()
+            await crawler.fetch_trending_articles()
+            return first, crawler._client()
+
+        first, second = asyncio.run(fetch_twice())
+
+        assert first is second
+        assert len(calls) == 2
+
+    def test_should_configure_pool_from_config(self):
+        """接続プールの設定がConfigに従うこと"""
+        from app.config import Config
+
+        crawler = AsyncZennCrawler()
+
+        async def get_client():
+            return crawler._client()
+
+        client = asyncio.run(get_client())
+        pool = client._transport._pool
+
+        assert pool._max_connections == Config.HTTP_MAX_CONNECTIONS_PER_HOST
+        assert pool._max_keepalive_connections == Config.HTTP_POOL_MAXSIZE
+        assert client.headers["Accept-Encoding"] == Config.HTTP_ACCEPT_ENCODING
+
+    def test_get_crawler_should_return_shared_instance(self):
+        """get_crawlerがプロセス全体で同じインスタンスを返すこと"""
+        from app.crawler import get_async_crawler, get_crawler
+
+        assert get_crawler() is get_crawler()
+        assert get_async_crawler() is get_async_crawler()
+        assert get_crawler().async_crawler is get_async_crawler()
+
+
+class TestAsyncZennCrawler:
+
+    @pytest.mark.asyncio
+    async def test_should_fetch_without_blocking_event_loop(self):
+        """遅いフィードの取得中も他のタスクが進むこと"""
+        async def slow_handler(request):
+            await asyncio.sleep(0.2)
+            return httpx.Response(200, content=EMPTY_FEED)
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(slow_handler))
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker_task = asyncio.create_task(ticker())
+        await crawler.fetch_articles_from_feed("react")
+        ticker_task.cancel()
+
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_should_treat_topic_case_insensitively(self):
+        """大文字小文字の違うトピックは同じフィードとして取得・キャッシュすること"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=feed_transport(EMPTY_FEED, calls=calls))
+
+        await crawler.fetch_articles_from_feed("React")
+        await crawler.fetch_articles_from_feed(" react ")
+
+        assert [request.url.path for request in calls] == ["/topics/react/feed"]
+
+    @pytest.mark.asyncio
+    async def test_should_not_treat_topic_named_trending_as_trending_feed(self):
+        """トピック "trending" のフィードをトレンドの記録や索引と混同しないこと"""
+        crawler = AsyncZennCrawler(transport=feed_transport(build_feed(2, topic="trending")))
+
+        articles = await crawler.fetch_articles_from_feed("trending", 2)
+        await crawler.aclose()
+
+        assert len(articles) == 2
+        assert crawler.trending_history.current() == []
+        assert await crawler.articles_between(TRENDING_TOPIC) == []
+        assert len(await crawler.articles_between("trending")) == 2
+
+    @pytest.mark.asyncio
+    async def test_should_propagate_cancellation(self):
+        """呼び出し元がキャンセルしたら取得も中断すること"""
+        started = asyncio.Event()
+        aborted = asyncio.Event()
+
+        async def hanging_handler(request):
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                aborted.set()
+                raise
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(hanging_handler))
+        task = asyncio.create_task(crawler.fetch_trending_articles())
+        await started.wait()
+        task.cancel()
+
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # 上流へのリクエストそのものが中断されていること
+        await asyncio.wait_for(aborted.wait(), 1)
+
+    def test_sync_wrapper_should_delegate_to_async_crawler(self):
+        """同期APIが非同期クローラーに委譲すること"""
+        async_crawler = AsyncZennCrawler()
+        crawler = ZennCrawler(async_crawler)
+
+        with patch.object(
+            async_crawler, "fetch_articles_from_feed", new=AsyncMock(return_value=[])
+        ) as mock_fetch:
+            assert crawler.fetch_articles_from_feed("react", 3) == []
+            mock_fetch.assert_awaited_once_with("react", 3)
+
+
+class TestFetchMany:
+
+    @staticmethod
+    def article(url, published_at):
+        return Article(title=url, url=url, published_at=published_at)
+
+    @pytest.mark.asyncio
+    async def test_should_merge_and_dedupe_by_url_with_provenance(self):
+        """複数トピックに出る記事をURLでまとめ、掲載トピックを持たせること"""
+        feeds = {
+            "react": [
+                self.article("https://zenn.dev/a", "Mon, 14 Jul 2025 08:00:00 GMT"),
+                self.article("https://zenn.dev/shared", "Tue, 15 Jul 2025 08:00:00 GMT"),
+            ],
+            "nextjs": [
+                self.article("https://zenn.dev/shared", "Tue, 15 Jul 2025 08:00:00 GMT"),
+                self.article("https://zenn.dev/b", "Wed, 16 Jul 2025 08:00:00 GMT"),
+            ],
+        }
+        crawler = AsyncZennCrawler()
+
+        async def fetch(topic, max_articles=None):
+            return feeds[topic]
+
+        with patch.object(crawler, "fetch_articles_from_feed", side_effect=fetch), \
+                patch.object(crawler, "fetch_trending_articles",
+                             new=AsyncMock(return_value=[self.article("https://zenn.dev/a", "Mon, 14 Jul 2025 08:00:00 GMT")])):
+            articles = await crawler.fetch_many(["react", "nextjs", "react"], include_trending=True)
+
+        assert [a.url for a in articles] == [
+            "https://zenn.dev/b",
+            "https://zenn.dev/shared",
+            "https://zenn.dev/a",
+        ]
+        assert articles[1].topics == ("react", "nextjs")
+        assert articles[2].topics == ("react", TRENDING_TOPIC)
+
+    @pytest.mark.asyncio
+    async def test_should_fetch_concurrently_within_limit(self):
+        """上限数までフィードを同時に取得すること"""
+        running = 0
+        peak = 0
+
+        async def fetch(topic, max_articles=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.05)
+            running -= 1
+            return []
+
+        crawler = AsyncZennCrawler()
+        with patch.object(crawler, "fetch_articles_from_feed", side_effect=fetch):
+            await crawler.fetch_many([f"topic{i}" for i in range(10)], max_concurrency=4)
+
+        assert peak == 4
+
+    def test_sync_fetch_many_should_place_unknown_dates_last(self):
+        """投稿日が不明な記事は最後に並ぶこと"""
+        crawler = ZennCrawler()
+
+        async def fetch(topic, max_articles=None):
+            return [
+                TestFetchMany.article(f"https://zenn.dev/{topic}/x", ""),
+                TestFetchMany.article(f"https://zenn.dev/{topic}/y", "Mon, 14 Jul 2025 08:00:00 GMT"),
+            ]
+
+        with patch.object(crawler.async_crawler, "fetch_articles_from_feed", side_effect=fetch):
+            articles = crawler.fetch_many(["go"])
+
+        assert articles[-1].url == "https://zenn.dev/go/x"
+
+
+class TestRefresh:
+
+    @pytest.mark.asyncio
+    async def test_refresh_topic_should_bypass_fresh_cache(self):
+        """先読み用の再取得はキャッシュが新しくてもフィードを取り直すこと"""
+        crawler = AsyncZennCrawler()
+        fetch = AsyncMock(return_value=[Article(title="t", url="u")])
+
+        with patch.object(crawler, "_fetch_feed", new=fetch):
+            await crawler.fetch_articles_from_feed("react")
+            await crawler.refresh_topic("react")
+            await crawler.fetch_articles_from_feed("react")
+
+        assert fetch.await_count == 2
@@ -0,0 +1,102 @@
+"""
+差分モードの配信済み記事の管理のテスト
+"""
+
+from app.delta import BloomFilter, DeltaTracker, SeenSet, _digest
+from app.models import Article
+
+
+def article(i: int) -> Article:
+    return Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}")
+
+
+class TestBloomFilter:
+
+    def test_should_remember_added_digests(self):
+        """追加したハッシュは必ず含まれると判定すること"""
+        bloom = BloomFilter(1000, 0.01)
+        digests = [_digest(f"https://zenn.dev/a/articles/{i}") for i in range(1000)]
+        for digest in digests:
+            bloom.add(digest)
+
+        assert all(digest in bloom for digest in digests)
+
+    def test_should_keep_false_positive_rate_near_target(self):
+        """容量まで入れても誤判定率が目標の数倍に収まること"""
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(_digest(f"https://zenn.dev/a/articles/{i}"))
+
+        false_positives = sum(
+            _digest(f"https://zenn.dev/b/articles/{i}") in bloom for i in range(10000)
+        )
+        assert false_positives < 300
+
+
+class TestSeenSet:
+
+    def test_should_spill_old_urls_into_bloom_filter(self):
+        """上限を超えた古いURLもBloomフィルタで覚えていること"""
+        seen = SeenSet(max_entries=10, bloom_capacity=100)
+        for i in range(50):
+            seen.add(article(i).url)
+
+        assert all(article(i).url in seen for i in range(50))
+        assert len(seen) == 50
+        assert seen.bloom_bytes() > 0
+
+    def test_should_forget_overflow_without_bloom_filter(self):
+        """Bloomフィルタを無効にすると上限を超えた古いURLは忘れること"""
+        seen = SeenSet(max_entries=10, bloom_capacity=0)
+        for i in range(20):
+            seen.add(article(i).url)
+
+        assert article(0).url not in seen
+        assert article(19).url in seen
+        assert len(seen) == 10
+
+
+class TestDeltaTracker:
+
+    def test_should_track_cursors_and_topics_separately(self):
+        """カーソルとトピックの組ごとに配信済みを管理すること"""
+        tracker = DeltaTracker()
+        tracker.mark_delivered("a", "react", [article(1), article(2)])
+
+        assert tracker.unseen("a", "react", [article(1), article(3)]) == [article(3)]
+        assert tracker.unseen("a", "React", [article(1)]) == []
+        assert tracker.unseen("a", "vue", [article(1)]) == [article(1)]
+        assert tracker.unseen("b", "react", [article(1)]) == [article(1)]
+        assert tracker.stats()["suppressed"] == 2
+
+    def test_should_evict_least_recently_used_scopes(self):
+        """組の数が上限を超えたら最も使われていない組を忘れること"""
+        tracker = DeltaTracker(max_scopes=2)
+        tracker.mark_delivered("a", "react", [article(1)])
+        tracker.mark_delivered("b", "react", [article(1)])
+        tracker.unseen("a", "react", [])
+        tracker.mark_delivered("c", "react", [article(1)])
+
+        assert tracker.unseen("a", "react", [article(1)]) == []
+        assert tracker.unseen("b", "react", [article(1)]) == [article(1)]
+
+    def test_should_track_articles_under_each_of_their_topics(self):
+        """記事ごとのトピックで配信済みを覚え、いずれかで配信済みなら除くこと"""
+        tracker = DeltaTracker()
+        tagged = Article(title="記事1", url=article(1).url, topics=("react", "vue"))
+        scopes = lambda a: a.topics  # noqa: E731
+
+        tracker.mark_delivered("a", scopes, [tagged])
+
+        assert tracker.unseen("a", "vue", [article(1)]) == []
+        assert tracker.unseen("a", "react", [article(1)]) == []
+        assert tracker.unseen("a", "go", [article(1)]) == [article(1)]
+
+    def test_should_not_remember_articles_without_url(self):
+        """URLのない記事は配信済みにしないこと"""
+        tracker = DeltaTracker()
+        untitled = Article(title="URLなし", url="")
+
+        tracker.mark_delivered("a", "react", [untitled])
+
+        assert tracker.unseen("a", "react", [untitled]) == [untitled]
@@ -0,0 +1,122 @@
+"""
+条件付きGET用フィードキャッシュのテスト
+"""
+
+from unittest.mock import patch
+
+import httpx
+
+from app.crawler import ZennCrawler
+from app.feed_cache import FeedCache
+from tests.conftest import sequence_transport
+
+FEED_XML = b"""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:dc="http://purl.org/dc/elements/1.1/">
+    <channel>
+        <item>
+            <title>Article 1</title>
+            <link>https://zenn.dev/a/articles/1</link>
+            <pubDate>Mon, 14 Jul 2025 08:34:28 GMT</pubDate>
+            <dc:creator>a</dc:creator>
+            <description>first</description>
+        </item>
+        <item>
+            <title>Article 2</title>
+            <link>https://zenn.dev/b/articles/2</link>
+            <pubDate>Sun, 13 Jul 2025 08:34:28 GMT</pubDate>
+            <dc:creator>b</dc:creator>
+            <description>second</description>
+        </item>
+    </channel>
+</rss>
+"""
+
+
+def make_response(status_code=200, content=b"", headers=None):
+    return httpx.Response(status_code, content=content, headers=headers)
+
+
+class TestFeedCache:
+
+    def test_should_return_no_headers_for_unknown_url(self):
+        """未取得のURLには条件付きヘッダーを付けないこと"""
+        cache = FeedCache()
+        assert cache.conditional_headers("https://zenn.dev/feed") == {}
+
+    def test_should_build_conditional_headers_from_validators(self):
+        """保存したETag/Last-Modifiedから条件付きヘッダーを作ること"""
+        cache = FeedCache()
+        cache.store(
+            "https://zenn.dev/feed", b"body", '"abc"', "Mon, 14 Jul 2025 08:34:28 GMT", [], 10
+        )
+
+        assert cache.conditional_headers("https://zenn.dev/feed") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Mon, 14 Jul 2025 08:34:28 GMT",
+        }
+
+    def test_should_skip_responses_without_validators(self):
+        """検証子のないレスポンスは保存しないこと"""
+        cache = FeedCache()
+        cache.store("https://zenn.dev/feed", b"body", None, None, [], 10)
+        assert cache.get("https://zenn.dev/feed") is None
+
+    def test_should_evict_least_recently_used_entry(self):
+        """上限を超えたら最も古く使われたエントリを追い出すこと"""
+        cache = FeedCache(max_entries=2)
+        cache.store("a", b"", '"a"', None, [], 10)
+        cache.store("b", b"", '"b"', None, [], 10)
+        cache.get("a")
+        cache.store("c", b"", '"c"', None, [], 10)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert len(cache) == 2
+
+
+class TestConditionalFetch:
+
+    def test_should_serve_cached_articles_on_not_modified(self):
+        """304の場合はパースせずにキャッシュ済みの記事を返すこと"""
+        calls = []
+        crawler = ZennCrawler(transport=sequence_transport([
+            make_response(200, FEED_XML, {"ETag": '"v1"'}),
+            make_response(304),
+        ], calls))
+        first = crawler.fetch_articles_from_feed("react", max_articles=5)
+        crawler.article_cache.clear()
+
+        with patch.object(crawler.async_crawler, "_parse_feed") as mock_parse:
+            second = crawler.fetch_articles_from_feed("react", max_articles=5)
+            mock_parse.assert_not_called()
+
+        assert second == first
+        assert len(second) == 2
+        assert calls[1].headers["If-None-Match"] == '"v1"'
+
+    def test_should_reparse_cached_body_when_more_articles_requested(self):
+        """キャッシュ済みの件数で足りなければ保存済みボディを再パースすること"""
+        calls = []
+        crawler = ZennCrawler(transport=sequence_transport([
+            make_response(200, FEED_XML, {"Last-Modified": "Mon, 14 Jul 2025 08:34:28 GMT"}),
+            make_response(304),
+        ], calls))
+        first = crawler.fetch_trending_articles(max_articles=1)
+        crawler.article_cache.clear()
+        second = crawler.fetch_trending_articles(max_articles=2)
+
+        assert len(first) == 1
+        assert [a.title for a in second] == ["Article 1", "Article 2"]
+        assert calls[1].headers["If-Modified-Since"] == "Mon, 14 Jul 2025 08:34:28 GMT"
+
+    def test_should_refetch_when_entry_missing_on_not_modified(self):
+        """304でもキャッシュが無ければ無条件で取り直すこと"""
+        calls = []
+        crawler = ZennCrawler(transport=sequence_transport([
+            make_response(304),
+            make_response(200, FEED_XML),
+        ], calls))
+        articles = crawler.fetch_articles_from_feed("react")
+
+        assert len(articles) == 2
+        assert len(calls) == 2
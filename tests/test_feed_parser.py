@@ -0,0 +1,94 @@
+"""
+ストリーミングフィードパーサーのテスト
+"""
+
+from app.feed_parser import DC_CREATOR, iter_feed_items, parse_item, strip_html
+from benchmarks.fake_zenn_server import build_feed
+
+
+class TestIterFeedItems:
+
+    def test_should_yield_items_in_order(self):
+        """アイテムを読み込み順に返すこと"""
+        titles = [item.findtext("title") for item in iter_feed_items(build_feed(3, "go"), 10)]
+        assert titles == ["go の記事 0", "go の記事 1", "go の記事 2"]
+
+    def test_should_stop_after_max_items(self):
+        """指定件数に達したら読み込みを打ち切ること"""
+        items = list(iter_feed_items(build_feed(1000), 5))
+        assert len(items) == 5
+
+    def test_should_read_namespaced_creator(self):
+        """dc:creator を名前空間付きで読めること"""
+        item = next(iter_feed_items(build_feed(1), 1))
+        assert item.findtext(DC_CREATOR) == "author0"
+
+    def test_should_release_consumed_items(self):
+        """次のアイテムに進むと処理済みのアイテムを解放すること"""
+        seen = []
+        for item in iter_feed_items(build_feed(50), 50):
+            seen.append(item)
+            # チャンネル直下に残るのは処理中のアイテムと未処理分のみ
+            assert item.getparent().index(item) <= 1
+        assert all(len(item) == 0 for item in seen)
+
+    def test_should_tolerate_leading_whitespace_and_str_input(self):
+        """XML宣言前の空白や文字列入力を受け付けること"""
+        content = "\n   " + build_feed(2).decode("utf-8")
+        assert len(list(iter_feed_items(content, 10))) == 2
+
+    def test_should_return_nothing_for_empty_or_broken_body(self):
+        """空や壊れたボディでは何も返さないこと"""
+        assert list(iter_feed_items(b"", 10)) == []
+        assert list(iter_feed_items(b"not xml <<", 10)) == []
+        assert list(iter_feed_items(build_feed(2), 0)) == []
+
+
+class TestParseItem:
+
+    def test_should_extract_all_fields(self):
+        """1件のアイテムから全フィールドを取り出すこと"""
+        item = next(iter_feed_items(build_feed(1, "rust"), 1))
+        article = parse_item(item)
+
+        assert article.title == "rust の記事 0"
+        assert article.url == "https://zenn.dev/author0/articles/rust-00000"
+        assert article.published_at == "Mon, 14 Jul 2025 08:34:28 GMT"
+        assert article.creator == "author0"
+        assert article.description == "これは合成された記事の概要です。rust に関する説明 0"
+
+    def test_should_default_missing_fields_to_empty(self):
+        """欠けている要素は空文字になること"""
+        content = b"<rss><channel><item><title>only title</title></item></channel></rss>"
+        article = parse_item(next(iter_feed_items(content, 1)))
+
+        assert article.title == "only title"
+        assert article.url == ""
+        assert article.creator == ""
+
+    def test_should_cap_description_length(self):
+        """概要を指定文字数で切り詰めること"""
+        item = next(iter_feed_items(build_feed(1), 1))
+        article = parse_item(item, max_description_length=10)
+
+        assert len(article.description) == 10
+        assert article.description.endswith("…")
+
+
+class TestStripHtml:
+
+    def test_should_remove_tags_and_decode_entities(self):
+        """タグを除き文字参照を復元すること"""
+        assert strip_html("<p>A &amp; <b>B</b></p>") == "A & B"
+
+    def test_should_keep_japanese_text_contiguous(self):
+        """インライン要素の前後に空白を挟まないこと"""
+        assert strip_html("これは<strong>太字</strong>です") == "これは太字です"
+
+    def test_should_separate_block_elements(self):
+        """段落や改行の境目は空白にすること"""
+        assert strip_html("<p>first</p><p>second<br>third</p>") == "first second third"
+
+    def test_should_return_plain_text_unchanged(self):
+        """タグのない文字列はそのまま返すこと"""
+        assert strip_html("plain text") == "plain text"
@@ -35,6 +35,10 @@ def test_setup_logging_creates_logger():
     logger = get_logger()
     assert logger is not None
 
+    # The log file is created lazily, on the first write
+    logger.info(operation="test", message="Create log file")
+    logger.flush(timeout=5)
+
     # Check that logs directory exists (created automatically by vibelogger)
     log_dir = Path("logs/zenn_mcp")
     assert log_dir.exists()
@@ -54,3 +58,88 @@ def test_logger_can_write_message():
 
     # Logger should be created without errors
     assert logger is not None
+
+
+def test_vibelogger_private_api_used_by_gated_logger_exists():
+    """Test that the pinned vibelogger still has the private API GatedLogger._write relies on."""
+    import dataclasses
+    import inspect
+    from vibelogger.logger import LogEntry, LogLevel, VibeLogger
+
+    create = inspect.signature(VibeLogger._create_log_entry).parameters
+    assert {"level", "operation", "message", "context", "human_note", "ai_todo"} <= set(create)
+    assert list(inspect.signature(VibeLogger._process_entry).parameters) == ["self", "entry"]
+    fields = {field.name for field in dataclasses.fields(LogEntry)}
+    assert {"timestamp", "source", "stack_trace"} <= fields
+    assert {level.value for level in LogLevel} >= {"DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"}
+
+
+def make_gated_logger(cls, **kwargs):
+    """Create a gated logger backed by an in-memory vibelogger."""
+    from vibelogger.logger import VibeLogger
+
+    memory_logger = VibeLogger(auto_save=False)
+    return memory_logger, cls(lambda: memory_logger, **kwargs)
+
+
+def test_queued_logger_writes_on_background_thread():
+    """Test that queued records are written by the writer thread with caller info."""
+    from app.logging_config import QueuedLogger
+
+    memory_logger, logger = make_gated_logger(QueuedLogger)
+    logger.info(operation="test", message="Queued message", context={"n": 1})
+    logger.flush(timeout=5)
+
+    assert len(memory_logger.logs) == 1
+    entry = memory_logger.logs[0]
+    assert entry.message == "Queued message"
+    assert entry.context == {"n": 1}
+    assert entry.source.startswith("test_logging.py:")
+    logger.close()
+
+
+def test_queued_logger_counts_drops_when_queue_is_full():
+    """Test that records are dropped and counted instead of blocking."""
+    import threading
+    from app.logging_config import QueuedLogger
+
+    memory_logger, logger = make_gated_logger(QueuedLogger, queue_size=1)
+    release = threading.Event()
+    original = memory_logger._process_entry
+    memory_logger._process_entry = lambda entry: (release.wait(5), original(entry))
+
+    for i in range(5):
+        logger.info(operation="test", message=f"message {i}")
+
+    assert logger.stats()["dropped"] >= 3
+    release.set()
+    logger.flush(timeout=5)
+    logger.close()
+
+
+def test_gated_logger_filters_below_min_level():
+    """Test that records below the minimum level are not written."""
+    from app.logging_config import GatedLogger
+
+    memory_logger, logger = make_gated_logger(GatedLogger, min_level="WARNING")
+    logger.info(operation="test", message="ignored")
+    logger.warning(operation="test", message="kept")
+
+    assert [entry.message for entry in memory_logger.logs] == ["kept"]
+    assert logger.stats()["filtered"] == 1
+
+
+def test_gated_logger_samples_repetitive_warnings():
+    """Test that repeated warnings for one operation are sampled but errors are not."""
+    from app.logging_config import GatedLogger
+
+    memory_logger, logger = make_gated_logger(
+        GatedLogger, sample_window=60, sample_burst=2, sample_every=5, clock=lambda: 0.0
+    )
+    for _ in range(12):
+        logger.warning(operation="parse_feed_item", message="bad item")
+    logger.error(operation="parse_feed_item", message="still logged")
+
+    # 2 burst records, then the 5th and 10th record after the burst, then the error
+    assert len(memory_logger.logs) == 5
+    assert logger.stats()["sampled"] == 8
@@ -0,0 +1,44 @@
+"""
+キャッシュ共通のLRUの辞書のテスト
+"""
+
+from app.lru import LRU
+
+
+class TestLRU:
+
+    def test_should_evict_least_recently_used(self):
+        """件数の上限を超えたら最も使われていないものから追い出すこと"""
+        lru = LRU(max_entries=2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        assert lru.get("a") == 1
+        lru.put("c", 3)
+
+        assert "b" not in lru
+        assert lru.get("b") is None
+        assert lru.stats() == {"hits": 1, "misses": 1, "evictions": 1, "entries": 2}
+
+    def test_should_evict_by_weight_but_keep_newest(self):
+        """重みの上限を超えたら追い出し、最新の1件は重くても残すこと"""
+        lru = LRU(max_entries=10, max_weight=5, weigh=len)
+        lru.put("a", "xx")
+        lru.put("b", "yyy")
+        lru.put("c", "z")
+        assert "a" not in lru
+        assert lru.weight == 4
+
+        lru.put("d", "w" * 10)
+        assert list(lru._entries) == ["d"]
+        assert lru.weight == 10
+
+    def test_should_peek_without_changing_order_or_counters(self):
+        """peek は順序もカウンタも変えないこと"""
+        lru = LRU(max_entries=2)
+        lru.put("a", 1)
+        lru.put("b", 2)
+        assert lru.peek("a") == 1
+        lru.put("c", 3)
+
+        assert "a" not in lru
+        assert lru.stats()["hits"] == 0
@@ -2,10 +2,18 @@
 FastMCP実装のメインモジュールテスト
 """
 
+import asyncio
+
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import AsyncMock, patch, Mock
 
-from app.main import mcp, search_zenn_articles
+from app.main import (
+    get_trending_articles,
+    mcp,
+    search_zenn_articles,
+    search_zenn_articles_batch,
+)
+from app.models import Article
 
 
 class TestMainModule:
@@ -21,72 +29,458 @@ class TestMainModule:
         assert mcp is not None
         assert mcp.name == "zenn-mcp"
     
+    def test_import_should_not_load_heavy_modules(self, tmp_path):
+        """起動時にクローラー依存のモジュールとログファイルを読み込まないこと"""
+        import json
+        import subprocess
+        import sys
+        from pathlib import Path
+
+        root = Path(__file__).resolve().parent.parent
+        code = (
+            "import json, sys, app.main; "
+            "print(json.dumps([m for m in ('app.crawler', 'lxml', 'sqlite3', 'vibelogger') "
+            "if m in sys.modules]))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=tmp_path, env={"PYTHONPATH": str(root)},
+            capture_output=True, text=True, check=True,
+        )
+
+        assert json.loads(result.stdout) == []
+        assert not (tmp_path / "logs").exists()
+
     def test_search_zenn_articles_function_exists(self):
         """search_zenn_articles関数が存在することを確認"""
         assert callable(search_zenn_articles)
     
-    def test_search_zenn_articles_success(self):
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_success(self):
         """search_zenn_articles関数の正常動作テスト"""
         mock_articles = [
-            {
-                "title": "React基礎講座",
-                "published_at": "2024-01-15",
-                "description": "Reactの基本的な使い方を学ぼう",
-                "url": "https://zenn.dev/sample/articles/react-basics"
-            },
-            {
-                "title": "React Hooks入門",
-                "published_at": "2024-01-14", 
-                "description": "React Hooksの活用方法",
-                "url": "https://zenn.dev/sample/articles/react-hooks"
-            }
+            Article(
+                title="React基礎講座",
+                published_at="2024-01-15",
+                description="Reactの基本的な使い方を学ぼう",
+                url="https://zenn.dev/sample/articles/react-basics"
+            ),
+            Article(
+                title="React Hooks入門",
+                published_at="2024-01-14",
+                description="React Hooksの活用方法",
+                url="https://zenn.dev/sample/articles/react-hooks"
+            )
         ]
         
-        with patch('app.main.ZennCrawler') as mock_crawler:
+        with patch('app.main.get_async_crawler') as mock_crawler:
             mock_crawler_instance = mock_crawler.return_value
-            mock_crawler_instance.fetch_articles_from_feed.return_value = mock_articles
+            mock_crawler_instance.fetch_articles_from_feed = AsyncMock(return_value=mock_articles)
             
-            result = search_zenn_articles("React", 5)
+            result = await search_zenn_articles("React", 5)
             
             assert "トピック: React" in result
             assert "取得記事数: 2件" in result
             assert "React基礎講座" in result
             assert "React Hooks入門" in result
     
-    def test_search_zenn_articles_no_articles(self):
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_no_articles(self):
         """記事が見つからない場合のテスト"""
-        with patch('app.main.ZennCrawler') as mock_crawler:
+        with patch('app.main.get_async_crawler') as mock_crawler:
             mock_crawler_instance = mock_crawler.return_value
-            mock_crawler_instance.fetch_articles_from_feed.return_value = []
+            mock_crawler_instance.fetch_articles_from_feed = AsyncMock(return_value=[])
             
-            result = search_zenn_articles("NonExistentTopic", 5)
+            result = await search_zenn_articles("NonExistentTopic", 5)
             
             assert "記事が見つかりませんでした" in result
             assert "NonExistentTopic" in result
     
-    def test_search_zenn_articles_error_handling(self):
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_error_handling(self):
         """エラーハンドリングのテスト"""
-        with patch('app.main.ZennCrawler') as mock_crawler:
+        with patch('app.main.get_async_crawler') as mock_crawler:
             mock_crawler_instance = mock_crawler.return_value
-            mock_crawler_instance.fetch_articles_from_feed.side_effect = Exception("Network error")
+            mock_crawler_instance.fetch_articles_from_feed = AsyncMock(side_effect=Exception("Network error"))
             
-            result = search_zenn_articles("React", 5)
+            result = await search_zenn_articles("React", 5)
             
             assert "エラーが発生しました" in result
             assert "Network error" in result
     
-    def test_search_zenn_articles_max_articles_validation(self):
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_max_articles_validation(self):
         """max_articlesの値検証テスト"""
-        mock_articles = [{"title": "Test Article", "published_at": "2024-01-01", "description": "Test", "url": "http://test.com"}]
+        mock_articles = [Article(title="Test Article", published_at="2024-01-01", description="Test", url="http://test.com")]
         
-        with patch('app.main.ZennCrawler') as mock_crawler:
+        with patch('app.main.get_async_crawler') as mock_crawler:
             mock_crawler_instance = mock_crawler.return_value
-            mock_crawler_instance.fetch_articles_from_feed.return_value = mock_articles
+            mock_crawler_instance.fetch_articles_from_feed = AsyncMock(return_value=mock_articles)
             
             # 上限を超えた値をテスト
-            result = search_zenn_articles("React", 15)
-            mock_crawler_instance.fetch_articles_from_feed.assert_called_with(topic="React", max_articles=10)
+            result = await search_zenn_articles("React", 15)
+            mock_crawler_instance.fetch_articles_from_feed.assert_awaited_with(topic="React", max_articles=10)
             
             # 下限を下回った値をテスト  
-            result = search_zenn_articles("React", -1)
-            mock_crawler_instance.fetch_articles_from_feed.assert_called_with(topic="React", max_articles=10)
\ No newline at end of file
+            result = await search_zenn_articles("React", -1)
+            mock_crawler_instance.fetch_articles_from_feed.assert_awaited_with(topic="React", max_articles=10)
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_cancellation(self):
+        """クライアントが中断したらツール呼び出しもキャンセルされること"""
+        started = asyncio.Event()
+
+        async def hang(**kwargs):
+            started.set()
+            await asyncio.sleep(60)
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_articles_from_feed = AsyncMock(side_effect=hang)
+
+            task = asyncio.create_task(search_zenn_articles("React", 5))
+            await started.wait()
+            task.cancel()
+
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+    @pytest.mark.asyncio
+    async def test_get_trending_articles_success(self):
+        """get_trending_articles関数の正常動作テスト"""
+        mock_articles = [Article(title="Trend", published_at="2024-01-01", description="d", url="http://t")]
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_trending_articles = AsyncMock(return_value=mock_articles)
+
+            result = await get_trending_articles(5)
+
+            assert "Zennトレンド記事" in result
+            assert "Trend" in result
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_batch_success(self):
+        """一括検索で掲載トピック付きの結果を返すこと"""
+        mock_articles = [
+            Article(title="共有記事", published_at="2024-01-02", description="d", url="http://a", topics=("react", "nextjs")),
+        ]
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_many = AsyncMock(return_value=mock_articles)
+
+            result = await search_zenn_articles_batch(["react", "nextjs"], 20, True)
+
+            mock_crawler.return_value.fetch_many.assert_awaited_once_with(
+                ["react", "nextjs"], max_articles=10, include_trending=True
+            )
+            assert "共有記事" in result
+            assert "**トピック**: react, nextjs" in result
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_batch_rejects_too_many_topics(self):
+        """トピック数が上限を超えたら取得せずに案内を返すこと"""
+        from app.config import Config
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            topics = [f"t{i}" for i in range(Config.BATCH_MAX_TOPICS + 1)]
+            result = await search_zenn_articles_batch(topics)
+
+            assert "までです" in result
+            mock_crawler.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_get_stored_articles_success(self):
+        """蓄積記事をネットワークに出ずに返すこと"""
+        from app.main import get_stored_articles
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.load_stored_articles = AsyncMock(
+                return_value=[Article(title="蓄積記事A", url="http://a")]
+            )
+
+            result = await get_stored_articles("react", 500)
+
+            mock_crawler.return_value.load_stored_articles.assert_awaited_once_with("react", 200, None, None)
+            assert "蓄積記事: react" in result
+            assert "蓄積記事A" in result
+
+    @pytest.mark.asyncio
+    async def test_get_prefetch_status_lists_requested_topics(self):
+        """要求したトピックが先読み状況に表示されること"""
+        from app.main import get_prefetch_status
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_articles_from_feed = AsyncMock(return_value=[])
+            await search_zenn_articles("PrefetchTopic", 5)
+
+        result = await get_prefetch_status()
+
+        assert "先読みスケジューラー" in result
+        assert "prefetchtopic" in result
+
+    @pytest.mark.asyncio
+    async def test_server_stats_reports_tool_timings(self):
+        """ツール呼び出しの計測値がサーバー統計に表示されること"""
+        from app.main import server_stats
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_trending_articles = AsyncMock(
+                return_value=[Article(title="統計記事", url="https://zenn.dev/stats")]
+            )
+            await get_trending_articles(5)
+
+        result = await server_stats()
+
+        assert "サーバー統計" in result
+        assert "get_trending_articles" in result
+        assert "format" in result
+
+    @pytest.mark.asyncio
+    async def test_search_indexed_articles_success(self):
+        """全文検索の結果を関連度順のまま整形すること"""
+        from app.main import search_indexed_articles
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.search_articles = AsyncMock(return_value=[
+                Article(title="非同期処理入門", url="https://zenn.dev/a/1"),
+            ])
+            result = await search_indexed_articles("非同期", 100)
+
+            mock_crawler.return_value.search_articles.assert_awaited_once_with("非同期", 50, None, None)
+            assert "# 検索: 非同期" in result
+            assert "非同期処理入門" in result
+
+    @pytest.mark.asyncio
+    async def test_search_indexed_articles_requires_query(self):
+        """空の検索語を受け付けないこと"""
+        from app.main import search_indexed_articles
+
+        assert "検索キーワード" in await search_indexed_articles("  ")
+
+    @pytest.mark.asyncio
+    async def test_get_article_bodies_truncates_to_budget(self):
+        """本文を指定文字数で切り詰め、取得できない記事はその旨を返すこと"""
+        from app.main import get_article_bodies
+        from app.models import ArticleBody
+
+        urls = ["https://zenn.dev/u/articles/a", "https://zenn.dev/u/books/b"]
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_article_bodies = AsyncMock(return_value=[
+                ArticleBody(url=urls[0], title="本文記事", text="あ" * 100, updated_at="v1"),
+                None,
+            ])
+            result = await get_article_bodies(urls, 10)
+
+            assert "本文記事" in result
+            assert "あ" * 9 + "…" in result
+            assert "あ" * 10 not in result
+            assert "本文を取得できませんでした" in result
+
+    @pytest.mark.asyncio
+    async def test_backfill_topic_passes_date_cutoff(self):
+        """日付をUTCのエポック秒にして取り込みに渡すこと"""
+        from app.main import backfill_topic
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.backfill_topic = AsyncMock(return_value={
+                "topic": "rust", "articles": 120, "pages": 3, "oldest": "Mon, 14 Jul 2025 08:34:28 GMT",
+            })
+            result = await backfill_topic("rust", 5000, "2025-07-01")
+
+            mock_crawler.return_value.backfill_topic.assert_awaited_once_with("rust", 1000, 1751328000.0)
+            assert "120件" in result
+
+    @pytest.mark.asyncio
+    async def test_backfill_topic_uses_default_for_non_positive_count(self):
+        """0以下の件数は上限ではなく既定の件数で取り込むこと"""
+        from app.main import backfill_topic, get_stored_articles, search_indexed_articles
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            crawler = mock_crawler.return_value
+            crawler.backfill_topic = AsyncMock(return_value={
+                "topic": "rust", "articles": 0, "pages": 0, "oldest": None,
+            })
+            crawler.load_stored_articles = AsyncMock(return_value=[])
+            crawler.search_articles = AsyncMock(return_value=[])
+            await backfill_topic("rust", 0)
+            await get_stored_articles("rust", -1)
+            await search_indexed_articles("rust", 0)
+
+            crawler.backfill_topic.assert_awaited_once_with("rust", 100, None)
+            crawler.load_stored_articles.assert_awaited_once_with("rust", 50, None, None)
+            crawler.search_articles.assert_awaited_once_with("rust", 10, None, None)
+
+    @pytest.mark.asyncio
+    async def test_backfill_topic_rejects_invalid_date(self):
+        """解釈できない日付はエラーメッセージを返すこと"""
+        from app.main import backfill_topic
+
+        assert "解釈できません" in await backfill_topic("rust", 10, "yesterday")
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_compact_format(self):
+        """出力形式と文字数上限をツールから指定できること"""
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_articles_from_feed = AsyncMock(return_value=[
+                Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}",
+                        description="長い概要です。" * 30)
+                for i in range(5)
+            ])
+            result = await search_zenn_articles("react", 5, "compact", 400)
+
+            assert result.startswith("# トピック: react (5件)")
+            assert len(result) <= 400
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_delta_returns_only_new_articles(self):
+        """差分モードでは前回返した記事を除き、カーソルで続きを取れること"""
+        import json
+
+        def feed(ids):
+            return [Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}") for i in ids]
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            fetch = mock_crawler.return_value.fetch_articles_from_feed = AsyncMock()
+            fetch.return_value = feed([1, 2, 3])
+            first = json.loads(await search_zenn_articles("react", 10, "json", delta=True))
+            fetch.return_value = feed([4, 1, 2])
+            second = json.loads(
+                await search_zenn_articles("react", 10, "json", cursor=first["cursor"])
+            )
+            third = json.loads(
+                await search_zenn_articles("react", 10, "json", cursor=first["cursor"])
+            )
+            other = json.loads(await search_zenn_articles("react", 10, "json", delta=True))
+
+        assert first["count"] == 3
+        assert [a["title"] for a in second["articles"]] == ["記事4"]
+        assert second["cursor"] == first["cursor"]
+        assert third["count"] == 0
+        assert other["count"] == 3 and other["cursor"] != first["cursor"]
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_delta_keeps_omitted_articles_for_next_call(self):
+        """上限で省いた記事は配信済みにせず、次の呼び出しで返すこと"""
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_articles_from_feed = AsyncMock(return_value=[
+                Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}",
+                        description="概要" * 100)
+                for i in range(5)
+            ])
+            first = await search_zenn_articles("react", 5, "compact", 150, delta=True)
+            cursor = first.rsplit("cursor: ", 1)[1]
+            second = await search_zenn_articles("react", 5, "compact", cursor=cursor)
+
+        assert "…ほか" in first
+        assert "記事0" in first and "記事0" not in second
+        assert "記事4" in second
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_delta_marks_only_rendered_articles(self):
+        """URLが他の記事のURLを含んでいても、省いた記事を配信済みにしないこと"""
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.fetch_articles_from_feed = AsyncMock(return_value=[
+                Article(title="記事A", url="https://zenn.dev/u/articles/abc2",
+                        description="概要" * 100),
+                Article(title="記事B", url="https://zenn.dev/u/articles/abc",
+                        description="概要" * 100),
+                Article(title="URLなし", url=""),
+            ])
+            first = await search_zenn_articles("react", 5, "compact", 150, delta=True)
+            cursor = first.rsplit("cursor: ", 1)[1]
+            second = await search_zenn_articles("react", 5, "compact", cursor=cursor)
+
+        assert "記事A" in first and "記事B" not in first
+        assert "記事A" not in second and "記事B" in second
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_batch_delta_tracks_each_topic(self):
+        """一括取得の差分はトピックごとに覚え、組み合わせを変えても返し直さないこと"""
+        import json
+
+        def tagged(ids, *topics):
+            return [
+                Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}", topics=topics)
+                for i in ids
+            ]
+
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            fetch = mock_crawler.return_value.fetch_many = AsyncMock()
+            fetch.return_value = tagged([1, 2], "a") + tagged([3], "b")
+            first = json.loads(
+                await search_zenn_articles_batch(["a", "b"], 10, output_format="json", delta=True)
+            )
+            fetch.return_value = tagged([1, 2, 4], "a")
+            second = json.loads(await search_zenn_articles_batch(
+                ["a"], 10, output_format="json", cursor=first["cursor"]
+            ))
+
+        assert first["count"] == 3
+        assert [a["title"] for a in second["articles"]] == ["記事4"]
+
+    @pytest.mark.asyncio
+    async def test_get_trending_history_lists_rising_articles(self):
+        """記録済みの履歴から上昇中の記事を返すこと"""
+        from app.main import get_trending_history
+        from app.trending_history import TrendingHistory
+
+        def ranking(*ids):
+            return [Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}") for i in ids]
+
+        history = TrendingHistory(min_interval=0)
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            mock_crawler.return_value.trending_history = history
+            empty = await get_trending_history()
+            history.record(ranking(1, 2, 3), now=0)
+            history.record(ranking(3, 1, 2), now=3600)
+            result = await get_trending_history()
+            detail = await get_trending_history(url="https://zenn.dev/a/articles/3")
+
+        assert "まだありません" in empty
+        assert "## 上昇中の記事\n- 1位 記事3 (+2.0位/時" in result
+        assert "- **最高順位**: 1" in detail
+
+    @pytest.mark.asyncio
+    async def test_search_zenn_articles_answers_date_range_from_index(self):
+        """since / until を指定すると取得済みの記事の索引から期間で引くこと"""
+        with patch('app.main.get_async_crawler') as mock_crawler:
+            crawler = mock_crawler.return_value
+            crawler.fetch_articles_from_feed = AsyncMock(return_value=[])
+            crawler.articles_between = AsyncMock(return_value=[
+                Article(title="期間内", url="https://zenn.dev/a/articles/1")
+            ])
+            result = await search_zenn_articles("react", 5, since="2025-07-01", until="2025-07-02")
+            invalid = await search_zenn_articles("react", until="yesterday")
+
+        crawler.articles_between.assert_awaited_once_with("react", 1751328000, 1751414400, 5)
+        assert "期間内" in result
+        assert "解釈できません" in invalid
+
+    @pytest.mark.asyncio
+    async def test_tools_answer_busy_when_saturated(self):
+        """同時実行数と待ち行列が上限に達したら取得せずに混雑を返すこと"""
+        from app.concurrency import ConcurrencyLimiter
+
+        limiter = ConcurrencyLimiter(max_concurrency=1, max_waiting=0, wait_timeout=0)
+        with patch('app.main.tool_limiter', limiter), \
+                patch('app.main.get_async_crawler') as mock_crawler:
+            await limiter.acquire()
+            result = await search_zenn_articles("react")
+            limiter.release()
+
+        assert "混み合っています" in result
+        mock_crawler.assert_not_called()
+
+    def test_run_server_serves_streamable_http_when_configured(self):
+        """HTTPモードでは設定のアドレスでステートレスに待ち受けること"""
+        from app.main import run_server
+
+        with patch.multiple(
+            'app.main.Config',
+            MCP_TRANSPORT="streamable-http", MCP_HTTP_HOST="0.0.0.0", MCP_HTTP_PORT=9000,
+        ), patch.object(mcp, 'settings') as settings, \
+                patch.object(mcp, 'run') as run, patch('app.main.start_metrics_server'):
+            run_server()
+
+        run.assert_called_once_with(transport="streamable-http")
+        assert (settings.host, settings.port) == ("0.0.0.0", 9000)
+        assert settings.stateless_http is True
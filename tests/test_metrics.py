@@ -0,0 +1,114 @@
+"""
+段階ごとの計測とメトリクス公開のテスト
+"""
+
+from unittest.mock import patch
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.crawler import AsyncZennCrawler
+from app.metrics import Histogram, Metrics, create_metrics_app
+from benchmarks.fake_zenn_server import FakeZennServer
+
+
+@pytest.fixture
+def fresh_metrics():
+    """クローラーとパーサーが参照するメトリクスを新しいものに差し替える"""
+    fresh = Metrics(enabled=True)
+    with patch("app.crawler.metrics", fresh), patch("app.feed_parser.metrics", fresh):
+        yield fresh
+
+
+class TestHistogram:
+
+    def test_should_count_observations_per_label(self):
+        """ラベル値ごとに件数と合計を集計すること"""
+        histogram = Histogram("h", "help", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "parse")
+        histogram.observe(0.5, "parse")
+        histogram.observe(2.0, "fetch")
+
+        snapshot = histogram.snapshot()
+        assert snapshot["parse"]["count"] == 2
+        assert snapshot["parse"]["sum"] == pytest.approx(0.55)
+        assert snapshot["parse"]["p50"] == 0.1
+        assert snapshot["fetch"]["p99"] == float("inf")
+
+    def test_should_render_cumulative_buckets(self):
+        """Prometheusのバケットを累積値で出力すること"""
+        histogram = Histogram("h", "help", ("stage",), buckets=(0.1, 1.0))
+        histogram.observe(0.05, "parse")
+        histogram.observe(0.5, "parse")
+
+        lines = histogram.render()
+        assert 'h_bucket{stage="parse",le="0.1"} 1' in lines
+        assert 'h_bucket{stage="parse",le="1.0"} 2' in lines
+        assert 'h_bucket{stage="parse",le="+Inf"} 2' in lines
+        assert 'h_count{stage="parse"} 2' in lines
+
+
+class TestMetrics:
+
+    def test_should_not_record_when_disabled(self):
+        """無効時は計測しないこと"""
+        disabled = Metrics(enabled=False)
+        with disabled.stage("parse"):
+            pass
+        disabled.error("fetch")
+
+        assert disabled.snapshot()["stages"] == {}
+        assert disabled.snapshot()["errors"] == {}
+        assert disabled.request_extensions() == {}
+
+    def test_should_include_collectors(self):
+        """登録したコレクターの値を出力に含めること"""
+        registry = Metrics(enabled=True)
+        registry.register_collector("article_cache", lambda: {"hits": 3})
+
+        assert registry.snapshot()["article_cache"] == {"hits": 3}
+        assert "zenn_mcp_article_cache_hits 3" in registry.render_prometheus()
+
+    @pytest.mark.asyncio
+    async def test_should_record_stages_of_real_fetch(self, fresh_metrics):
+        """実際のHTTP取得で接続から整形前までの段階を記録すること"""
+        with FakeZennServer(items=5) as server:
+            with patch("app.config.Config.ZENN_FEED_BASE_URL", f"{server.base_url}/topics"):
+                crawler = AsyncZennCrawler()
+                articles = await crawler.fetch_articles_from_feed("react", max_articles=5)
+                await crawler.aclose()
+
+        stages = fresh_metrics.snapshot()["stages"]
+        assert len(articles) == 5
+        for stage in ("connect", "ttfb", "download", "fetch", "parse", "sanitize"):
+            assert stage in stages
+        assert stages["sanitize"]["count"] == 5
+        assert fresh_metrics.snapshot()["feed_items"] == 5
+        assert fresh_metrics.snapshot()["downloaded_bytes"] > 0
+
+    @pytest.mark.asyncio
+    async def test_should_count_fetch_errors(self, fresh_metrics):
+        """取得失敗をエラーとして数えること"""
+        from tests.test_crawler import failing_transport
+
+        crawler = AsyncZennCrawler(transport=failing_transport())
+        await crawler.fetch_articles_from_feed("react")
+
+        assert fresh_metrics.snapshot()["errors"]["fetch"] == 1
+
+
+class TestMetricsApp:
+
+    def test_should_expose_prometheus_text(self):
+        """/metrics がPrometheusのテキスト形式を返すこと"""
+        client = TestClient(create_metrics_app())
+        response = client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE zenn_mcp_stage_duration_seconds histogram" in response.text
+
+    def test_should_report_health(self):
+        """/health が応答すること"""
+        client = TestClient(create_metrics_app())
+        assert client.get("/health").json() == {"status": "ok"}
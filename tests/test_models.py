@@ -0,0 +1,64 @@
+"""
+記事データモデルのテスト
+"""
+
+import dataclasses
+
+import pytest
+
+from app.models import Article, parse_published
+
+
+class TestArticle:
+
+    def test_should_convert_to_legacy_dict(self):
+        """従来の辞書形式に変換できること"""
+        article = Article(title="t", url="u", published_at="p", creator="c", description="d")
+
+        assert article.to_dict() == {
+            "title": "t",
+            "url": "u",
+            "published_at": "p",
+            "creator": "c",
+            "description": "d",
+        }
+
+    def test_should_include_topics_only_when_present(self):
+        """掲載トピックがある場合だけ topics を含めること"""
+        article = Article(url="u", topics=("react", "trending"))
+        assert article.to_dict()["topics"] == ["react", "trending"]
+
+    def test_should_be_immutable_and_slotted(self):
+        """変更不可で __dict__ を持たないこと"""
+        article = Article(title="t")
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            article.title = "changed"
+        assert not hasattr(article, "__dict__")
+
+    def test_should_parse_published_timestamp_once(self):
+        """投稿日時を生成時にエポック秒にし、指定があればそれを使うこと"""
+        article = Article(published_at="Mon, 14 Jul 2025 08:34:28 GMT")
+
+        assert article.published_ts == 1752482068
+        assert Article(published_at="x", published_ts=5).published_ts == 5
+        assert Article().published_ts == 0
+
+
+class TestParsePublished:
+
+    def test_fast_path_should_match_generic_parser(self):
+        """GMT固定形式の高速経路が一般の解釈と同じ結果になること"""
+        from email.utils import parsedate_to_datetime
+
+        value = "Sun, 02 Feb 2025 23:59:59 GMT"
+
+        assert parse_published(value) == int(parsedate_to_datetime(value).timestamp())
+
+    def test_should_fall_back_to_dateutil(self):
+        """他の形式はタイムゾーン付きで解釈し、なければUTCとみなすこと"""
+        assert parse_published("Mon, 14 Jul 2025 17:34:28 +0900") == 1752482068
+        assert parse_published("2025-07-14T17:34:28.000+09:00") == 1752482068
+        assert parse_published("2025-07-14 08:34:28") == 1752482068
+        assert parse_published("不明") == 0
+        assert parse_published("") == 0
@@ -0,0 +1,150 @@
+"""
+上流へのリクエストのレート制限のテスト
+"""
+
+import asyncio
+import threading
+from email.utils import formatdate
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler
+from app.rate_limit import RateLimiter, parse_retry_after
+from benchmarks.fake_zenn_server import build_feed
+from tests.conftest import FakeClock
+
+
+class TestParseRetryAfter:
+
+    def test_should_accept_seconds_and_http_dates(self):
+        """秒数とHTTP日付のどちらの形式も読めること"""
+        seconds = httpx.Response(429, headers={"Retry-After": "3"})
+        date = httpx.Response(503, headers={"Retry-After": formatdate(usegmt=True)})
+
+        assert parse_retry_after(seconds) == 3.0
+        assert 0.0 <= parse_retry_after(date) <= 1.0
+        assert parse_retry_after(httpx.Response(429)) is None
+        assert parse_retry_after(httpx.Response(429, headers={"Retry-After": "soon"})) is None
+
+    def test_should_cap_long_waits(self):
+        """長すぎる指示は上限で切り詰めること"""
+        response = httpx.Response(429, headers={"Retry-After": "86400"})
+
+        assert parse_retry_after(response) == Config.RATE_LIMIT_MAX_RETRY_AFTER
+
+
+class TestRateLimiter:
+
+    def test_should_allow_burst_then_pace_requests(self):
+        """容量までは待たずに送り、それ以降は補充の間隔で待たせること"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, burst=3, clock=clock)
+
+        waits = [limiter.reserve() for _ in range(5)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(0.1)
+        assert waits[4] == pytest.approx(0.2)
+
+        clock.now = 10
+        assert limiter.reserve() == 0.0
+
+    def test_should_hold_requests_while_paused(self):
+        """一時停止中は解除されるまで待たせ、その後は補充の間隔で送ること"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=10, burst=5, clock=clock)
+
+        limiter.pause(2.0)
+
+        assert limiter.reserve() == pytest.approx(2.1)
+        assert limiter.reserve() == pytest.approx(2.2)
+        clock.now = 1.0
+        assert limiter.stats()["paused_for"] == pytest.approx(1.0)
+
+    def test_should_share_tokens_across_threads(self):
+        """複数スレッドから予約しても容量以上は待たずに送れないこと"""
+        limiter = RateLimiter(rate=1, burst=10, clock=FakeClock())
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            for _ in range(5):
+                wait = limiter.reserve()
+                with lock:
+                    waits.append(wait)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(waits) == [0.0] * 10 + [float(i) for i in range(1, 11)]
+
+    @pytest.mark.asyncio
+    async def test_should_report_queue_depth(self):
+        """待っているリクエスト数を統計に出すこと"""
+        limiter = RateLimiter(rate=50, burst=1)
+
+        await asyncio.gather(*(limiter.acquire() for _ in range(5)))
+
+        stats = limiter.stats()
+        assert stats["delayed"] == 4
+        assert stats["max_waiting"] == 4
+        assert stats["waiting"] == 0
+
+    def test_should_only_honor_pauses_when_disabled(self):
+        """レートが0なら待たせず、一時停止の間だけ待たせること"""
+        clock = FakeClock()
+        limiter = RateLimiter(rate=0, clock=clock)
+
+        assert [limiter.reserve() for _ in range(100)] == [0.0] * 100
+        limiter.pause(1.5)
+        assert limiter.reserve() == 1.5
+
+
+class TestCrawlerRateLimit:
+
+    @pytest.mark.asyncio
+    async def test_should_pace_all_fetch_paths(self):
+        """フィードもAPIも同じバケットから送ること"""
+        def handler(request):
+            if request.url.path.startswith("/api/"):
+                return httpx.Response(404)
+            return httpx.Response(200, content=build_feed(1))
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+        crawler.rate_limiter = RateLimiter(rate=20, burst=1)
+
+        loop = asyncio.get_running_loop()
+        began = loop.time()
+        await crawler.fetch_many(["a", "b"], 1, include_trending=True)
+        await crawler.fetch_article_bodies(["https://zenn.dev/u/articles/x"])
+        elapsed = loop.time() - began
+        await crawler.aclose()
+
+        assert elapsed >= 0.15
+        assert crawler.rate_limiter.stats()["delayed"] == 3
+
+    @pytest.mark.asyncio
+    async def test_should_honor_retry_after(self):
+        """429の Retry-After の間は再試行も含めて送らないこと"""
+        sent = []
+
+        def handler(request):
+            sent.append(asyncio.get_running_loop().time())
+            if len(sent) == 1:
+                return httpx.Response(429, headers={"Retry-After": "1"})
+            return httpx.Response(200, content=build_feed(2))
+
+        with patch.object(Config, "HTTP_RETRY_BASE_DELAY", 0.001):
+            crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+            articles = await crawler.fetch_trending_articles(2)
+            await crawler.aclose()
+
+        assert len(articles) == 2
+        assert sent[1] - sent[0] >= 0.9
+        assert crawler.rate_limiter.stats()["pauses"] == 1
@@ -0,0 +1,155 @@
+"""
+ツール応答の整形とキャッシュのテスト
+"""
+
+import json
+
+import pytest
+
+from app.models import Article
+from app.render import (
+    COMPACT,
+    JSON,
+    MARKDOWN,
+    RenderCache,
+    estimate_tokens,
+    render_articles,
+    render_articles_counted,
+    render_cache,
+    shorten,
+)
+
+
+def make_articles(count, description="これは概要です。" * 10):
+    return [
+        Article(
+            title=f"記事{i}",
+            url=f"https://zenn.dev/u/articles/{i}",
+            published_at="Mon, 14 Jul 2025 08:34:28 GMT",
+            creator="u",
+            description=description,
+        )
+        for i in range(count)
+    ]
+
+
+class TestShorten:
+
+    def test_should_cut_at_sentence_boundary(self):
+        """後半に文の区切りがあればそこで切ること"""
+        assert shorten("一文目です。二文目です。三文目", 12) == "一文目です。…"
+
+    def test_should_cut_by_characters_without_boundary(self):
+        """区切りがなければ文字数で切ること"""
+        assert shorten("あいうえおかきくけこ", 5) == "あいうえ…"
+        assert shorten("短い", 5) == "短い"
+
+
+class TestRenderArticles:
+
+    def test_markdown_should_keep_existing_template(self):
+        """Markdown形式は従来のテンプレートで整形すること"""
+        text = render_articles("# トピック: react", make_articles(1, "概要"), MARKDOWN)
+
+        assert text.startswith("# トピック: react\n取得記事数: 1件\n")
+        assert "## 1. 記事0" in text
+        assert "- **概要**: 概要" in text
+        assert "- **URL**: https://zenn.dev/u/articles/0" in text
+
+    def test_compact_should_use_one_line_per_article(self):
+        """compact形式は1記事1行にすること"""
+        text = render_articles("# トピック: react", make_articles(3, "概要"), COMPACT)
+        lines = text.split("\n")
+
+        assert lines[0] == "# トピック: react (3件)"
+        assert lines[1] == "1. 記事0 | u | 2025-07-14 | https://zenn.dev/u/articles/0 | 概要"
+        assert len(lines) == 4
+
+    def test_json_should_be_parseable(self):
+        """JSON形式はそのまま読み込めること"""
+        data = json.loads(render_articles("# トピック: react", make_articles(2), JSON))
+
+        assert data["count"] == 2
+        assert data["articles"][1]["url"] == "https://zenn.dev/u/articles/1"
+
+    def test_should_reject_unknown_format(self):
+        """未知の形式はエラーにすること"""
+        with pytest.raises(ValueError):
+            render_articles("# x", make_articles(1), "xml")
+
+    @pytest.mark.parametrize("output_format", [MARKDOWN, COMPACT, JSON])
+    def test_should_fit_character_budget_by_shortening_descriptions(self, output_format):
+        """上限に収まるよう記事は残したまま概要を短くすること"""
+        articles = make_articles(5)
+        full = render_articles("# x", articles, output_format)
+        budget = len(full) - 200
+
+        text = render_articles("# x", articles, output_format, max_chars=budget)
+
+        assert len(text) <= budget
+        assert "記事4" in text
+        assert "…" in text
+
+    def test_should_omit_trailing_articles_when_budget_is_tiny(self):
+        """概要をなくしても収まらなければ末尾の記事を省くこと"""
+        text = render_articles("# x", make_articles(5), COMPACT, max_chars=130)
+
+        assert len(text) <= 130
+        assert "記事0" in text
+        assert "記事4" not in text
+        assert "…ほか" in text
+
+    def test_should_report_how_many_articles_were_kept(self):
+        """上限のため省かずに含めた記事数を返すこと"""
+        articles = make_articles(5)
+
+        text, kept = render_articles_counted("# x", articles, COMPACT, max_chars=130)
+        _, everything = render_articles_counted("# x", articles, COMPACT)
+
+        assert 0 < kept < 5
+        assert f"ほか{5 - kept}件" in text
+        assert everything == 5
+
+    def test_should_fit_token_budget(self):
+        """おおよそのトークン数の上限に収まること"""
+        text = render_articles("# x", make_articles(5), MARKDOWN, max_tokens=300)
+
+        assert estimate_tokens(text) <= 300
+
+    def test_should_reuse_rendered_output_for_unchanged_articles(self):
+        """同じ記事と形式なら整形済みの結果を使い回すこと"""
+        render_cache.clear()
+        articles = make_articles(3)
+        before = render_cache.stats()
+
+        first = render_articles("# cache", articles, COMPACT)
+        second = render_articles("# cache", list(articles), COMPACT)
+        changed = render_articles("# cache", articles[:2], COMPACT)
+
+        stats = render_cache.stats()
+        assert first is second
+        assert changed != first
+        assert stats["hits"] - before["hits"] == 1
+        assert stats["misses"] - before["misses"] == 2
+
+
+class TestRenderCache:
+
+    def test_should_evict_least_recently_used(self):
+        """上限を超えたら最も使われていない応答を外すこと"""
+        cache = RenderCache(max_entries=2)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        cache.get("a")
+        cache.put("c", "C")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "A"
+
+
+class TestEstimateTokens:
+
+    def test_should_count_ascii_by_four_and_japanese_by_one(self):
+        """英数字は4文字で1、日本語は1文字で1と数えること"""
+        assert estimate_tokens("abcd") == 1
+        assert estimate_tokens("日本語") == 3
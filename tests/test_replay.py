@@ -0,0 +1,159 @@
+"""
+上流の応答の記録と再生のテスト
+"""
+
+import asyncio
+import base64
+import gzip
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler
+from app.replay import RecordingTransport, ReplayTransport, ResponseRecorder, read_archive
+from benchmarks.fake_zenn_server import FakeZennServer, build_feed
+
+
+def record(recorder, url, status=200, content=b"", elapsed=0.0, headers=None):
+    request = httpx.Request("GET", url, headers=headers)
+    response = httpx.Response(status, headers={"ETag": '"v1"'}, content=content)
+    recorder.record(request, response, content, elapsed)
+
+
+class TestResponseRecorder:
+
+    def test_should_keep_records_readable_while_appending(self, tmp_path):
+        """書き込み途中でも、閉じて追記し直しても、すべての記録が読めること"""
+        path = str(tmp_path / "archive" / "upstream.jsonl.gz")
+        recorder = ResponseRecorder(path)
+        record(recorder, "https://zenn.dev/a", content=b"first")
+        record(recorder, "https://zenn.dev/b", content=b"second")
+
+        assert [entry["url"] for entry in read_archive(path)] == [
+            "https://zenn.dev/a", "https://zenn.dev/b",
+        ]
+
+        recorder.close()
+        again = ResponseRecorder(path)
+        record(again, "https://zenn.dev/c", status=304, headers={"If-None-Match": '"v1"'})
+        again.close()
+
+        entries = list(read_archive(path))
+        assert [entry["status"] for entry in entries] == [200, 200, 304]
+        assert entries[2]["conditional"] is True
+        assert again.stats() == {"records": 1, "body_bytes": 0}
+
+
+class TestReplayTransport:
+
+    @pytest.mark.asyncio
+    async def test_should_cycle_recorded_responses_and_miss_unknown_urls(self, tmp_path):
+        """同じURLの記録は順に返し、記録のないURLは404にすること"""
+        path = str(tmp_path / "upstream.jsonl.gz")
+        recorder = ResponseRecorder(path)
+        record(recorder, "https://zenn.dev/feed", content=b"one")
+        record(recorder, "https://zenn.dev/feed", content=b"two")
+        recorder.close()
+
+        transport = ReplayTransport(path, speed=0)
+        async with httpx.AsyncClient(transport=transport) as client:
+            bodies = [(await client.get("https://zenn.dev/feed")).content for _ in range(3)]
+            missing = await client.get("https://zenn.dev/unknown")
+
+        assert bodies == [b"one", b"two", b"one"]
+        assert missing.status_code == 404
+        assert transport.stats()["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_should_only_answer_conditional_requests_with_not_modified(self, tmp_path):
+        """304の記録は条件付きリクエストにだけ返すこと"""
+        path = str(tmp_path / "upstream.jsonl.gz")
+        recorder = ResponseRecorder(path)
+        record(recorder, "https://zenn.dev/feed", content=b"body")
+        record(recorder, "https://zenn.dev/feed", status=304, headers={"If-None-Match": '"v1"'})
+        recorder.close()
+
+        async with httpx.AsyncClient(transport=ReplayTransport(path, speed=0)) as client:
+            plain = await client.get("https://zenn.dev/feed")
+            conditional = await client.get(
+                "https://zenn.dev/feed", headers={"If-None-Match": '"v1"'}
+            )
+
+        assert plain.status_code == 200
+        assert conditional.status_code == 304
+
+    @pytest.mark.asyncio
+    async def test_should_reproduce_recorded_timing_at_given_speed(self, tmp_path):
+        """記録時の所要時間を等倍で再現し、speed 倍で短縮できること"""
+        path = str(tmp_path / "upstream.jsonl.gz")
+        recorder = ResponseRecorder(path)
+        record(recorder, "https://zenn.dev/feed", content=b"body", elapsed=0.2)
+        recorder.close()
+
+        async def timed(speed: float) -> float:
+            loop = asyncio.get_running_loop()
+            async with httpx.AsyncClient(transport=ReplayTransport(path, speed)) as client:
+                began = loop.time()
+                await client.get("https://zenn.dev/feed")
+                return loop.time() - began
+
+        assert await timed(1.0) >= 0.19
+        assert await timed(10.0) < 0.1
+
+
+class TestCrawlerRecordReplay:
+
+    @pytest.mark.asyncio
+    async def test_should_replay_recorded_session_offline(self, tmp_path):
+        """記録したセッションを偽サーバーなしで再生し、同じ記事を返すこと"""
+        path = str(tmp_path / "upstream.jsonl.gz")
+        with FakeZennServer(items=3) as server:
+            with patch.multiple(
+                Config,
+                ZENN_FEED_BASE_URL=f"{server.base_url}/topics",
+                ZENN_TRENDING_FEED_URL=f"{server.base_url}/feed",
+                HTTP_RECORD_PATH=path,
+            ):
+                recorder_crawler = AsyncZennCrawler()
+                recorded = await recorder_crawler.fetch_many(["react"], 3, include_trending=True)
+                await recorder_crawler.aclose()
+                recorder_crawler.recorder.close()
+
+        with patch.multiple(
+            Config,
+            ZENN_FEED_BASE_URL=f"{server.base_url}/topics",
+            ZENN_TRENDING_FEED_URL=f"{server.base_url}/feed",
+            HTTP_REPLAY_PATH=path,
+            HTTP_REPLAY_SPEED=0,
+        ):
+            crawler = AsyncZennCrawler()
+            replayed = await crawler.fetch_many(["react"], 3, include_trending=True)
+            await crawler.aclose()
+
+        assert recorder_crawler.recorder.stats()["records"] == 2
+        assert replayed == recorded
+        assert crawler._transport.stats()["served"] == 2
+        assert not crawler.rate_limiter.enabled
+
+    @pytest.mark.asyncio
+    async def test_should_record_compressed_bodies_as_received(self, tmp_path):
+        """gzipの応答は受け取った形のまま記録し、クローラーには展開して渡すこと"""
+        feed = build_feed(2)
+
+        def handler(request):
+            return httpx.Response(
+                200, headers={"Content-Encoding": "gzip"}, content=gzip.compress(feed)
+            )
+
+        recorder = ResponseRecorder(str(tmp_path / "upstream.jsonl.gz"))
+        transport = RecordingTransport(recorder, httpx.MockTransport(handler))
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.get("https://zenn.dev/feed")
+        recorder.close()
+
+        entry = next(read_archive(recorder.path))
+        assert response.content == feed
+        assert gzip.decompress(base64.b64decode(entry["body"])) == feed
+        assert ["content-encoding", "gzip"] in entry["headers"]
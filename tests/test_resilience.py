@@ -0,0 +1,269 @@
+"""
+再試行・適応タイムアウト・サーキットブレーカーのテスト
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler
+from app.resilience import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    LatencyTracker,
+    backoff_delay,
+)
+from benchmarks.fake_zenn_server import FakeZennServer, build_feed
+from tests.conftest import FakeClock
+
+
+def fake_server_config(server):
+    """偽サーバーに向け、再試行の待ち時間を短くする設定"""
+    return patch.multiple(
+        Config,
+        ZENN_FEED_BASE_URL=f"{server.base_url}/topics",
+        ZENN_TRENDING_FEED_URL=f"{server.base_url}/feed",
+        HTTP_RETRY_BASE_DELAY=0.001,
+    )
+
+
+class TestBackoffDelay:
+
+    def test_should_grow_exponentially_up_to_cap(self):
+        """上限は試行ごとに倍になり、cap で頭打ちになること"""
+        upper = lambda low, high: high  # noqa: E731
+
+        assert backoff_delay(0, base=0.1, cap=1.0, rng=upper) == pytest.approx(0.1)
+        assert backoff_delay(2, base=0.1, cap=1.0, rng=upper) == pytest.approx(0.4)
+        assert backoff_delay(10, base=0.1, cap=1.0, rng=upper) == 1.0
+
+    def test_should_jitter_between_zero_and_upper_bound(self):
+        """待ち時間は0から上限までの乱数であること"""
+        delays = [backoff_delay(3, base=0.1, cap=5.0) for _ in range(100)]
+
+        assert all(0 <= delay <= 0.8 for delay in delays)
+        assert len(set(delays)) > 1
+
+
+class TestLatencyTracker:
+
+    def test_should_use_defaults_until_enough_samples(self):
+        """実測が少ないうちは既定のタイムアウトを使うこと"""
+        tracker = LatencyTracker(min_samples=5)
+        for _ in range(4):
+            tracker.observe("ttfb", 0.01)
+
+        assert tracker.timeout().read == Config.HTTP_READ_TIMEOUT
+
+    def test_should_derive_timeout_from_p99(self):
+        """実測p99の倍数を下限と既定値の間に収めること"""
+        tracker = LatencyTracker(min_samples=5, multiplier=4, minimum=0.1)
+        for _ in range(10):
+            tracker.observe("ttfb", 0.5)
+            tracker.observe("connect", 0.001)
+
+        timeout = tracker.timeout()
+        assert timeout.read == pytest.approx(2.0)
+        assert timeout.connect == pytest.approx(0.1)
+
+        for _ in range(10):
+            tracker.observe("ttfb", 60.0)
+        assert tracker.timeout().read == Config.HTTP_READ_TIMEOUT
+
+    def test_should_cap_timeouts_to_remaining_budget(self):
+        """残り時間を渡すと、どのタイムアウトもそれを超えないこと"""
+        timeout = LatencyTracker().timeout(budget=2.5)
+
+        assert timeout.connect == 2.5
+        assert timeout.read == 2.5
+        assert timeout.pool == 2.5
+        assert LatencyTracker().timeout(budget=-1.0).read == 0.0
+
+
+class TestCircuitBreaker:
+
+    def test_should_open_after_consecutive_failures(self):
+        """連続失敗が閾値に達したら遮断すること"""
+        breaker = CircuitBreaker("zenn.dev", failure_threshold=3, reset_timeout=10, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+        assert breaker.rejected == 1
+
+    def test_should_let_one_probe_through_after_reset_timeout(self):
+        """一定時間後は1リクエストだけ通し、成功すれば復旧すること"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("zenn.dev", failure_threshold=1, reset_timeout=10, clock=clock)
+        breaker.record_failure()
+
+        clock.now = 10
+        assert breaker.state == HALF_OPEN
+        breaker.allow()
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        breaker.allow()
+
+    def test_should_reopen_when_probe_fails(self):
+        """試しに通したリクエストが失敗したら再び遮断すること"""
+        clock = FakeClock()
+        breaker = CircuitBreaker("zenn.dev", failure_threshold=5, reset_timeout=10, clock=clock)
+        for _ in range(5):
+            breaker.record_failure()
+
+        clock.now = 10
+        breaker.allow()
+        breaker.record_failure()
+
+        assert breaker.state == OPEN
+        clock.now = 15
+        with pytest.raises(CircuitOpenError):
+            breaker.allow()
+
+
+class TestCrawlerResilience:
+
+    @pytest.mark.asyncio
+    async def test_should_retry_transient_errors(self):
+        """一時的な503は再試行して記事を返すこと"""
+        with FakeZennServer(items=3, error_rate=0.5, seed=1) as server:
+            with fake_server_config(server), patch.object(Config, "HTTP_RETRY_ATTEMPTS", 10):
+                crawler = AsyncZennCrawler()
+                results = [await crawler.fetch_articles_from_feed(f"t{i}", 3) for i in range(5)]
+                await crawler.aclose()
+
+        assert all(len(articles) == 3 for articles in results)
+        assert server.errors > 0
+
+    @pytest.mark.asyncio
+    async def test_should_fail_fast_and_serve_cached_articles_when_open(self):
+        """遮断中はリクエストを送らず、手元のフィードの記事で応えること"""
+        with FakeZennServer(items=3, etag=True) as server:
+            with fake_server_config(server), patch.multiple(
+                Config, CIRCUIT_FAILURE_THRESHOLD=2, HTTP_RETRY_ATTEMPTS=2
+            ):
+                crawler = AsyncZennCrawler()
+                first = await crawler.fetch_articles_from_feed("react", 3)
+                crawler.article_cache.clear()
+                server.error_rate = 1.0
+
+                degraded = await crawler.fetch_articles_from_feed("react", 3)
+                requests = server.requests
+                again = await crawler.fetch_articles_from_feed("vue", 3)
+                await crawler.aclose()
+
+        assert degraded == first
+        assert crawler.breakers.for_url(server.base_url).state == OPEN
+        assert server.requests == requests
+        assert again == []
+
+    @pytest.mark.asyncio
+    async def test_should_retry_dropped_connections(self):
+        """応答なしで切られた接続は再試行すること"""
+        with FakeZennServer(items=2, drop_rate=0.5, seed=3) as server:
+            with fake_server_config(server), patch.object(Config, "HTTP_RETRY_ATTEMPTS", 10):
+                crawler = AsyncZennCrawler()
+                results = [await crawler.fetch_articles_from_feed(f"t{i}", 2) for i in range(5)]
+                await crawler.aclose()
+
+        assert all(len(articles) == 2 for articles in results)
+        assert server.errors > 0
+
+    @pytest.mark.asyncio
+    async def test_should_time_out_stalled_responses(self):
+        """止まった応答は実測から決めたタイムアウトで打ち切ること"""
+        with FakeZennServer(items=2, stall_rate=1.0, stall_seconds=1.0) as server:
+            with fake_server_config(server), patch.object(Config, "HTTP_RETRY_ATTEMPTS", 1):
+                crawler = AsyncZennCrawler()
+                crawler.latency = LatencyTracker(min_samples=1, minimum=0.05)
+                crawler.latency.observe("ttfb", 0.01)
+                client = crawler._client()
+
+                with pytest.raises(httpx.ReadTimeout):
+                    await crawler._get(client, f"{server.base_url}/feed")
+                await crawler.aclose()
+
+    @pytest.mark.asyncio
+    async def test_should_stop_retrying_at_total_deadline(self):
+        """再試行を含めた所要時間を HTTP_TOTAL_DEADLINE に収め、使い切ったら再試行しないこと"""
+        with FakeZennServer(items=2, stall_rate=1.0, stall_seconds=2.0) as server:
+            with fake_server_config(server), patch.multiple(
+                Config, HTTP_RETRY_ATTEMPTS=5, HTTP_TOTAL_DEADLINE=0.3, HTTP_TIMEOUT_MIN=0.1
+            ):
+                crawler = AsyncZennCrawler()
+                client = crawler._client()
+                loop = asyncio.get_running_loop()
+                began = loop.time()
+
+                with pytest.raises(httpx.ReadTimeout):
+                    await crawler._get(client, f"{server.base_url}/feed")
+                elapsed = loop.time() - began
+                await crawler.aclose()
+
+        assert elapsed < 0.6
+        assert server.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_should_hedge_slow_requests(self):
+        """最初の応答が遅ければ2本目を送り、先に返った方を使うこと"""
+        calls = []
+
+        async def handler(request):
+            calls.append(request.url.path)
+            if len(calls) == 1:
+                await asyncio.sleep(1.0)
+            return httpx.Response(200, content=build_feed(2))
+
+        with patch.multiple(Config, HTTP_HEDGE_ENABLED=True, HTTP_HEDGE_MIN_DELAY=0.01):
+            crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+            loop = asyncio.get_running_loop()
+            began = loop.time()
+            articles = await crawler.fetch_trending_articles(2)
+            elapsed = loop.time() - began
+            await crawler.aclose()
+
+        assert len(articles) == 2
+        assert len(calls) == 2
+        assert elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_should_cancel_hedged_request_when_caller_is_cancelled(self):
+        """2本目を送る前に呼び出し元が取り消されたら、送り済みのリクエストも止めること"""
+        started = asyncio.Event()
+        aborted = asyncio.Event()
+
+        async def handler(request):
+            started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                aborted.set()
+                raise
+            return httpx.Response(200, content=build_feed(2))
+
+        with patch.multiple(Config, HTTP_HEDGE_ENABLED=True, HTTP_HEDGE_MIN_DELAY=5.0):
+            crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+            task = asyncio.create_task(crawler.fetch_trending_articles(2))
+            await asyncio.wait_for(started.wait(), timeout=1)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            await asyncio.wait_for(aborted.wait(), timeout=1)
+            await crawler.aclose()
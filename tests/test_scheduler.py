@@ -0,0 +1,150 @@
+"""
+先読みスケジューラーのテスト
+"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.crawler import AsyncZennCrawler
+from app.scheduler import PrefetchScheduler
+from benchmarks.fake_zenn_server import build_feed
+from tests.conftest import feed_transport
+
+
+def make_crawler():
+    crawler = MagicMock()
+    crawler.refresh_topic = AsyncMock(return_value=[])
+    crawler.refresh_trending = AsyncMock(return_value=[])
+    return crawler
+
+
+class TestPrefetchScheduler:
+
+    def test_should_rank_topics_by_request_count(self):
+        """要求の多い順に人気トピックを返すこと"""
+        scheduler = PrefetchScheduler(max_topics=2)
+        for topic in ["react", "go", "React", "python", "go", "react"]:
+            scheduler.record(topic)
+
+        assert scheduler.hot_topics() == ["react", "go"]
+
+    def test_should_apply_jitter_to_interval(self):
+        """間隔に揺らぎを加えること"""
+        scheduler = PrefetchScheduler(interval=100, jitter=0.2, rng=lambda low, high: high)
+        assert scheduler.next_delay() == 120
+
+    @pytest.mark.asyncio
+    async def test_should_refresh_hot_topics_and_trending(self):
+        """人気トピックとトレンドを再取得し、最終取得時刻を記録すること"""
+        scheduler = PrefetchScheduler(max_topics=5)
+        scheduler.record("react")
+        scheduler.record("go")
+        crawler = make_crawler()
+
+        await scheduler.refresh_once(crawler)
+
+        refreshed = sorted(call.args[0] for call in crawler.refresh_topic.await_args_list)
+        assert refreshed == ["go", "react"]
+        crawler.refresh_trending.assert_awaited_once()
+        status = scheduler.status()
+        assert status["trending_last_refresh"] is not None
+        assert all(entry["last_refresh"] for entry in status["hot_topics"])
+
+    @pytest.mark.asyncio
+    async def test_should_refresh_topic_named_trending_as_topic(self):
+        """"trending" という名前のトピックはトピックとして再取得し、トレンドは1回だけ取ること"""
+        scheduler = PrefetchScheduler(max_topics=5)
+        scheduler.record("trending")
+        crawler = make_crawler()
+
+        await scheduler.refresh_once(crawler)
+
+        assert [call.args[0] for call in crawler.refresh_topic.await_args_list] == ["trending"]
+        crawler.refresh_trending.assert_awaited_once()
+        assert scheduler.status()["hot_topics"][0]["last_refresh"] is not None
+
+    @pytest.mark.asyncio
+    async def test_should_serve_mixed_case_topics_from_prefetched_feed(self):
+        """大文字を含むトピックも先読みしたフィードから上流に出ずに返すこと"""
+        requested = []
+        crawler = AsyncZennCrawler(transport=feed_transport(build_feed(3), calls=requested))
+        scheduler = PrefetchScheduler(max_topics=5)
+        scheduler.record("React")
+
+        await scheduler.refresh_once(crawler)
+        prefetched = len(requested)
+        articles = await crawler.fetch_articles_from_feed("React", 3)
+        await crawler.aclose()
+
+        assert "/topics/react/feed" in [request.url.path for request in requested]
+        assert len(requested) == prefetched
+        assert len(articles) == 3
+
+    @pytest.mark.asyncio
+    async def test_should_cap_concurrent_refreshes(self):
+        """同時実行数の上限を守ること"""
+        running = 0
+        peak = 0
+
+        async def slow_refresh(*args):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return []
+
+        scheduler = PrefetchScheduler(max_topics=10, max_concurrency=3)
+        for i in range(8):
+            scheduler.record(f"topic{i}")
+        crawler = make_crawler()
+        crawler.refresh_topic = AsyncMock(side_effect=slow_refresh)
+        crawler.refresh_trending = AsyncMock(side_effect=slow_refresh)
+
+        await scheduler.refresh_once(crawler)
+
+        assert peak == 3
+
+    @pytest.mark.asyncio
+    async def test_should_decay_old_popularity(self):
+        """再取得のたびに人気度を減衰させ、要求のないトピックを外すこと"""
+        scheduler = PrefetchScheduler(decay=0.5)
+        scheduler.record("react")
+
+        for _ in range(4):
+            await scheduler.refresh_once(make_crawler())
+
+        assert scheduler.hot_topics() == []
+
+    @pytest.mark.asyncio
+    async def test_should_keep_running_when_refresh_fails(self):
+        """再取得が失敗しても他のトピックは再取得すること"""
+        scheduler = PrefetchScheduler()
+        scheduler.record("broken")
+        crawler = make_crawler()
+        crawler.refresh_topic = AsyncMock(side_effect=Exception("boom"))
+
+        await scheduler.refresh_once(crawler)
+
+        status = scheduler.status()
+        assert status["hot_topics"][0]["last_refresh"] is None
+        assert status["trending_last_refresh"] is not None
+
+    @pytest.mark.asyncio
+    async def test_should_start_once_and_stop(self):
+        """開始は1回だけで、停止できること"""
+        scheduler = PrefetchScheduler(interval=0.01, jitter=0)
+        crawler = make_crawler()
+
+        scheduler.ensure_started(crawler)
+        task = scheduler._task
+        scheduler.ensure_started(crawler)
+        assert scheduler._task is task
+
+        await asyncio.sleep(0.05)
+        await scheduler.stop()
+
+        assert not scheduler.running
+        assert crawler.refresh_trending.await_count >= 1
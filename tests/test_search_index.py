@@ -0,0 +1,128 @@
+"""
+全文検索インデックスのテスト
+"""
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from app.crawler import AsyncZennCrawler
+from app.models import Article
+from app.search_index import SearchIndex, tokenize
+from app.store import ArticleStore
+
+
+def make_article(i, title, description="", creator="author"):
+    return Article(
+        title=title,
+        url=f"https://zenn.dev/a/articles/{i}",
+        creator=creator,
+        description=description,
+    )
+
+
+class TestTokenize:
+
+    def test_should_split_japanese_into_bigrams_and_keep_ascii_words(self):
+        """日本語はバイグラム、英数字は単語として分割すること"""
+        assert tokenize("Reactの状態管理") == ["react", "の状", "状態", "態管", "管理"]
+
+    def test_should_normalize_width_and_case(self):
+        """全角英数字と大文字を正規化すること"""
+        assert tokenize("ＴｙｐｅＳｃｒｉｐｔ") == ["typescript"]
+
+    def test_should_keep_single_character_runs(self):
+        """1文字だけの日本語もトークンにすること"""
+        assert tokenize("型") == ["型"]
+
+
+class TestSearchIndex:
+
+    def test_should_rank_relevant_articles_first(self):
+        """クエリの語を多く含む記事を上位に返すこと"""
+        index = SearchIndex()
+        index.add([
+            make_article(1, "Pythonの非同期処理入門", "asyncioで非同期処理を書く"),
+            make_article(2, "Rustの所有権", "借用チェッカーを理解する"),
+            make_article(3, "非同期処理のテスト", "pytestでテストする"),
+        ])
+
+        results = index.search("非同期処理")
+
+        assert [article.url[-1] for article, _ in results] == ["1", "3"]
+        assert results[0][1] > results[1][1]
+
+    def test_should_weight_title_over_description(self):
+        """タイトルに含まれる語を概要より重く扱うこと"""
+        index = SearchIndex(title_weight=3)
+        index.add([
+            make_article(1, "入門記事", "Dockerを使う"),
+            make_article(2, "Docker入門", "コンテナを使う"),
+        ])
+
+        assert index.search("docker")[0][0].url.endswith("/2")
+
+    def test_should_search_by_creator(self):
+        """作成者名でも検索できること"""
+        index = SearchIndex()
+        index.add([make_article(1, "記事", creator="yusuke"), make_article(2, "記事")])
+
+        assert [article.url for article, _ in index.search("yusuke")] == [
+            "https://zenn.dev/a/articles/1"
+        ]
+
+    def test_should_replace_updated_article(self):
+        """同じURLの記事の内容が変われば古い語を外すこと"""
+        index = SearchIndex()
+        index.add([make_article(1, "古いタイトル")])
+
+        assert index.add([make_article(1, "古いタイトル")]) == 0
+        assert index.add([make_article(1, "新しい見出し")]) == 1
+
+        assert index.search("古い") == []
+        assert len(index.search("見出し")) == 1
+        assert len(index) == 1
+
+    def test_should_evict_oldest_documents_over_limit(self):
+        """上限を超えたら最初に登録した記事から外すこと"""
+        index = SearchIndex(max_documents=2)
+        index.add([make_article(i, f"記事{i}") for i in range(3)])
+
+        assert len(index) == 2
+        assert all(not a.url.endswith("/0") for a, _ in index.search("記事"))
+        assert index.stats()["documents"] == 2
+
+    def test_should_return_nothing_for_unknown_terms(self):
+        """一致する語がなければ空を返すこと"""
+        index = SearchIndex()
+        index.add([make_article(1, "記事")])
+
+        assert index.search("zzz") == []
+        assert index.search("") == []
+
+
+class TestCrawlerSearch:
+
+    @pytest.mark.asyncio
+    async def test_should_index_fetched_articles(self):
+        """取得した記事がそのまま検索できること"""
+        crawler = AsyncZennCrawler()
+        fetched = [make_article(1, "Next.jsのキャッシュ戦略"), make_article(2, "Go入門")]
+
+        with patch.object(crawler, "_fetch_feed", new=AsyncMock(return_value=fetched)):
+            await crawler.fetch_articles_from_feed("nextjs", max_articles=5)
+
+        results = await crawler.search_articles("キャッシュ")
+        assert [article.title for article in results] == ["Next.jsのキャッシュ戦略"]
+
+    @pytest.mark.asyncio
+    async def test_should_warm_index_from_store(self, tmp_path):
+        """ストアに蓄積済みの記事でインデックスを温めること"""
+        store = ArticleStore(str(tmp_path / "articles.db"))
+        store.upsert([make_article(1, "蓄積済みの記事")], "react")
+        crawler = AsyncZennCrawler(store=store)
+
+        results = await crawler.search_articles("蓄積")
+
+        assert [article.title for article in results] == ["蓄積済みの記事"]
+        store.close()
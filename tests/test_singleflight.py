@@ -0,0 +1,220 @@
+"""
+リクエスト合流（single-flight）のテスト
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from app.crawler import AsyncZennCrawler, ZennCrawler
+from app.singleflight import SingleFlight
+from benchmarks.fake_zenn_server import build_feed
+
+
+class TestSingleFlight:
+
+    @pytest.mark.asyncio
+    async def test_should_share_one_execution_between_concurrent_callers(self):
+        """同時の呼び出しが1回の実行を共有すること"""
+        flights = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.02)
+            return "result"
+
+        results = await asyncio.gather(*(flights.do("key", work) for _ in range(5)))
+
+        assert results == ["result"] * 5
+        assert calls == 1
+        assert flights.stats() == {"executed": 1, "coalesced": 4, "abandoned": 0, "in_flight": 0}
+
+    @pytest.mark.asyncio
+    async def test_should_run_again_after_completion(self):
+        """完了後の呼び出しは新たに実行すること"""
+        flights = SingleFlight()
+
+        async def work():
+            return 1
+
+        await flights.do("key", work)
+        await flights.do("key", work)
+
+        assert flights.stats()["executed"] == 2
+
+    @pytest.mark.asyncio
+    async def test_should_propagate_exception_to_all_callers(self):
+        """失敗は合流したすべての呼び出し元に伝わること"""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            *(flights.do("key", work) for _ in range(3)), return_exceptions=True
+        )
+
+        assert all(isinstance(result, ValueError) for result in results)
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_should_not_cancel_shared_work(self):
+        """先に呼んだ側がキャンセルされても他の呼び出し元には結果が届くこと"""
+        flights = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        first = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(flights.do("key", work))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        assert await second == "done"
+        with pytest.raises(asyncio.CancelledError):
+            await first
+
+    @pytest.mark.asyncio
+    async def test_should_cancel_shared_work_when_every_caller_cancels(self):
+        """待っている呼び出し元がすべてキャンセルされたら処理も中断すること"""
+        flights = SingleFlight()
+        started = asyncio.Event()
+        cancelled = asyncio.Event()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flights.do("key", work)) for _ in range(2)]
+        await started.wait()
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        assert flights.stats()["abandoned"] == 1
+        assert flights.stats()["in_flight"] == 0
+
+
+    @pytest.mark.asyncio
+    async def test_should_cancel_shared_work_from_caller_on_another_thread(self):
+        """別スレッドから合流した呼び出し元が最後にキャンセルしても処理を中断できること"""
+        flights = SingleFlight()
+        started = threading.Event()
+        cancelled = asyncio.Event()
+
+        class CheckedCalls(dict):
+            def __setitem__(self, key, flight):
+                # 他の呼び出し元から見える時点でタスクが作られていること
+                assert flight.task is not None
+                super().__setitem__(key, flight)
+
+        flights._calls = CheckedCalls()
+
+        async def work():
+            started.set()
+            try:
+                await asyncio.sleep(60)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        leader = asyncio.create_task(flights.do("key", work))
+        await asyncio.to_thread(started.wait, 1)
+
+        async def follow():
+            follower = asyncio.create_task(flights.do("key", work))
+            await asyncio.sleep(0)
+            leader.get_loop().call_soon_threadsafe(leader.cancel)
+            await asyncio.sleep(0.05)
+            follower.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await follower
+
+        await asyncio.to_thread(asyncio.run, follow())
+
+        await asyncio.wait_for(cancelled.wait(), 1)
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flights.stats()["abandoned"] == 1
+
+
+class TestCrawlerCoalescing:
+
+    @staticmethod
+    def slow_transport(calls, items=3):
+        async def handler(request):
+            calls.append(request)
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, content=build_feed(items))
+        return httpx.MockTransport(handler)
+
+    @pytest.mark.asyncio
+    async def test_should_coalesce_concurrent_async_fetches(self):
+        """同じトピックへの同時取得が1回のHTTPリクエストになること"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=self.slow_transport(calls))
+
+        results = await asyncio.gather(
+            *(crawler.fetch_articles_from_feed("react", 5) for _ in range(10))
+        )
+
+        assert len(calls) == 1
+        assert all(len(articles) == 3 for articles in results)
+        assert crawler.flights.stats()["coalesced"] == 9
+
+    @pytest.mark.asyncio
+    async def test_should_coalesce_fetches_with_different_limits(self):
+        """件数の違う同時取得も1回のHTTPリクエストにまとめ、呼び出し元ごとに切り出すこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=self.slow_transport(calls, items=20))
+
+        small, large = await asyncio.gather(
+            crawler.fetch_articles_from_feed("react", 2),
+            crawler.fetch_articles_from_feed("react", 10),
+        )
+
+        assert len(calls) == 1
+        assert (len(small), len(large)) == (2, 10)
+        assert small == large[:2]
+
+    @pytest.mark.asyncio
+    async def test_should_refetch_when_joined_fetch_was_too_small(self):
+        """先に走っていた取得の件数が足りなければ取り直すこと"""
+        calls = []
+        crawler = AsyncZennCrawler(transport=self.slow_transport(calls, items=20))
+
+        small, large = await asyncio.gather(
+            crawler.fetch_articles_from_feed("react", 3),
+            crawler.fetch_articles_from_feed("react", 15),
+        )
+
+        assert len(calls) == 2
+        assert (len(small), len(large)) == (3, 15)
+
+    def test_should_coalesce_threaded_sync_fetches(self):
+        """複数スレッドからの同期呼び出しも合流すること"""
+        calls = []
+        crawler = ZennCrawler(transport=self.slow_transport(calls))
+        barrier = threading.Barrier(8)
+
+        def fetch():
+            barrier.wait()
+            return crawler.fetch_trending_articles(5)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: fetch(), range(8)))
+
+        assert len(calls) == 1
+        assert all(len(articles) == 3 for articles in results)
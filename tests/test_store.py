@@ -0,0 +1,159 @@
+"""
+SQLite記事ストアのテスト
+"""
+
+import asyncio
+import sqlite3
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from app.config import Config
+from app.crawler import AsyncZennCrawler
+from app.models import TRENDING_TOPIC, Article
+from app.store import ArticleStore
+from benchmarks.fake_zenn_server import build_feed
+from tests.conftest import feed_transport
+
+
+def make_article(i, day=14):
+    return Article(
+        title=f"記事{i}",
+        url=f"https://zenn.dev/a/articles/{i}",
+        published_at=f"Mon, {day} Jul 2025 08:{i:02d}:00 GMT",
+        creator="a",
+        description=f"概要{i}",
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ArticleStore(str(tmp_path / "articles.db"))
+    yield store
+    store.close()
+
+
+class TestArticleStore:
+
+    def test_should_use_wal_mode(self, store):
+        """WALモードで開くこと"""
+        mode = sqlite3.connect(store.path).execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_should_upsert_unique_by_url(self, store):
+        """同じURLは1件にまとめて最新の内容で上書きすること"""
+        store.upsert([make_article(1), make_article(2)], "react")
+        store.upsert([Article(title="更新", url=make_article(1).url, published_at=make_article(1).published_at)], "react")
+
+        assert store.count() == 2
+        titles = [a.title for a in store.recent("react")]
+        assert "更新" in titles
+
+    def test_should_return_recent_articles_by_topic(self, store):
+        """トピックごとに新しい順で返すこと"""
+        store.upsert([make_article(i) for i in range(5)], "React")
+        store.upsert([make_article(10)], "go")
+
+        articles = store.recent("react", limit=3)
+
+        assert [a.title for a in articles] == ["記事4", "記事3", "記事2"]
+        assert [a.title for a in store.recent("go")] == ["記事10"]
+        assert len(store.recent(limit=100)) == 6
+
+    def test_should_filter_by_publish_time_range(self, store):
+        """投稿日時の範囲（since 以上 until 未満）で絞れること"""
+        store.upsert([make_article(i) for i in range(5)], "react")
+        since = make_article(1).published_ts
+        until = make_article(4).published_ts
+
+        articles = store.recent("react", 10, since=since, until=until)
+
+        assert [a.title for a in articles] == ["記事3", "記事2", "記事1"]
+        assert articles[0].published_ts == make_article(3).published_ts
+        assert len(store.recent(None, 10, since=until)) == 1
+
+    def test_should_link_article_to_multiple_topics(self, store):
+        """複数トピックに出た記事をどちらからも引けること"""
+        store.upsert([make_article(1)], "react")
+        store.upsert([make_article(1)], "nextjs")
+
+        assert store.count() == 1
+        assert store.recent("react")[0].url == store.recent("nextjs")[0].url
+
+    def test_should_persist_across_reopen(self, tmp_path):
+        """再起動後も蓄積した記事を引けること"""
+        path = str(tmp_path / "articles.db")
+        first = ArticleStore(path)
+        first.upsert([make_article(1)], "react")
+        first.close()
+
+        second = ArticleStore(path)
+        assert second.recent("react")[0].title == "記事1"
+        second.close()
+
+    def test_should_skip_articles_without_url(self, store):
+        """URLのない記事は保存しないこと"""
+        assert store.upsert([Article(title="no url")], "react") == 0
+
+
+class TestCrawlerStore:
+
+    @pytest.mark.asyncio
+    async def test_should_store_fetched_articles(self, store):
+        """取得した記事をストアに蓄積すること"""
+        crawler = AsyncZennCrawler(store=store)
+        with patch.object(crawler, "_fetch_feed", new=AsyncMock(return_value=[make_article(1)])):
+            await crawler.fetch_articles_from_feed("react")
+
+        stored = await crawler.load_stored_articles("react", 10)
+        assert [a.title for a in stored] == ["記事1"]
+
+    @pytest.mark.asyncio
+    async def test_should_fall_back_to_store_when_fetch_fails(self, store):
+        """取得に失敗したら蓄積済みの記事を返すこと"""
+        store.upsert([make_article(1), make_article(2)], TRENDING_TOPIC)
+
+        def handler(request):
+            raise httpx.ConnectError("Network error", request=request)
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler), store=store)
+        # 起動直後のキャッシュの温めではなく、取得失敗時の代替として返すことを確かめる
+        with patch.object(Config, "STORE_WARM_MAX_AGE", -1):
+            articles = await crawler.fetch_trending_articles(max_articles=1)
+
+        assert [a.title for a in articles] == ["記事2"]
+
+    @pytest.mark.asyncio
+    async def test_should_serve_stored_articles_first_after_restart(self, store):
+        """起動後の初回は蓄積済みの記事を待たずに返し、裏で取り直すこと"""
+        store.upsert([make_article(i) for i in range(1, 4)], "react")
+        calls = []
+        crawler = AsyncZennCrawler(transport=feed_transport(build_feed(3), calls=calls), store=store)
+
+        warm = await crawler.fetch_articles_from_feed("react", 2)
+        assert [a.title for a in warm] == ["記事3", "記事2"]
+        assert calls == []
+
+        await asyncio.gather(*crawler._refresh_tasks)
+        refreshed = await crawler.fetch_articles_from_feed("react", 2)
+        await crawler.aclose()
+
+        assert len(calls) == 1
+        assert refreshed[0].title == "trend の記事 0"
+
+    @pytest.mark.asyncio
+    async def test_should_not_warm_from_old_or_short_store(self, store):
+        """最終取得が古い場合や件数が足りない場合は上流から取得すること"""
+        store.upsert([make_article(1)], "react")
+        calls = []
+        crawler = AsyncZennCrawler(transport=feed_transport(build_feed(3), calls=calls), store=store)
+
+        short = await crawler.fetch_articles_from_feed("react", 2)
+        with patch.object(Config, "STORE_WARM_MAX_AGE", -1):
+            store.upsert([make_article(i) for i in range(1, 4)], "go")
+            old = await crawler.fetch_articles_from_feed("go", 2)
+        await crawler.aclose()
+
+        assert len(short) == 2 and len(old) == 2
+        assert len(calls) == 2
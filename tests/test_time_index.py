@@ -0,0 +1,87 @@
+"""
+投稿日時の索引のテスト
+"""
+
+import httpx
+import pytest
+
+from app.crawler import AsyncZennCrawler
+from app.models import Article
+from app.time_index import TimeIndex
+from benchmarks.fake_zenn_server import build_feed
+
+
+def article(i, ts=None):
+    return Article(
+        title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}", published_ts=ts or 1000 + i
+    )
+
+
+class TestTimeIndex:
+
+    def test_should_answer_ranges_newest_first(self):
+        """since 以上 until 未満の記事を新しい順に返すこと"""
+        index = TimeIndex()
+        index.add([article(i) for i in (3, 0, 4, 1, 2)], "react")
+
+        assert [a.title for a in index.between("react", 1001, 1004)] == ["記事3", "記事2", "記事1"]
+        assert [a.title for a in index.between("react", limit=2)] == ["記事4", "記事3"]
+        assert index.between("vue") == []
+
+    def test_should_keep_topics_and_overall_index(self):
+        """トピックごとの索引と全体の索引を両方持つこと"""
+        index = TimeIndex()
+        index.add([article(1), article(2)], "react")
+        index.add([article(2), article(3)], "vue")
+
+        assert [a.title for a in index.between("vue")] == ["記事3", "記事2"]
+        assert [a.title for a in index.between(None)] == ["記事3", "記事2", "記事1"]
+        assert index.stats() == {"articles": 3, "topics": 2}
+
+    def test_should_reindex_articles_whose_date_changed(self):
+        """同じURLの投稿日時が変わったら位置を入れ替えること"""
+        index = TimeIndex()
+        index.add([article(1), article(2)], "react")
+        index.add([article(1, ts=2000)], "react")
+
+        assert [a.published_ts for a in index.between("react")] == [2000, 1002]
+        assert len(index.between(None)) == 2
+
+    def test_should_evict_oldest_articles(self):
+        """上限を超えたら投稿日時の古い記事から捨てること"""
+        index = TimeIndex(max_articles=3)
+        index.add([article(i) for i in range(5)], "react")
+
+        assert [a.title for a in index.between("react")] == ["記事4", "記事3", "記事2"]
+        assert len(index) == 3
+
+    def test_should_skip_articles_without_date(self):
+        """投稿日時が不明な記事は索引に入れないこと"""
+        index = TimeIndex()
+        index.add([Article(url="https://zenn.dev/a/articles/x")])
+
+        assert len(index) == 0
+
+
+class TestCrawlerTimeQueries:
+
+    @pytest.mark.asyncio
+    async def test_should_merge_topics_by_recency_within_range(self):
+        """複数トピックの取得済み記事を期間で絞り、新しい順にマージすること"""
+        def handler(request):
+            topic = request.url.path.split("/")[2] if "/topics/" in request.url.path else "trend"
+            return httpx.Response(200, content=build_feed(6, topic))
+
+        crawler = AsyncZennCrawler(transport=httpx.MockTransport(handler))
+        merged = await crawler.fetch_many(["react", "vue"], 6)
+        newest = merged[0].published_ts
+        in_range = await crawler.articles_between_many(
+            ["react", "vue"], since=newest - 2 * 3600, until=newest, limit=10
+        )
+        await crawler.aclose()
+
+        timestamps = [a.published_ts for a in merged]
+        assert timestamps == sorted(timestamps, reverse=True)
+        assert len(in_range) == 4
+        assert {a.topics[0] for a in in_range} == {"react", "vue"}
+        assert all(newest - 2 * 3600 <= a.published_ts < newest for a in in_range)
@@ -0,0 +1,95 @@
+"""
+トレンド順位の履歴のテスト
+"""
+
+import pytest
+
+from app.models import Article
+from app.trending_history import TrendingHistory
+
+
+def ranking(*ids):
+    return [Article(title=f"記事{i}", url=f"https://zenn.dev/a/articles/{i}") for i in ids]
+
+
+def url(i):
+    return f"https://zenn.dev/a/articles/{i}"
+
+
+class TestTrendingHistory:
+
+    def test_should_compute_rank_velocity_incrementally(self):
+        """前回からの順位の変化を1時間あたりで求め、平滑化すること"""
+        history = TrendingHistory(min_interval=0, alpha=0.5)
+        history.record(ranking(1, 2, 3, 4), now=0)
+        history.record(ranking(4, 1, 2, 3), now=3600)
+
+        assert history.lookup(url(4)).velocity == pytest.approx(3.0)  # 4位→1位
+        assert history.lookup(url(1)).velocity == pytest.approx(-1.0)
+
+        history.record(ranking(4, 1, 2, 3), now=7200)
+        assert history.lookup(url(4)).velocity == pytest.approx(1.5)
+
+    def test_should_track_time_on_list_and_drop_offs(self):
+        """掲載時間を積み上げ、圏外に落ちた記事は掲載中から外すこと"""
+        history = TrendingHistory(min_interval=0)
+        history.record(ranking(1, 2, 3), now=0)
+        history.record(ranking(1, 2, 3), now=600)
+        history.record(ranking(1, 3, 5), now=1200)
+
+        assert history.lookup(url(1)).on_list_seconds == 1200
+        assert history.lookup(url(2)).rank is None
+        assert history.lookup(url(5)).entries == 1
+        assert [s.article.url for s in history.current()] == [url(1), url(3), url(5)]
+        assert history.longest(1)[0].article.url == url(1)
+
+    def test_should_rank_rising_articles(self):
+        """上昇の速い掲載中の記事から順に返すこと"""
+        history = TrendingHistory(min_interval=0)
+        history.record(ranking(1, 2, 3, 4, 5), now=0)
+        history.record(ranking(5, 3, 1, 2, 4), now=3600)
+
+        rising = history.rising(10)
+
+        assert [s.article.url for s in rising] == [url(5), url(3)]
+        assert all(s.velocity > 0 for s in rising)
+
+    def test_should_keep_ranks_below_shallower_snapshot(self):
+        """前回より浅いリストでは、観測できない順位の記事を圏外にしないこと"""
+        history = TrendingHistory(min_interval=0)
+        history.record(ranking(1, 2, 3, 4), now=0)
+        history.record(ranking(2, 1), now=600)
+
+        assert history.lookup(url(4)).rank == 4
+        assert len(history.current()) == 4
+
+    def test_should_skip_snapshots_closer_than_min_interval(self):
+        """短い間隔の取得はスナップショットにしないこと"""
+        history = TrendingHistory(min_interval=60)
+
+        assert history.record(ranking(1), now=0)
+        assert not history.record(ranking(2), now=30)
+        assert not history.record([], now=120)
+        assert len(history) == 1
+
+    def test_should_bound_snapshots_and_forget_old_articles(self):
+        """保持数を超えたスナップショットと、その期間より前に落ちた記事を捨てること"""
+        history = TrendingHistory(max_snapshots=3, min_interval=0)
+        for step in range(10):
+            history.record(ranking(step, step + 1), now=step * 60)
+
+        stats = history.stats()
+        assert stats["snapshots"] == 3
+        assert history.lookup(url(0)) is None
+        assert stats["articles"] <= 5
+        assert stats["snapshot_bytes"] == 3 * 2 * 4
+
+    def test_should_report_trajectory_from_recent_snapshots(self):
+        """直近のスナップショットでの順位の推移を返すこと"""
+        history = TrendingHistory(min_interval=0)
+        history.record(ranking(1, 2), now=0)
+        history.record(ranking(2, 3), now=60)
+        history.record(ranking(2, 1), now=120)
+
+        assert history.trajectory(url(1), points=3) == [(0, 1), (60, None), (120, 2)]
+        assert history.trajectory(url(9)) == []